@@ -0,0 +1,268 @@
+# api_server.py
+
+"""
+HTTP/JSON API over an IStorage backend.
+
+Endpoints:
+    GET    /movies?page=1&per_page=50   Paginated list (ETag / 304 support)
+    GET    /movies/<title>              One movie
+    GET    /search?q=<text>             Substring search, with fuzzy suggestions
+    GET    /stats                       Rating statistics and per-decade averages
+    POST   /movies        {"title"}     Look the title up in OMDb and add it
+    PATCH  /movies/<title> {"rating"}   Update a rating
+    DELETE /movies/<title>              Delete a movie
+"""
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+import omdb_client
+from commands import movie_to_json as _movie_json
+
+DEFAULT_PER_PAGE = 50
+MAX_PER_PAGE = 1000
+
+
+class ApiError(Exception):
+    """An error answered with an HTTP status and a JSON message."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class MovieApiServer(ThreadingHTTPServer):
+    """
+    HTTP server sharing one storage instance across a pool of worker threads.
+
+    Storage calls, reads included, are serialized with one lock: the
+    backends' lazy caches, indexes and the shared sqlite connection are
+    not safe for concurrent use. The lock covers only the storage call
+    itself. JSON encoding, ETag hashing, socket I/O and OMDb lookups for
+    new movies run outside it, so concurrent requests overlap in
+    everything except the (cached, in-memory) storage access.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, storage, workers=16):
+        """
+        :param address: (host, port) to bind; port 0 picks a free port
+        :param storage: IStorage instance serving every request
+        :param workers: Maximum requests handled concurrently
+        """
+        super().__init__(address, MovieApiHandler)
+        self.storage = storage
+        self.lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        with self.lock:
+            storage.list_movies()  # warm the cache before the first request
+
+    @property
+    def url(self):
+        """Base URL of the running server."""
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}/'
+
+    def process_request(self, request, client_address):
+        """Hand the connection to the worker pool instead of a new thread."""
+        self._pool.submit(self.process_request_thread, request, client_address)
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False)
+
+
+class MovieApiHandler(BaseHTTPRequestHandler):
+    """Routes requests to the storage held by the server."""
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; without TCP_NODELAY keep-alive
+    # clients stall ~40ms per request on Nagle + delayed ACK
+    disable_nagle_algorithm = True
+    # Idle keep-alive connections release their worker after this many seconds
+    timeout = 30
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PATCH(self):
+        self._dispatch('PATCH')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+    def log_message(self, format, *args):
+        pass
+
+    def _dispatch(self, method):
+        url = urlparse(self.path)
+        parts = [unquote(p) for p in url.path.split('/') if p]
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            if parts == ['movies'] and method == 'GET':
+                self._list_movies(query)
+            elif parts == ['movies'] and method == 'POST':
+                self._add_movie()
+            elif len(parts) == 2 and parts[0] == 'movies':
+                handler = {'GET': self._get_movie, 'PATCH': self._update_movie,
+                           'DELETE': self._delete_movie}.get(method)
+                if handler is None:
+                    raise ApiError(405, f'{method} not allowed')
+                handler(parts[1])
+            elif parts == ['search'] and method == 'GET':
+                self._search(query)
+            elif parts == ['stats'] and method == 'GET':
+                self._stats()
+            else:
+                raise ApiError(404, 'No such endpoint')
+        except ApiError as exc:
+            self._send_json(exc.status, {'error': str(exc)})
+        except Exception as exc:
+            self._send_json(500, {'error': f'Internal error: {exc}'})
+
+    def _list_movies(self, query):
+        page = _int_param(query, 'page', 1)
+        per_page = min(_int_param(query, 'per_page', DEFAULT_PER_PAGE), MAX_PER_PAGE)
+        with self.server.lock:
+            total, items = self.server.storage.list_page((page - 1) * per_page, per_page)
+        chunk = [_movie_json(title, info) for title, info in items]
+        body = _encode({'page': page, 'per_page': per_page, 'total': total,
+                        'pages': max(1, -(-total // per_page)), 'movies': chunk})
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get('If-None-Match') == etag:
+            self._send(304, b'', {'ETag': etag})
+            return
+        self._send(200, body, {'ETag': etag, 'Content-Type': 'application/json'})
+
+    def _get_movie(self, title):
+        with self.server.lock:
+            info = self.server.storage.get_movie(title)
+        if info is None:
+            raise ApiError(404, f"Movie '{title}' not found")
+        self._send_json(200, _movie_json(title, info))
+
+    def _search(self, query):
+        text = query.get('q', '').strip()
+        if not text:
+            raise ApiError(400, "Missing query parameter 'q'")
+        with self.server.lock:
+            results = self.server.storage.search_title(text)
+            suggestions = [] if results else self.server.storage.fuzzy_search_title(text)
+        self._send_json(200, {
+            'query': text,
+            'results': [_movie_json(t, info) for t, info in results],
+            'suggestions': [_movie_json(t, info) for t, info in suggestions],
+        })
+
+    def _stats(self):
+        with self.server.lock:
+            stats = self.server.storage.rating_stats()
+            decades = self.server.storage.rating_breakdown('decade')
+        self._send_json(200, {'stats': stats, 'decades': {str(k): v for k, v in decades.items()}})
+
+    def _add_movie(self):
+        title_input = str(self._read_json().get('title', '')).strip()
+        if not title_input:
+            raise ApiError(400, "Field 'title' is required")
+        try:
+            data = omdb_client.get_movie_data(title_input)
+            title, year, rating, poster = omdb_client.parse_movie_data(data)
+        except omdb_client.MovieNotFoundError:
+            raise ApiError(404, f"Movie '{title_input}' not found in OMDb")
+        except omdb_client.OmdbAPIError as exc:
+            raise ApiError(502, f'OMDb API error: {exc}')
+        except (TypeError, ValueError) as exc:
+            raise ApiError(502, f'Invalid OMDb data for {title_input!r}: {exc}')
+        with self.server.lock:
+            storage = self.server.storage
+            if storage.get_movie(title) is not None:
+                raise ApiError(409, f"Movie '{title}' already exists")
+            storage.add_movie(title, year, rating, poster, fetched_at=int(time.time()))
+        self._send_json(201, _movie_json(title, {'year': year, 'rating': rating,
+                                                 'poster': poster}))
+
+    def _update_movie(self, title):
+        rating = self._read_json().get('rating')
+        try:
+            rating = float(rating)
+        except (TypeError, ValueError):
+            raise ApiError(400, "Field 'rating' must be a number")
+        with self.server.lock:
+            storage = self.server.storage
+            if storage.get_movie(title) is None:
+                raise ApiError(404, f"Movie '{title}' not found")
+            storage.update_movie(title, rating)
+            info = storage.get_movie(title)
+        self._send_json(200, _movie_json(title, info))
+
+    def _delete_movie(self, title):
+        with self.server.lock:
+            storage = self.server.storage
+            if storage.get_movie(title) is None:
+                raise ApiError(404, f"Movie '{title}' not found")
+            storage.delete_movie(title)
+        self._send(204, b'')
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            data = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            raise ApiError(400, 'Request body must be JSON')
+        if not isinstance(data, dict):
+            raise ApiError(400, 'Request body must be a JSON object')
+        return data
+
+    def _send_json(self, status, payload):
+        self._send(status, _encode(payload), {'Content-Type': 'application/json'})
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+
+def _encode(payload):
+    return json.dumps(payload).encode('utf-8')
+
+
+def _int_param(query, name, default):
+    """Read a positive integer query parameter."""
+    try:
+        value = int(query.get(name, default))
+    except ValueError:
+        raise ApiError(400, f"Query parameter '{name}' must be an integer")
+    if value < 1:
+        raise ApiError(400, f"Query parameter '{name}' must be positive")
+    return value
+
+
+def serve(storage, host='127.0.0.1', port=8000, workers=16):
+    """
+    Serve the API until interrupted with Ctrl+C.
+
+    :param storage: IStorage instance
+    :param host: Interface to bind
+    :param port: TCP port
+    :param workers: Maximum requests handled concurrently
+    """
+    server = MovieApiServer((host, port), storage, workers=workers)
+    print(f"Serving movie API on {server.url} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
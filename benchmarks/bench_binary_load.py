@@ -0,0 +1,53 @@
+"""
+Load-time benchmark: JSON / CSV parsing vs the memory-mapped binary snapshot.
+
+Usage:
+    python benchmarks/bench_binary_load.py [--rows 10000 100000 1000000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage.storage_binary import StorageBinary, write_snapshot  # noqa: E402
+from storage.storage_csv import StorageCsv  # noqa: E402
+from storage.storage_json import StorageJson  # noqa: E402
+from synthetic import make_library, make_title  # noqa: E402
+
+
+def first_access(storage_cls, path, probe):
+    """Time from a cold storage object to the first title lookup."""
+    start = time.perf_counter()
+    movies = storage_cls(path).list_movies()
+    movies[probe]
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'json':>10} {'csv':>10} {'binary':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            movies = make_library(rows)
+            probe = make_title(rows // 2)
+            paths = {cls: os.path.join(tmp, f"movies-{rows}.{ext}")
+                     for cls, ext in ((StorageJson, 'json'), (StorageCsv, 'csv'),
+                                      (StorageBinary, 'bin'))}
+            StorageJson(paths[StorageJson])._save_movies(movies)
+            StorageCsv(paths[StorageCsv])._save_movies(movies)
+            write_snapshot(paths[StorageBinary], movies)
+            del movies
+
+            timings = [first_access(cls, paths[cls], probe) * 1000
+                       for cls in (StorageJson, StorageCsv, StorageBinary)]
+            print(f"{rows:>9} " + " ".join(f"{ms:>8.1f}ms" for ms in timings))
+
+
+if __name__ == '__main__':
+    main()
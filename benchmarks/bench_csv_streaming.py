@@ -0,0 +1,68 @@
+"""
+CSV benchmark: cached StorageCsv vs StreamingStorageCsv on scans and single-row edits.
+
+A scan sums all ratings; peak memory is measured with tracemalloc. Edits
+are timed on an already loaded storage: a same-length rating change
+(rewritten in place by the streaming class), a rating change that grows
+the row (stream copy) and a delete.
+
+Usage:
+    python benchmarks/bench_csv_streaming.py [--rows 10000 100000 1000000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage.storage_csv import StorageCsv, StreamingStorageCsv  # noqa: E402
+from synthetic import make_library, make_title  # noqa: E402
+
+
+def scan(storage):
+    """Sum all ratings; return (seconds, peak traced bytes)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    total = sum(info['rating'] for info in storage.list_movies().values())
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert total > 0
+    return elapsed, peak
+
+
+def timed_ms(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'class':>10} {'scan':>9} {'peak':>9} {'same len':>10} "
+          f"{'longer':>10} {'delete':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            movies = make_library(rows)
+            for name, cls in (('cached', StorageCsv), ('streaming', StreamingStorageCsv)):
+                path = os.path.join(tmp, f"movies-{rows}-{name}.csv")
+                StorageCsv(path)._save_movies(movies)
+                storage = cls(path)
+                elapsed, peak = scan(storage)
+                middle = make_title(rows // 2)
+                same = timed_ms(storage.update_movie, middle, 6.5)
+                longer = timed_ms(storage.update_movie, middle, 6.25)
+                delete = timed_ms(storage.delete_movie, middle)
+                print(f"{rows:>9} {name:>10} {elapsed * 1000:>7.1f}ms {peak / 2**20:>7.1f}MB "
+                      f"{same:>8.1f}ms {longer:>8.1f}ms {delete:>8.1f}ms")
+            del movies
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+JSON codec benchmark: load/save time and file size for StorageJson variants.
+
+Usage:
+    python benchmarks/bench_json_codecs.py [--rows 100000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage import json_codec  # noqa: E402
+from storage.storage_json import StorageJson  # noqa: E402
+from synthetic import make_library  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args()
+
+    movies = make_library(args.rows)
+    suffixes = ['.json', '.json.gz']
+    if json_codec.zstandard is not None:
+        suffixes.append('.json.zst')
+
+    print(f"{args.rows} movies")
+    print(f"{'codec':8} {'format':16} {'save':>9} {'load':>9} {'size':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in sorted(json_codec.CODECS):
+            for compact in (False, True):
+                for suffix in suffixes:
+                    path = os.path.join(tmp, f"{name}-{compact}{suffix}")
+                    storage = StorageJson(path, codec=name, compact=compact)
+
+                    start = time.perf_counter()
+                    storage._save_movies(movies)
+                    save = time.perf_counter() - start
+
+                    start = time.perf_counter()
+                    storage._load_movies()
+                    load = time.perf_counter() - start
+
+                    layout = ('compact' if compact else 'indent') + suffix[5:]
+                    print(f"{name:8} {layout:16} {save * 1000:7.1f}ms {load * 1000:7.1f}ms "
+                          f"{os.path.getsize(path) / 2**20:8.2f}MiB")
+
+
+if __name__ == '__main__':
+    main()
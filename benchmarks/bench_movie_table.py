@@ -0,0 +1,59 @@
+"""
+Memory benchmark: dict-of-dicts library vs columnar MovieTable.
+
+Usage:
+    python benchmarks/bench_movie_table.py [--rows 1000000]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage.movie_table import MovieTable  # noqa: E402
+
+POSTERS = [f"https://m.media-amazon.com/images/M/poster-{i}._V1_SX300.jpg" for i in range(50)]
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1000000)
+    args = parser.parse_args()
+
+    titles = [f"Movie {i}" for i in range(args.rows)]  # shared by both layouts
+
+    def build_dict():
+        return {title: {'year': 1900 + i % 125, 'rating': (i % 100) / 10,
+                        'poster': POSTERS[i % len(POSTERS)]}
+                for i, title in enumerate(titles)}
+
+    movies, dict_size = measure(build_dict)
+    table, table_size = measure(lambda: MovieTable(movies))
+
+    print(f"{args.rows} rows (title strings excluded)")
+    print(f"dict of dicts : {dict_size / 2**20:8.1f} MiB")
+    print(f"MovieTable    : {table_size / 2**20:8.1f} MiB")
+
+    for label, fn in (("sort (dict)", lambda: sorted(movies.items(), key=lambda x: x[1]['rating'],
+                                                      reverse=True)[:10]),
+                      ("sort (table)", lambda: table.sorted_by_rating(10)),
+                      ("stats (table)", table.rating_summary)):
+        start = time.perf_counter()
+        fn()
+        print(f"{label:14}: {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
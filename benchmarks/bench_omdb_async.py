@@ -0,0 +1,81 @@
+"""
+Throughput harness: synchronous OmdbClient vs AsyncOmdbClient against a
+local fake OMDb server with simulated latency. No network access needed.
+
+Usage:
+    python benchmarks/bench_omdb_async.py [--lookups 500] [--latency 0.05]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from omdb_async import AsyncOmdbClient  # noqa: E402
+from omdb_client import OmdbClient  # noqa: E402
+
+
+def start_fake_server(latency):
+    """Start an aiohttp fake OMDb server in a background thread; return its URL."""
+    async def handle(request):
+        await asyncio.sleep(latency)
+        title = request.query.get('t', '')
+        return web.json_response({'Response': 'True', 'Title': title, 'Year': '2000',
+                                  'imdbRating': '7.0', 'Poster': ''})
+
+    loop = asyncio.new_event_loop()
+    app = web.Application()
+    app.router.add_get('/', handle)
+    runner = web.AppRunner(app, access_log=None)
+    loop.run_until_complete(runner.setup())
+    site = web.TCPSite(runner, '127.0.0.1', 0, backlog=1024)
+    loop.run_until_complete(site.start())
+    port = site._server.sockets[0].getsockname()[1]
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return f'http://127.0.0.1:{port}/'
+
+
+def bench_sync(url, titles):
+    client = OmdbClient('bench', url=url, rate=1e9, burst=1e9)
+    start = time.perf_counter()
+    for title in titles:
+        client.get_movie_data(title)
+    elapsed = time.perf_counter() - start
+    client.close()
+    return elapsed
+
+
+def bench_async(url, titles, concurrency):
+    async def scenario():
+        async with AsyncOmdbClient('bench', url=url, max_concurrency=concurrency) as client:
+            start = time.perf_counter()
+            await client.get_many(titles)
+            return time.perf_counter() - start
+    return asyncio.run(scenario())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--lookups', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--concurrency', type=int, default=200)
+    args = parser.parse_args()
+
+    url = start_fake_server(args.latency)
+    titles = [f'Movie {i}' for i in range(args.lookups)]
+    sync_titles = titles[:max(1, args.lookups // 10)]
+
+    sync_elapsed = bench_sync(url, sync_titles)
+    async_elapsed = bench_async(url, titles, args.concurrency)
+    print(f'sync : {len(sync_titles) / sync_elapsed:8.1f} lookups/s')
+    print(f'async: {len(titles) / async_elapsed:8.1f} lookups/s '
+          f'(concurrency {args.concurrency})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Sharding benchmark: single-file StorageJson vs StorageSharded on updates and full loads.
+
+An update is timed on an already loaded storage and rewrites the whole
+JSON file or a single shard. A full load opens a fresh storage object and
+reads every movie, with shards parsed on the thread pool.
+
+Usage:
+    python benchmarks/bench_sharded.py [--rows 100000 1000000] [--shards 4 16 64]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage.storage_json import StorageJson  # noqa: E402
+from storage.storage_sharded import StorageSharded  # noqa: E402
+from synthetic import make_library, make_title  # noqa: E402
+
+
+def measure(open_storage, movies, updates=20):
+    """Return (full load ms, median update ms) for a freshly opened storage."""
+    start = time.perf_counter()
+    storage = open_storage()
+    assert len(storage.list_movies()) == len(movies)
+    load = (time.perf_counter() - start) * 1000
+
+    samples = []
+    for i in range(updates):
+        start = time.perf_counter()
+        storage.update_movie(make_title(i * 7919 % len(movies)), 5.5)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return load, samples[len(samples) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--shards', type=int, nargs='+', default=[4, 16, 64])
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'layout':>12} {'full load':>11} {'update':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            movies = make_library(rows)
+            path = os.path.join(tmp, f"movies-{rows}.json")
+            StorageJson(path).add_movies_bulk(movies)
+            load, update = measure(lambda: StorageJson(path), movies)
+            print(f"{rows:>9} {'single file':>12} {load:>9.1f}ms {update:>8.2f}ms")
+            for shards in args.shards:
+                directory = os.path.join(tmp, f"movies-{rows}-{shards}.shards")
+                StorageSharded(directory, shards=shards).add_movies_bulk(movies)
+                load, update = measure(lambda: StorageSharded(directory), movies)
+                print(f"{rows:>9} {f'{shards} shards':>12} {load:>9.1f}ms {update:>8.2f}ms")
+            del movies
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Startup benchmark: import cost of main.py and wall time of a list-only run.
+
+Import time comes from `python -X importtime`; wall time is measured
+against a bare `python -c pass` so interpreter startup is excluded.
+Exits with status 1 when a median exceeds its budget.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 20] [--import-budget-ms 25]
+                                       [--wall-budget-ms 60] [--storage json]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LIST_SESSION = """
+import contextlib, io, sys
+import main
+storage = main.load_backend(sys.argv[1])(sys.argv[2])
+from movie_app import MovieApp
+with contextlib.redirect_stdout(io.StringIO()):
+    MovieApp(storage)._command_list_movies()
+"""
+
+
+def import_time_us(module):
+    """Cumulative import time of module in microseconds, from -X importtime."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    for line in result.stderr.splitlines():
+        parts = [p.strip() for p in line.split('|')]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise RuntimeError(f'{module} not found in -X importtime output')
+
+
+def wall_time(args):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, *args], cwd=ROOT, check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--import-budget-ms', type=float, default=25.0)
+    parser.add_argument('--wall-budget-ms', type=float, default=60.0)
+    parser.add_argument('--storage', default='json')
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    import main as main_module  # noqa: E402
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'movies' + os.path.splitext(
+            main_module.DEFAULT_FILES[args.storage])[1])
+        main_module.load_backend(args.storage)(path).add_movies_bulk(
+            {f"Movie {i}": {'year': 2000, 'rating': 7.0, 'poster': ''} for i in range(100)})
+
+        imports = [import_time_us('main') / 1000 for _ in range(args.runs)]
+        baseline = [wall_time(['-c', 'pass']) for _ in range(args.runs)]
+        session = [wall_time(['-c', LIST_SESSION, args.storage, path]) for _ in range(args.runs)]
+
+    import_ms = statistics.median(imports)
+    wall_ms = (statistics.median(session) - statistics.median(baseline)) * 1000
+    print(f"import main          : {import_ms:7.1f} ms (budget {args.import_budget_ms:g} ms)")
+    print(f"list session overhead: {wall_ms:7.1f} ms (budget {args.wall_budget_ms:g} ms, "
+          f"{args.storage}, interpreter startup excluded)")
+
+    over = import_ms > args.import_budget_ms or wall_ms > args.wall_budget_ms
+    if over:
+        print("Startup budget exceeded.")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Title search benchmark: trigram TitleIndex vs the linear lowercase scan.
+
+Usage:
+    python benchmarks/bench_title_index.py [--titles 500000] [--queries 50]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage.title_index import TitleIndex  # noqa: E402
+
+WORDS = ("the night day star war love dark city last man woman king queen blood "
+         "river road house lost return rise fall dead life time secret world "
+         "game black white red blue golden shadow storm fire ice iron").split()
+
+
+def make_titles(count, seed=42):
+    rng = random.Random(seed)
+    titles = set()
+    while len(titles) < count:
+        words = rng.choices(WORDS, k=rng.randint(1, 4))
+        titles.add(" ".join(words).title() + f" {rng.randint(1, 9999)}")
+    return list(titles)
+
+
+def scan(titles, query):
+    query = query.lower()
+    return [t for t in titles if query in t.lower()]
+
+
+def timed(fn, queries):
+    start = time.perf_counter()
+    for query in queries:
+        fn(query)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--titles', type=int, default=500000)
+    parser.add_argument('--queries', type=int, default=50)
+    args = parser.parse_args()
+
+    titles = make_titles(args.titles)
+    rng = random.Random(1)
+    queries = []
+    for _ in range(args.queries):
+        title = rng.choice(titles).lower()
+        start = rng.randrange(max(1, len(title) - 6))
+        queries.append(title[start:start + 6])
+
+    start = time.perf_counter()
+    index = TitleIndex(titles)
+    build = time.perf_counter() - start
+
+    print(f"{args.titles} titles, {args.queries} substring queries")
+    print(f"index build      : {build:8.2f} s")
+    print(f"linear scan      : {timed(lambda q: scan(titles, q), queries):8.2f} ms/query")
+    print(f"trigram index    : {timed(index.search, queries):8.2f} ms/query")
+    print(f"fuzzy (typo)     : {timed(lambda q: index.fuzzy(q[:-1] + 'x'), queries):8.2f} ms/query")
+
+
+if __name__ == '__main__':
+    main()
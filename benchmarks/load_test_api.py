@@ -0,0 +1,119 @@
+"""
+Load test for the HTTP API: an in-process server over a synthetic library,
+hammered by keep-alive client threads. OMDb is stubbed; nothing leaves
+the machine.
+
+Usage:
+    python benchmarks/load_test_api.py [--backend json] [--size 10000]
+                                       [--clients 16] [--duration 10] [--workers 16]
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import quote
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_server import MovieApiServer  # noqa: E402
+from run_suite import BACKENDS, summarize  # noqa: E402
+from synthetic import install_omdb_stub, make_library  # noqa: E402
+
+# Relative weight of each request type
+MIX = [('list', 50), ('list_cached', 20), ('search', 15), ('stats', 5),
+       ('get', 5), ('update', 4), ('add', 1)]
+
+
+def client(address, titles, deadline, seed, results):
+    """Issue requests on one keep-alive connection until the deadline."""
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection(*address, timeout=30)
+    kinds = [kind for kind, weight in MIX for _ in range(weight)]
+    etags = {}
+    added = 0
+    while time.perf_counter() < deadline:
+        kind = rng.choice(kinds)
+        headers = {}
+        body = None
+        method = 'GET'
+        if kind in ('list', 'list_cached'):
+            path = f"/movies?page={rng.randint(1, 20)}&per_page=50"
+            if kind == 'list_cached' and path in etags:
+                headers['If-None-Match'] = etags[path]
+        elif kind == 'search':
+            path = '/search?q=' + quote(rng.choice(titles).split()[rng.randrange(2)][:4])
+        elif kind == 'stats':
+            path = '/stats'
+        elif kind == 'get':
+            path = '/movies/' + quote(rng.choice(titles))
+        elif kind == 'update':
+            method, path = 'PATCH', '/movies/' + quote(rng.choice(titles))
+            body = json.dumps({'rating': rng.randint(10, 99) / 10})
+        else:
+            method, path = 'POST', '/movies'
+            body = json.dumps({'title': f"Load Test {seed}-{added}"})
+            added += 1
+
+        start = time.perf_counter()
+        conn.request(method, path, body=body, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        elapsed = time.perf_counter() - start
+        if kind.startswith('list') and response.status == 200:
+            etags[path] = response.getheader('ETag')
+        results.append((kind, response.status, elapsed))
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--backend', choices=list(BACKENDS), default='json')
+    parser.add_argument('--size', type=int, default=10000)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--workers', type=int, default=16, help='Server worker threads')
+    args = parser.parse_args()
+
+    install_omdb_stub()
+    with tempfile.TemporaryDirectory() as tmp:
+        cls, file_name = BACKENDS[args.backend]
+        storage = cls(os.path.join(tmp, file_name))
+        library = make_library(args.size)
+        storage.add_movies_bulk(library)
+        titles = list(library)
+
+        server = MovieApiServer(('127.0.0.1', 0), storage, workers=args.workers)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        results = []
+        deadline = time.perf_counter() + args.duration
+        threads = [threading.Thread(target=client,
+                                    args=(server.server_address[:2], titles, deadline, n, results))
+                   for n in range(args.clients)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        server.shutdown()
+        server.server_close()
+
+    print(f"{args.backend} backend, {args.size} movies, {args.clients} clients, "
+          f"{args.workers} workers, {args.duration:.0f}s")
+    print(f"total: {len(results)} requests, {len(results) / args.duration:.0f} req/s")
+    errors = sum(1 for _, status, _ in results if status >= 500)
+    not_modified = sum(1 for _, status, _ in results if status == 304)
+    print(f"5xx: {errors}  304: {not_modified}")
+    for kind, _ in MIX:
+        samples = [elapsed for k, _, elapsed in results if k == kind]
+        if samples:
+            s = summarize(samples)
+            print(f"  {kind:12} {s['ops']:>7}  p50 {s['p50_ms']:8.2f}ms  p99 {s['p99_ms']:8.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,271 @@
+"""
+Benchmark suite: storage CRUD, search, stats, sorting, MovieApp commands
+and site generation over synthetic libraries, with a stubbed OMDb client.
+
+Each (backend, size) case runs in its own process so peak RSS is measured
+in isolation. Results are written as JSON; pass a previous result file
+with --compare to flag regressions between commits.
+
+Usage:
+    python benchmarks/run_suite.py [--sizes 1000 10000 100000] [--backends json csv]
+                                   [--ops 200] [--output bench.json] [--compare old.json]
+"""
+import argparse
+import builtins
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import website_generator  # noqa: E402
+from movie_app import MovieApp  # noqa: E402
+from storage.storage_binary import StorageBinary  # noqa: E402
+from storage.storage_csv import StorageCsv, StreamingStorageCsv  # noqa: E402
+from storage.storage_journal import StorageJournal  # noqa: E402
+from storage.storage_json import StorageJson  # noqa: E402
+from storage.storage_sharded import StorageSharded  # noqa: E402
+from storage.storage_sqlite import StorageSqlite  # noqa: E402
+from synthetic import install_omdb_stub, make_library, make_title  # noqa: E402
+
+BACKENDS = {
+    'json': (StorageJson, 'movies.json'),
+    'csv': (StorageCsv, 'movies.csv'),
+    'csv-stream': (StreamingStorageCsv, 'movies.csv'),
+    'journal': (StorageJournal, 'movies.journal'),
+    'sqlite': (StorageSqlite, 'movies.db'),
+    'binary': (StorageBinary, 'movies.bin'),
+    'sharded': (StorageSharded, 'movies.shards'),
+}
+TEMPLATE = os.path.join(ROOT, '_static', 'index_template.html')
+
+
+def summarize(samples):
+    """
+    Reduce per-operation timings to throughput and latency percentiles.
+    :param samples: list of durations in seconds
+    :return: dict with 'ops', 'total_s', 'ops_per_s', 'p50_ms', 'p99_ms'
+    """
+    ordered = sorted(samples)
+    total = sum(ordered)
+
+    def percentile(q):
+        return ordered[min(len(ordered) - 1, round(q * (len(ordered) - 1)))] * 1000
+
+    return {
+        'ops': len(ordered),
+        'total_s': total,
+        'ops_per_s': len(ordered) / total if total else None,
+        'p50_ms': percentile(0.50),
+        'p99_ms': percentile(0.99),
+    }
+
+
+def measure(fn, args):
+    """Call fn once per argument and summarize the timings."""
+    samples = []
+    for arg in args:
+        start = time.perf_counter()
+        fn(arg)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def run_case(backend, size, ops):
+    """
+    Benchmark one backend at one library size.
+    :return: dict of metric name to summary
+    """
+    install_omdb_stub()
+    rng = random.Random(size)
+    library = make_library(size)
+    titles = list(library)
+    cls, file_name = BACKENDS[backend]
+    heavy = max(1, min(ops, 5))
+    metrics = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, file_name)
+        storage = cls(path)
+        metrics['bulk_load'] = measure(storage.add_movies_bulk, [library])
+        del library
+        if hasattr(storage, 'close'):
+            storage.close()
+
+        def cold_open(_):
+            fresh = cls(path)
+            len(fresh.list_movies())
+            if hasattr(fresh, 'close'):
+                fresh.close()
+
+        metrics['open'] = measure(cold_open, range(heavy))
+        storage = cls(path)
+
+        def iterate(_):
+            for _ in storage.list_movies().items():
+                pass
+
+        metrics['list'] = measure(iterate, range(heavy))
+        metrics['get'] = measure(storage.get_movie, rng.choices(titles, k=ops))
+        new_titles = [f"Bench Movie {i}" for i in range(ops)]
+        metrics['add'] = measure(lambda t: storage.add_movie(t, 2000, 5.0, ''), new_titles)
+        metrics['update'] = measure(lambda t: storage.update_movie(t, 6.5),
+                                    rng.choices(titles, k=ops))
+        metrics['delete'] = measure(storage.delete_movie, new_titles)
+
+        queries = [make_title(rng.randrange(size)).split()[rng.randrange(3)][:5]
+                   for _ in range(ops)]
+        metrics['search'] = measure(storage.search_title, queries)
+        typos = [t[:3] + t[4:] for t in rng.choices(titles, k=heavy)]
+        metrics['fuzzy_search'] = measure(storage.fuzzy_search_title, typos)
+        metrics['stats'] = measure(lambda _: (storage.rating_stats(),
+                                              storage.rating_breakdown('decade')),
+                                   range(heavy))
+        metrics['sort_top10'] = measure(lambda _: storage.top_by_rating(10), range(heavy))
+        metrics['sort_all'] = measure(lambda _: storage.top_by_rating(), range(heavy))
+
+        app = MovieApp(storage)
+        metrics['app_add'] = measure(
+            lambda t: _run_command(app._command_add_movie, [t]),
+            [f"App Movie {i}" for i in range(ops)])
+        metrics['app_stats'] = measure(lambda _: _run_command(app._command_show_stats, []),
+                                       range(heavy))
+        metrics['app_search'] = measure(
+            lambda q: _run_command(app._command_search_movies, [q]), queries[:heavy])
+
+        output = os.path.join(tmp, 'index.html')
+        metrics['generate_site'] = measure(
+            lambda _: website_generator.generate_website(storage, TEMPLATE, output, 'Bench'),
+            range(heavy))
+        if hasattr(storage, 'close'):
+            storage.close()
+
+    result = {'backend': backend, 'size': size, 'metrics': metrics}
+    if resource is not None:
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        scale = 1 if sys.platform == 'darwin' else 1024
+        result['peak_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20
+    return result
+
+
+def _run_command(command, answers):
+    """Run a MovieApp command handler with scripted input and muted output."""
+    replies = iter(answers)
+    original = builtins.input
+    builtins.input = lambda prompt='': next(replies)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            command()
+    finally:
+        builtins.input = original
+
+
+def run_isolated(backend, size, ops):
+    """Run one case in a child process and return its result."""
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--case', backend, str(size), '--ops', str(ops)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out)
+
+
+def git_commit():
+    """Current commit hash, or None outside a git checkout."""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline, current, threshold):
+    """
+    Print p50 changes against a baseline run.
+    :return: Number of metrics that got slower by more than threshold
+    """
+    old = {(r['backend'], r['size']): r['metrics'] for r in baseline['results']}
+    regressions = 0
+    for result in current['results']:
+        previous = old.get((result['backend'], result['size']))
+        if previous is None:
+            continue
+        for name, summary in result['metrics'].items():
+            before = previous.get(name, {}).get('p50_ms')
+            if not before:
+                continue
+            ratio = summary['p50_ms'] / before
+            flag = ''
+            if ratio > 1 + threshold:
+                flag = '  REGRESSION'
+                regressions += 1
+            print(f"{result['backend']:8} {result['size']:>8} {name:14} "
+                  f"{before:10.3f}ms -> {summary['p50_ms']:10.3f}ms  x{ratio:5.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--backends', nargs='+', choices=list(BACKENDS), default=list(BACKENDS))
+    parser.add_argument('--ops', type=int, default=200, help='Operations per latency metric')
+    parser.add_argument('--output', default=None, help='Write results to this JSON file')
+    parser.add_argument('--compare', default=None, metavar='BASELINE',
+                        help='Compare p50 latencies against an earlier result file')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Relative p50 slowdown reported as a regression (default 0.25)')
+    parser.add_argument('--case', nargs=2, metavar=('BACKEND', 'SIZE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(args.case[0], int(args.case[1]), args.ops)))
+        return
+
+    results = []
+    for size in args.sizes:
+        for backend in args.backends:
+            result = run_isolated(backend, size, args.ops)
+            results.append(result)
+            m = result['metrics']
+            print(f"{backend:8} {size:>8}  open {m['open']['p50_ms']:9.2f}ms  "
+                  f"add p50 {m['add']['p50_ms']:8.3f}ms  search p50 {m['search']['p50_ms']:8.3f}ms  "
+                  f"site {m['generate_site']['p50_ms']:9.1f}ms  "
+                  f"rss {result.get('peak_rss_mb', 0):7.1f}MiB", file=sys.stderr)
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'ops': args.ops,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(baseline, report, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Synthetic movie libraries and an offline OMDb stub for the benchmarks.
+"""
+import random
+
+import omdb_client
+
+_ADJECTIVES = ['Dark', 'Silent', 'Last', 'Lost', 'Golden', 'Broken', 'Hidden', 'Wild',
+               'Frozen', 'Crimson', 'Eternal', 'Little', 'Secret', 'Final', 'Electric']
+_NOUNS = ['Night', 'River', 'Empire', 'Garden', 'Storm', 'Machine', 'Kingdom', 'Witness',
+          'Horizon', 'Shadow', 'Promise', 'Island', 'Station', 'Heart', 'Voyage']
+
+
+def make_title(i):
+    """
+    Return a unique, word-based title for movie number i.
+    :param i: Movie number
+    :return: Title such as 'Dark River 42'
+    """
+    adjective = _ADJECTIVES[i % len(_ADJECTIVES)]
+    noun = _NOUNS[(i // len(_ADJECTIVES)) % len(_NOUNS)]
+    return f"{adjective} {noun} {i}"
+
+
+def make_library(size, seed=0):
+    """
+    Build a deterministic library of movies.
+    :param size: Number of movies (1k-1M is typical)
+    :param seed: Random seed, so runs are comparable between commits
+    :return: dict of movies keyed by title
+    """
+    rng = random.Random(seed)
+    return {
+        make_title(i): {
+            'year': rng.randint(1920, 2024),
+            'rating': rng.randint(10, 99) / 10,
+            'poster': f"https://m.media-amazon.com/images/M/poster-{rng.randrange(200)}.jpg",
+        }
+        for i in range(size)
+    }
+
+
+def fake_movie_data(title):
+    """
+    Answer like OMDb for any title, without network access.
+    :param title: Requested title
+    :return: dict shaped like an OMDb response
+    """
+    rng = random.Random(title)
+    return {
+        'Response': 'True',
+        'Title': title,
+        'Year': str(rng.randint(1920, 2024)),
+        'imdbRating': str(rng.randint(10, 99) / 10),
+        'Poster': 'https://m.media-amazon.com/images/M/stub.jpg',
+    }
+
+
+def install_omdb_stub():
+    """Route omdb_client.get_movie_data to fake_movie_data."""
+    omdb_client.get_movie_data = fake_movie_data
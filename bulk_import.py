@@ -0,0 +1,114 @@
+# bulk_import.py
+
+import csv
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import omdb_client
+from omdb_cache import normalize_title
+
+
+class ImportReport:
+    """Outcome of a bulk import."""
+
+    def __init__(self):
+        self.added = []
+        self.skipped = []
+        self.failed = []
+
+    def summary(self) -> str:
+        """One-line summary of the import."""
+        return (f"Added {len(self.added)}, skipped {len(self.skipped)} "
+                f"already present, {len(self.failed)} failed.")
+
+
+def read_titles(path):
+    """
+    Read movie titles from a text file (one per line) or a CSV file.
+
+    CSV files use the 'title' column if present, otherwise the first column.
+
+    :param path: Path to a .txt or .csv file
+    :return: list of titles in file order, blanks removed
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        if not path.lower().endswith('.csv'):
+            return [line.strip() for line in f if line.strip()]
+        rows = list(csv.reader(f))
+    if not rows:
+        return []
+    header = [col.strip().lower() for col in rows[0]]
+    if 'title' in header:
+        column = header.index('title')
+        rows = rows[1:]
+    else:
+        column = 0
+    return [row[column].strip() for row in rows
+            if len(row) > column and row[column].strip()]
+
+
+def import_titles(storage, titles, workers=8):
+    """
+    Fetch titles from OMDb concurrently and add them with one batched write.
+
+    Titles already in storage (or repeated in the input) are skipped
+    before and after the lookup. Lookup failures are collected in the
+    report instead of stopping the run.
+
+    :param storage: IStorage instance to add movies to
+    :param titles: Iterable of movie titles
+    :param workers: Maximum number of concurrent OMDb lookups
+    :return: ImportReport
+    """
+    report = ImportReport()
+    known = {normalize_title(title) for title in storage.list_movies()}
+
+    pending = []
+    for title in titles:
+        key = normalize_title(title)
+        if key in known:
+            report.skipped.append(title)
+        else:
+            known.add(key)
+            pending.append(title)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_fetch, pending))
+
+    existing = {normalize_title(title) for title in storage.list_movies()}
+    fetched_at = int(time.time())
+    batch = {}
+    for requested, (movie, error) in zip(pending, results):
+        if error is not None:
+            report.failed.append((requested, error))
+            continue
+        title, year, rating, poster = movie
+        key = normalize_title(title)
+        if key in existing:
+            report.skipped.append(requested)
+            continue
+        existing.add(key)
+        batch[title] = {'year': year, 'rating': rating, 'poster': poster,
+                        'fetched_at': fetched_at}
+        report.added.append(title)
+
+    if batch:
+        storage.add_movies_bulk(batch)
+    return report
+
+
+def _fetch(title):
+    """
+    Look up one title, capturing errors instead of raising.
+
+    :return: ((title, year, rating, poster), None) or (None, error message)
+    """
+    try:
+        data = omdb_client.get_movie_data(title)
+        return omdb_client.parse_movie_data(data), None
+    except omdb_client.MovieNotFoundError:
+        return None, 'not found in OMDb'
+    except omdb_client.OmdbAPIError as exc:
+        return None, f'OMDb API error: {exc}'
+    except (TypeError, ValueError) as exc:
+        return None, f'invalid OMDb data: {exc}'
@@ -0,0 +1,278 @@
+# commands.py
+
+"""
+Non-interactive MovieApp commands for scripting.
+
+The same subcommands are used on the command line
+(`python main.py add "The Matrix"`) and, one per line, in --batch files.
+Every command produces one JSON object, so output can be consumed as
+JSON lines.
+"""
+import argparse
+import json
+import os
+import shlex
+import time
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '_static')
+
+
+class CommandError(Exception):
+    """A command could not be parsed or carried out."""
+    pass
+
+
+class CommandParser(argparse.ArgumentParser):
+    """ArgumentParser that raises CommandError instead of exiting the process."""
+
+    def error(self, message):
+        raise CommandError(message)
+
+
+def add_command_parsers(subparsers):
+    """
+    Register the scripting subcommands.
+    :param subparsers: Result of ArgumentParser.add_subparsers()
+    """
+    p = subparsers.add_parser('list', help='List movies as JSON.')
+    p.add_argument('--offset', type=int, default=0)
+    p.add_argument('--limit', type=int, default=None)
+
+    p = subparsers.add_parser('search', help='Search titles (with fuzzy suggestions).')
+    p.add_argument('query')
+
+    subparsers.add_parser('stats', help='Rating statistics.')
+
+    p = subparsers.add_parser('add', help='Add a movie via OMDb, or offline with --year/--rating.')
+    p.add_argument('title')
+    p.add_argument('--year', type=int, default=None)
+    p.add_argument('--rating', type=float, default=None)
+    p.add_argument('--poster', default='')
+
+    p = subparsers.add_parser('delete', help='Delete a movie.')
+    p.add_argument('title')
+
+    p = subparsers.add_parser('update', help="Update a movie's rating.")
+    p.add_argument('title')
+    p.add_argument('rating', type=float)
+
+    p = subparsers.add_parser('refresh', help='Re-fetch stale movie data from OMDb.')
+    p.add_argument('--max-age-days', type=float, default=30.0,
+                   help='Refresh movies fetched longer ago than this (default 30).')
+    p.add_argument('--workers', dest='refresh_workers', type=int, default=8,
+                   help='Concurrent OMDb lookups (default 8).')
+    p.add_argument('--rate', type=float, default=10.0,
+                   help='Maximum OMDb requests per second (default 10).')
+    p.add_argument('--chunk-size', type=int, default=500,
+                   help='Movies read and written back per step (default 500).')
+    p.add_argument('--checkpoint', default=None,
+                   help='Resume file (default data/refresh_checkpoint.json).')
+
+    p = subparsers.add_parser('generate', help='Generate the static website.')
+    p.add_argument('--output', default=None,
+                   help='Output file, or directory with --per-page (default _static/).')
+    p.add_argument('--per-page', dest='page_size', type=int, default=None,
+                   help='Write pages of this many movies instead of one index.html.')
+
+
+def build_parser():
+    """
+    Return a parser for a single command line such as 'update "Heat" 8.5'.
+    :return: CommandParser
+    """
+    parser = CommandParser(prog='', add_help=False)
+    add_command_parsers(parser.add_subparsers(dest='command', required=True,
+                                              parser_class=CommandParser))
+    return parser
+
+
+def movie_to_json(title, info):
+    """
+    Flatten a (title, info) pair for JSON output.
+    :return: dict with 'title', 'year', 'rating', 'poster'
+    """
+    return {'title': title, 'year': info['year'], 'rating': info['rating'],
+            'poster': info.get('poster', '')}
+
+
+def execute(storage, args):
+    """
+    Run one parsed command against storage.
+    :param storage: IStorage instance
+    :param args: Namespace from a parser set up by add_command_parsers
+    :return: JSON-serializable result dict
+    :raises CommandError: If the command cannot be carried out
+    """
+    handler = _HANDLERS[args.command]
+    return handler(storage, args)
+
+
+def run(storage, args):
+    """
+    Run one parsed command, capturing CommandError.
+    :return: Result record with 'command', 'ok' and 'result' or 'error'
+    """
+    try:
+        return {'command': args.command, 'ok': True, 'result': execute(storage, args)}
+    except CommandError as exc:
+        return {'command': args.command, 'ok': False, 'error': str(exc)}
+
+
+def run_line(storage, parser, line):
+    """
+    Parse and run one command line such as 'update "Heat" 8.5'.
+    Unexpected exceptions are reported in the record too, so one bad line
+    cannot abort (and roll back) the batch it is part of.
+    :param parser: Parser from build_parser()
+    :return: Result record as for run(); unparsable lines get 'command': None
+    """
+    try:
+        args = parser.parse_args(shlex.split(line))
+    except (CommandError, ValueError) as exc:  # shlex raises ValueError on open quotes
+        return {'command': None, 'ok': False, 'error': str(exc)}
+    try:
+        return run(storage, args)
+    except Exception as exc:
+        return {'command': args.command, 'ok': False, 'error': f'{type(exc).__name__}: {exc}'}
+
+
+def run_batch(storage, lines, out):
+    """
+    Run many commands against one storage instance.
+
+    Mutations are grouped with storage.batch(), so backends that support
+    it write the library once at the end. Blank lines and lines starting
+    with '#' are skipped. A failing command is reported and the batch
+    continues.
+
+    :param storage: IStorage instance
+    :param lines: Iterable of command lines
+    :param out: Text stream receiving one JSON object per command
+    :return: Number of failed commands
+    """
+    parser = build_parser()
+    parser.set_defaults(in_batch=True)
+    failures = 0
+    with storage.batch():
+        for number, line in enumerate(lines, start=1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            record = run_line(storage, parser, line)
+            record['line'] = number
+            failures += not record['ok']
+            out.write(json.dumps(record) + '\n')
+    return failures
+
+
+def _list(storage, args):
+    if args.offset < 0 or (args.limit is not None and args.limit < 0):
+        raise CommandError('--offset and --limit must not be negative')
+    total, items = storage.list_page(args.offset, args.limit)
+    return {'total': total, 'movies': [movie_to_json(t, info) for t, info in items]}
+
+
+def _search(storage, args):
+    results = storage.search_title(args.query)
+    suggestions = [] if results else storage.fuzzy_search_title(args.query)
+    return {'results': [movie_to_json(t, info) for t, info in results],
+            'suggestions': [movie_to_json(t, info) for t, info in suggestions]}
+
+
+def _stats(storage, args):
+    return {'stats': storage.rating_stats(),
+            'decades': {str(k): v for k, v in storage.rating_breakdown('decade').items()}}
+
+
+def _add(storage, args):
+    if (args.year is None) != (args.rating is None):
+        raise CommandError('--year and --rating must be given together')
+    if args.year is not None:
+        title, year, rating, poster = args.title, args.year, args.rating, args.poster
+        fetched_at = None
+    else:
+        import omdb_client
+        try:
+            data = omdb_client.get_movie_data(args.title)
+        except omdb_client.MovieNotFoundError:
+            raise CommandError(f"Movie '{args.title}' not found in OMDb")
+        except omdb_client.OmdbAPIError as exc:
+            raise CommandError(f'OMDb API error: {exc}')
+        try:
+            title, year, rating, poster = omdb_client.parse_movie_data(data)
+        except (TypeError, ValueError) as exc:
+            raise CommandError(f"Invalid OMDb data for '{args.title}': {exc}")
+        fetched_at = int(time.time())
+    if storage.get_movie(title) is not None:
+        raise CommandError(f"Movie '{title}' already exists")
+    storage.add_movie(title, year, rating, poster, fetched_at=fetched_at)
+    return {'movie': movie_to_json(title, {'year': year, 'rating': rating, 'poster': poster})}
+
+
+def _delete(storage, args):
+    if storage.get_movie(args.title) is None:
+        raise CommandError(f"Movie '{args.title}' not found")
+    storage.delete_movie(args.title)
+    return {'title': args.title}
+
+
+def _update(storage, args):
+    if storage.get_movie(args.title) is None:
+        raise CommandError(f"Movie '{args.title}' not found")
+    storage.update_movie(args.title, args.rating)
+    return {'movie': movie_to_json(args.title, storage.get_movie(args.title))}
+
+
+def _refresh(storage, args):
+    import omdb_client
+    import refresh
+
+    if getattr(args, 'in_batch', False):
+        # storage.batch() defers the writes, but the checkpoint is saved at
+        # once, so a crash could record progress that was never persisted
+        raise CommandError('refresh cannot run inside --batch; run it as its own command')
+    if args.refresh_workers < 1 or args.rate <= 0 or args.chunk_size < 1:
+        raise CommandError('--workers, --rate and --chunk-size must be positive')
+    checkpoint = args.checkpoint or refresh.DEFAULT_CHECKPOINT
+    try:
+        report = refresh.refresh_library(storage, max_age=args.max_age_days * refresh.DAY,
+                                         workers=args.refresh_workers, rate=args.rate,
+                                         chunk_size=args.chunk_size, checkpoint_path=checkpoint)
+    except omdb_client.OmdbAPIError as exc:
+        raise CommandError(f'OMDb API error: {exc} (progress saved, run again to resume)')
+    return {'resumed': report.resumed, 'checked': report.checked,
+            'refreshed': len(report.refreshed), 'changed': report.changed,
+            'failed': dict(report.failed)}
+
+
+def _generate(storage, args):
+    import website_generator
+
+    template = os.path.join(STATIC_DIR, 'index_template.html')
+    title = 'My Movie Library'
+    if args.page_size:
+        output_dir = args.output or STATIC_DIR
+        try:
+            pages = website_generator.generate_paginated_site(storage, template, output_dir,
+                                                              title, per_page=args.page_size)
+        except OSError as exc:
+            raise CommandError(f'Failed to generate website: {exc}')
+        return {'output': output_dir, 'pages_written': len(pages)}
+    output = args.output or os.path.join(STATIC_DIR, 'index.html')
+    try:
+        website_generator.generate_website(storage, template, output, title)
+    except OSError as exc:
+        raise CommandError(f'Failed to generate website: {exc}')
+    return {'output': output}
+
+
+_HANDLERS = {
+    'list': _list,
+    'search': _search,
+    'stats': _stats,
+    'add': _add,
+    'delete': _delete,
+    'update': _update,
+    'refresh': _refresh,
+    'generate': _generate,
+}
@@ -0,0 +1,193 @@
+# instrumentation.py
+
+"""
+Lightweight timing instrumentation.
+
+Timers are named by area ('storage.*', 'omdb.*', 'website.*') so a slow
+session can be attributed to file I/O, network or rendering. Recording is
+off by default; a disabled timer costs one global flag check.
+"""
+import bisect
+import functools
+import threading
+import time
+
+# Histogram bucket upper bounds in milliseconds; the last bucket is open-ended
+BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000)
+
+_enabled = False
+_metrics = {}
+_lock = threading.Lock()
+
+
+class Metric:
+    """Call count, total/max time and a latency histogram for one timer."""
+
+    __slots__ = ('count', 'total', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def add(self, seconds):
+        """
+        Account for one timed call.
+        :param seconds: Duration of the call
+        """
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.buckets[bisect.bisect_left(BUCKETS_MS, seconds * 1000)] += 1
+
+    def percentile(self, q):
+        """
+        Estimate a latency percentile from the histogram.
+        :param q: Fraction between 0 and 1
+        :return: Upper bound of the bucket holding the percentile (capped at the maximum), in ms
+        """
+        target = q * self.count
+        seen = 0
+        for bound, hits in zip(BUCKETS_MS, self.buckets):
+            seen += hits
+            if seen >= target:
+                return min(bound, self.max * 1000)
+        return self.max * 1000
+
+
+def enable():
+    """Start recording timings."""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """Stop recording timings (already recorded data is kept)."""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    """True while timings are being recorded."""
+    return _enabled
+
+
+def reset():
+    """Forget all recorded timings."""
+    with _lock:
+        _metrics.clear()
+
+
+def record(name, seconds):
+    """
+    Record one duration under name.
+    :param name: Timer name, e.g. 'storage.list_movies'
+    :param seconds: Duration in seconds
+    """
+    with _lock:
+        metric = _metrics.get(name)
+        if metric is None:
+            metric = _metrics[name] = Metric()
+        metric.add(seconds)
+
+
+def snapshot():
+    """
+    Return the recorded metrics.
+    :return: dict mapping timer name to Metric, sorted by name
+    """
+    with _lock:
+        return dict(sorted(_metrics.items()))
+
+
+class timed:
+    """
+    Time a block or a function under a name.
+
+        with timed('website.render'):
+            ...
+
+        @timed('omdb.get_movie_data')
+        def get_movie_data(title): ...
+    """
+
+    __slots__ = ('name', '_start')
+
+    def __init__(self, name):
+        """
+        :param name: Timer name
+        """
+        self.name = name
+        self._start = None
+
+    def __enter__(self):
+        if _enabled:
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._start is not None:
+            record(self.name, time.perf_counter() - self._start)
+            self._start = None
+
+    def __call__(self, func):
+        name = self.name
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+
+        return wrapper
+
+
+def instrument(obj, prefix, methods):
+    """
+    Wrap an object so the given methods are timed as '<prefix>.<method>'.
+
+    Only the wrapper pays for timing, so instrumenting is opt-in and the
+    wrapped object itself is unchanged.
+
+    :param obj: Object to wrap (e.g. an IStorage instance)
+    :param prefix: Timer name prefix, e.g. 'storage'
+    :param methods: Names of the methods to time
+    :return: Proxy forwarding every attribute to obj
+    """
+    return _Instrumented(obj, prefix, frozenset(methods))
+
+
+class _Instrumented:
+    def __init__(self, obj, prefix, methods):
+        self._obj = obj
+        self._prefix = prefix
+        self._methods = methods
+
+    def __getattr__(self, name):
+        attr = getattr(self._obj, name)
+        if name in self._methods and callable(attr):
+            return timed(f'{self._prefix}.{name}')(attr)
+        return attr
+
+
+def format_report(metrics=None):
+    """
+    Render recorded metrics as a text table, slowest total first.
+    :param metrics: dict from snapshot(); defaults to the current recording
+    :return: Multi-line string
+    """
+    metrics = snapshot() if metrics is None else metrics
+    if not metrics:
+        return 'No timings recorded.'
+    lines = [f"{'timer':34} {'count':>7} {'total ms':>10} {'mean ms':>9} "
+             f"{'p50 ms':>8} {'p99 ms':>8} {'max ms':>9}"]
+    for name, m in sorted(metrics.items(), key=lambda item: -item[1].total):
+        lines.append(f"{name:34} {m.count:>7} {m.total * 1000:>10.1f} "
+                     f"{m.total / m.count * 1000:>9.2f} {m.percentile(0.5):>8.2f} "
+                     f"{m.percentile(0.99):>8.2f} {m.max * 1000:>9.2f}")
+    return '\n'.join(lines)
@@ -4,10 +4,44 @@
 Entry point for the Movie Application with dynamic storage selection.
 """
 import argparse
+import importlib
+import json
+import sys
 
-from movie_app import MovieApp
-from storage.storage_csv import StorageCsv
-from storage.storage_json import StorageJson
+import commands
+
+# Backends and feature modules are imported only when the chosen options
+# need them, which keeps startup fast for scripted invocations.
+STORAGE_BACKENDS = {
+    "json": "storage.storage_json:StorageJson",
+    "csv": "storage.storage_csv:StorageCsv",
+    "csv-stream": "storage.storage_csv:StreamingStorageCsv",
+    "journal": "storage.storage_journal:StorageJournal",
+    "sqlite": "storage.storage_sqlite:StorageSqlite",
+    "binary": "storage.storage_binary:StorageBinary",
+    "sharded": "storage.storage_sharded:StorageSharded",
+}
+
+DEFAULT_FILES = {
+    "json": "data/movies.json",
+    "csv": "data/movies.csv",
+    "csv-stream": "data/movies.csv",
+    "journal": "data/movies.journal",
+    "sqlite": "data/movies.db",
+    "binary": "data/movies.bin",
+    "sharded": "data/movies.shards",
+}
+
+
+def load_backend(name):
+    """
+    Import and return the storage class registered under name.
+
+    :param name: Key of STORAGE_BACKENDS
+    :return: IStorage subclass
+    """
+    module_name, class_name = STORAGE_BACKENDS[name].split(":")
+    return getattr(importlib.import_module(module_name), class_name)
 
 
 def parse_args():
@@ -16,16 +50,145 @@ def parse_args():
     )
     parser.add_argument(
         "--storage",
-        choices=["json", "csv"],
+        choices=list(STORAGE_BACKENDS),
         default="json",
-        help="Storage backend to use (json or csv)."
+        help="Storage backend to use (json, csv, csv-stream, journal, sqlite, binary or sharded)."
     )
     parser.add_argument(
         "--file",
         default=None,
         help="Path to the storage file. If omitted, uses default based on storage type."
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--migrate-from",
+        default=None,
+        metavar="SOURCE",
+        help="Bulk-load an existing movies.json/movies.csv into the chosen storage and exit."
+    )
+    parser.add_argument(
+        "--import-titles",
+        default=None,
+        metavar="FILE",
+        help="Fetch every title in a text/CSV file from OMDb, add them in one batch and exit."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Concurrent OMDb lookups for --import-titles, or request workers for --serve (default 8)."
+    )
+    parser.add_argument(
+        "--per-page",
+        type=int,
+        default=None,
+        help="Generate the website as several pages with this many movies each."
+    )
+    parser.add_argument(
+        "--mirror-posters",
+        action="store_true",
+        help="Download posters into _static/posters/ and point the website at the local copies."
+    )
+    parser.add_argument(
+        "--columnar",
+        action="store_true",
+        help="Keep the json/csv library in memory as a compact columnar table."
+    )
+    parser.add_argument(
+        "--json-codec",
+        choices=["auto", "orjson", "ujson", "json"],
+        default="auto",
+        help="JSON encoder for --storage json (default: fastest installed)."
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write the JSON file without indentation."
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=None,
+        help="Number of shard files for --storage sharded (default 16 for a new library). "
+             "A different count than the library has reshards it."
+    )
+    parser.add_argument(
+        "--shard-format",
+        choices=["json", "csv"],
+        default=None,
+        help="Shard file format for --storage sharded (default json for a new library)."
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Serve the library as an HTTP/JSON API instead of the interactive menu."
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Interface for --serve (default 127.0.0.1)."
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8000,
+        help="Port for --serve (default 8000)."
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time storage, OMDb and website calls and print a summary on exit."
+    )
+    parser.add_argument(
+        "--profile-dump",
+        default=None,
+        metavar="FILE",
+        help="Also run under cProfile and write pstats data to FILE (implies --profile)."
+    )
+    parser.add_argument(
+        "--batch",
+        default=None,
+        metavar="FILE",
+        help="Run one subcommand per line from FILE ('-' for stdin) against a single "
+             "storage instance, writing all changes once; prints JSON lines."
+    )
+    subparsers = parser.add_subparsers(
+        dest="command",
+        metavar="COMMAND",
+        title="commands",
+        description="Run a single command and print the result as JSON "
+                    "(without one, the interactive menu starts)."
+    )
+    commands.add_command_parsers(subparsers)
+    args = parser.parse_args()
+    if args.profile_dump:
+        args.profile = True
+    if args.columnar and args.storage not in ("json", "csv"):
+        parser.error("--columnar requires --storage json or csv")
+    if (args.compact or args.json_codec != "auto") and args.storage != "json":
+        parser.error("--json-codec and --compact require --storage json")
+    if (args.shards is not None or args.shard_format) and args.storage != "sharded":
+        parser.error("--shards and --shard-format require --storage sharded")
+    if args.shards is not None and args.shards < 1:
+        parser.error("--shards must be at least 1")
+    if args.batch and args.command:
+        parser.error("--batch cannot be combined with a command")
+    if args.command == "generate" and args.page_size is None:
+        args.page_size = args.per_page
+    return args
+
+
+def migrate(source_path, storage):
+    """
+    Copy every movie from a JSON or CSV file into storage in one batch.
+
+    :param source_path: Path to a .json (.json.gz, .json.zst) or .csv movie file
+    :param storage: Target IStorage instance
+    """
+    source_cls = load_backend("csv" if source_path.lower().endswith(".csv") else "json")
+    source = source_cls(source_path)
+    movies = source.list_movies()
+    storage.add_movies_bulk(movies)
+    print(f"Migrated {len(movies)} movies from {source_path}.")
 
 
 def main():
@@ -35,19 +198,92 @@ def main():
     args = parse_args()
 
     # Determine default file names if not provided
-    if args.file:
-        file_path = args.file
-    else:
-        file_path = "data/movies.json" if args.storage == "json" else "data/movies.csv"
+    file_path = args.file or DEFAULT_FILES[args.storage]
 
     # Instantiate the selected storage backend
+    options = {}
+    if args.columnar:
+        options["columnar"] = True
     if args.storage == "json":
-        storage = StorageJson(file_path)
-    else:
-        storage = StorageCsv(file_path)
+        options["codec"] = args.json_codec
+        options["compact"] = args.compact
+    if args.storage == "sharded":
+        options["shards"] = args.shards
+        options["shard_format"] = args.shard_format
+    storage = load_backend(args.storage)(file_path, **options)
+
+    if not args.profile:
+        run(args, storage)
+        return
+
+    import cProfile
+
+    import instrumentation
+    from storage.istorage import IStorage
+
+    instrumentation.enable()
+    public_methods = [name for name in dir(IStorage) if not name.startswith("_")]
+    storage = instrumentation.instrument(storage, "storage", public_methods)
+    profiler = cProfile.Profile() if args.profile_dump else None
+    if profiler:
+        profiler.enable()
+    try:
+        run(args, storage)
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.profile_dump)
+        print("\n" + instrumentation.format_report())
+        if profiler:
+            print(f"cProfile data written to {args.profile_dump} "
+                  f"(python -m pstats {args.profile_dump})")
+
+
+def run(args, storage):
+    """
+    Run the action selected on the command line against storage.
+    """
+    if args.migrate_from:
+        migrate(args.migrate_from, storage)
+        return
+
+    if args.import_titles:
+        import bulk_import
+
+        titles = bulk_import.read_titles(args.import_titles)
+        report = bulk_import.import_titles(storage, titles, workers=args.workers)
+        print(report.summary())
+        for title, error in report.failed:
+            print(f"  {title}: {error}")
+        return
+
+    if args.serve:
+        import api_server
+
+        api_server.serve(storage, args.host, args.port, workers=args.workers)
+        return
+
+    if args.batch:
+        if args.batch == "-":
+            failures = commands.run_batch(storage, sys.stdin, sys.stdout)
+        else:
+            with open(args.batch, encoding="utf-8") as f:
+                failures = commands.run_batch(storage, f, sys.stdout)
+        if failures:
+            sys.exit(1)
+        return
+
+    if args.command:
+        record = commands.run(storage, args)
+        print(json.dumps(record))
+        if not record["ok"]:
+            sys.exit(1)
+        return
 
     # Create and run the application
-    app = MovieApp(storage)
+    from movie_app import MovieApp
+
+    app = MovieApp(storage, per_page=args.per_page, mirror_posters=args.mirror_posters)
     app.run()
 
 
@@ -1,11 +1,10 @@
 import os
-import random
-import statistics
+import time
 
 from colorama import init, Fore, Style
 
-import omdb_client
-import website_generator
+# omdb_client, poster_mirror and website_generator are imported inside the
+# commands that use them, so sessions that only read the library start fast
 
 
 class MovieApp:
@@ -14,13 +13,17 @@ class MovieApp:
     and delegate storage operations.
     """
 
-    def __init__(self, storage):
+    def __init__(self, storage, per_page=None, mirror_posters=False):
         """
         Initialize MovieApp with a storage implementing IStorage.
 
         :param storage: Instance of IStorage
+        :param per_page: If set, generate the website as pages of this many movies
+        :param mirror_posters: Download posters into _static/ before generating the website
         """
         self._storage = storage
+        self._per_page = per_page
+        self._mirror_posters = mirror_posters
         init(autoreset=True)
 
     def _print_menu(self):
@@ -52,6 +55,8 @@ class MovieApp:
 
     def _command_add_movie(self):
         """Add a new movie using OMDb API."""
+        import omdb_client
+
         title_input = input("Enter movie title: ").strip()
         try:
             data = omdb_client.get_movie_data(title_input)
@@ -63,27 +68,19 @@ class MovieApp:
             return
 
         # Extract and normalize data
-        title = data.get('Title')
-        year = int(data.get('Year', 0))
-        try:
-            rating = float(data.get('imdbRating', 0.0))
-        except (TypeError, ValueError):
-            rating = 0.0
-        poster = data.get('Poster', '')
+        title, year, rating, poster = omdb_client.parse_movie_data(data)
 
-        movies = self._storage.list_movies()
-        if title in movies:
+        if self._storage.get_movie(title) is not None:
             print(Fore.RED + f"Error: Movie '{title}' already exists." + Style.RESET_ALL)
             return
 
-        self._storage.add_movie(title, year, rating, poster)
+        self._storage.add_movie(title, year, rating, poster, fetched_at=int(time.time()))
         print(f"Added '{title}' ({year}) with rating {rating}.")
 
     def _command_delete_movie(self):
         """Delete an existing movie."""
         title = input("Enter movie title to delete: ").strip()
-        movies = self._storage.list_movies()
-        if title not in movies:
+        if self._storage.get_movie(title) is None:
             print(Fore.RED + f"Error: Movie '{title}' not found." + Style.RESET_ALL)
             return
         self._storage.delete_movie(title)
@@ -92,8 +89,7 @@ class MovieApp:
     def _command_update_movie_rating(self):
         """Update rating for an existing movie."""
         title = input("Enter movie title to update rating: ").strip()
-        movies = self._storage.list_movies()
-        if title not in movies:
+        if self._storage.get_movie(title) is None:
             print(Fore.RED + f"Error: Movie '{title}' not found." + Style.RESET_ALL)
             return
         rating = float(input("Enter new rating (1-10): ").strip())
@@ -102,58 +98,71 @@ class MovieApp:
 
     def _command_show_stats(self):
         """Show statistics: avg, median, best and worst movies."""
-        movies = self._storage.list_movies()
-        if not movies:
+        stats = self._storage.rating_stats()
+        if not stats:
             print("No movies in database.")
             return
-        ratings = [info['rating'] for info in movies.values()]
-        avg_rating = statistics.mean(ratings)
-        median_rating = statistics.median(ratings)
-        max_rating = max(ratings)
-        min_rating = min(ratings)
-        best = [t for t, info in movies.items() if info['rating'] == max_rating]
-        worst = [t for t, info in movies.items() if info['rating'] == min_rating]
+        best = stats['best']
+        worst = stats['worst']
         plural_best = 's' if len(best) > 1 else ''
         plural_worst = 's' if len(worst) > 1 else ''
-        print(f"Average rating: {avg_rating:.2f}")
-        print(f"Median rating: {median_rating:.2f}")
-        print(f"Best movie{plural_best} ({max_rating}): {', '.join(best)}")
-        print(f"Worst movie{plural_worst} ({min_rating}): {', '.join(worst)}")
+        print(f"Average rating: {stats['average']:.2f}")
+        print(f"Median rating: {stats['median']:.2f}")
+        print(f"Best movie{plural_best} ({stats['best_rating']}): {', '.join(best)}")
+        print(f"Worst movie{plural_worst} ({stats['worst_rating']}): {', '.join(worst)}")
+        print("Average rating by decade:")
+        for decade, info in self._storage.rating_breakdown('decade').items():
+            print(f"  {decade}s: {info['average']:.2f} ({info['count']} movies)")
 
     def _command_pick_random_movie(self):
         """Pick and display a random movie."""
-        movies = self._storage.list_movies()
-        if not movies:
+        pick = self._storage.random_movie()
+        if not pick:
             print("No movies in database.")
             return
-        title, info = random.choice(list(movies.items()))
+        title, info = pick
         print(f"Random pick: {title} ({info['year']}), {info['rating']}")
 
     def _command_search_movies(self):
         """Search movies by partial title."""
-        movies = self._storage.list_movies()
-        query = input("Enter part of movie title: ").strip().lower()
-        results = [(t, info) for t, info in movies.items() if query in t.lower()]
+        query = input("Enter part of movie title: ").strip()
+        results = self._storage.search_title(query)
         if results:
             for t, info in results:
                 print(f"{t} ({info['year']}), {info['rating']}")
-        else:
-            print("No matching movies found.")
+            return
+        print("No matching movies found.")
+        suggestions = self._storage.fuzzy_search_title(query)
+        if suggestions:
+            print("Did you mean:")
+            for t, info in suggestions:
+                print(f"  {t} ({info['year']}), {info['rating']}")
 
     def _command_sorted_by_rating(self):
         """List movies sorted by descending rating."""
-        movies = self._storage.list_movies()
-        sorted_list = sorted(movies.items(), key=lambda x: x[1]['rating'], reverse=True)
-        for t, info in sorted_list:
+        for t, info in self._storage.top_by_rating():
             print(f"{t} ({info['year']}): {info['rating']}")
 
     def _command_generate_website(self):
         """Generate a static HTML page for the movie library."""
-        template = os.path.join(os.path.dirname(__file__), '_static', 'index_template.html')
-        output = os.path.join(os.path.dirname(__file__), '_static', 'index.html')
+        import poster_mirror
+        import website_generator
+
+        static_dir = os.path.join(os.path.dirname(__file__), '_static')
+        template = os.path.join(static_dir, 'index_template.html')
+        output = os.path.join(static_dir, 'index.html')
         title = 'My Movie Library'
         try:
-            website_generator.generate_website(self._storage, template, output, title)
+            poster_map = None
+            if self._mirror_posters:
+                poster_map = poster_mirror.mirror_posters(self._storage.list_movies(), static_dir)
+            if self._per_page:
+                website_generator.generate_paginated_site(self._storage, template, static_dir,
+                                                          title, per_page=self._per_page,
+                                                          poster_map=poster_map)
+            else:
+                website_generator.generate_website(self._storage, template, output, title,
+                                                   poster_map=poster_map)
             print("Website was generated successfully.")
         except Exception as exc:
             print(Fore.RED + f"Failed to generate website: {exc}" + Style.RESET_ALL)
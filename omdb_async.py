@@ -0,0 +1,143 @@
+# omdb_async.py
+
+import asyncio
+import random
+import time
+
+import aiohttp
+
+import instrumentation
+import omdb_client
+from omdb_client import MovieNotFoundError, OmdbAPIError, handle_answer, lookup_cache
+
+
+class AsyncOmdbClient:
+    """
+    Asyncio OMDb client for high-fanout lookups.
+
+    All lookups share one aiohttp connection pool, and a semaphore bounds
+    how many requests are in flight at once. Errors are reported with the
+    same MovieNotFoundError/OmdbAPIError types as omdb_client.
+
+    Use it as an async context manager:
+
+        async with AsyncOmdbClient(api_key) as client:
+            data = await client.get_movie_data('Inception')
+    """
+
+    def __init__(self, api_key=None, url=omdb_client.OMDB_URL, cache=None, timeout=5,
+                 max_concurrency=100, max_retries=3, backoff=0.5):
+        """
+        :param api_key: OMDb API key (defaults to omdb_client.API_KEY)
+        :param url: OMDb endpoint
+        :param cache: Optional OmdbCache consulted before the network
+        :param timeout: Per-request timeout in seconds
+        :param max_concurrency: Maximum lookups in flight (and pooled connections)
+        :param max_retries: Retries after the first attempt for 5xx/timeouts
+        :param backoff: Base delay in seconds for exponential backoff
+        """
+        self._api_key = api_key if api_key is not None else omdb_client.API_KEY
+        self._url = url
+        self._cache = cache
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._max_concurrency = max_concurrency
+        self._max_retries = max_retries
+        self._backoff = backoff
+        self._semaphore = None
+        self._session = None
+
+    async def __aenter__(self):
+        self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        connector = aiohttp.TCPConnector(limit=self._max_concurrency)
+        self._session = aiohttp.ClientSession(connector=connector, timeout=self._timeout)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._session.close()
+        self._session = None
+
+    async def get_movie_data(self, title: str) -> dict:
+        """
+        Fetch movie details from OMDb by title.
+
+        :param title: Movie title to search for
+        :return: Dict with keys 'Title', 'Year', 'imdbRating', 'Poster', ...
+        :raises MovieNotFoundError: If OMDb responds with no such movie
+        :raises OmdbAPIError: On network issues or HTTP errors
+        """
+        cached = await self._in_executor(lookup_cache, self._cache, title)
+        if cached is not None:
+            return cached
+
+        if not self._api_key:
+            raise OmdbAPIError('OMDB_API_KEY is not set in environment')
+
+        async with self._semaphore:
+            data = await self._request({'apikey': self._api_key, 't': title})
+        return await self._in_executor(handle_answer, self._cache, title, data)
+
+    async def get_many(self, titles) -> list:
+        """
+        Look up many titles concurrently.
+
+        :param titles: Iterable of movie titles
+        :return: list in input order; each item is the OMDb dict or the
+                 MovieNotFoundError/OmdbAPIError raised for that title
+        """
+        return await asyncio.gather(
+            *(self._lookup_or_error(title) for title in titles)
+        )
+
+    async def _lookup_or_error(self, title):
+        """Return the lookup result, or the OMDb error instead of raising it."""
+        try:
+            return await self.get_movie_data(title)
+        except (MovieNotFoundError, OmdbAPIError) as exc:
+            return exc
+
+    async def _in_executor(self, func, *args):
+        """
+        Run a cache helper on the default thread pool, so sqlite I/O does
+        not block the event loop. Without a cache it is called inline.
+        """
+        if self._cache is None:
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    async def _request(self, params):
+        """
+        Perform a GET, retrying 5xx answers and timeouts with jittered backoff.
+
+        :param params: Query parameters
+        :return: Decoded JSON response
+        :raises OmdbAPIError: When all attempts fail or on non-transient errors
+        """
+        attempt = 0
+        while True:
+            # Each attempt is timed on its own with perf_counter, so backoff
+            # sleeps and cache work on the executor are not counted
+            start = time.perf_counter()
+            try:
+                async with self._session.get(self._url, params=params) as response:
+                    if response.status < 500:
+                        response.raise_for_status()
+                        data = await response.json(content_type=None)
+                        self._record_http(start)
+                        return data
+                    error = OmdbAPIError(f'{response.status} Server Error')
+            except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as exc:
+                error = exc
+            except (aiohttp.ClientError, ValueError) as exc:
+                raise OmdbAPIError(f'Failed to reach OMDb API: {exc}') from exc
+            self._record_http(start)
+
+            if attempt >= self._max_retries:
+                raise OmdbAPIError(f'Failed to reach OMDb API: {error}') from error
+            await asyncio.sleep(random.uniform(0, self._backoff * 2 ** attempt))
+            attempt += 1
+
+    @staticmethod
+    def _record_http(start):
+        """Record one HTTP attempt under 'omdb.http' if timing is enabled."""
+        if instrumentation.is_enabled():
+            instrumentation.record('omdb.http', time.perf_counter() - start)
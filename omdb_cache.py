@@ -0,0 +1,129 @@
+# omdb_cache.py
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DAY = 24 * 60 * 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS omdb_cache (
+    key TEXT PRIMARY KEY,
+    found INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_omdb_cache_last_used ON omdb_cache (last_used);
+"""
+
+
+def normalize_title(title: str) -> str:
+    """
+    Build the cache key for a title: case-folded, whitespace collapsed.
+
+    :param title: Movie title as entered by the user
+    :return: Normalized key
+    """
+    return ' '.join(title.casefold().split())
+
+
+class OmdbCache:
+    """
+    Persistent SQLite cache for OMDb lookups.
+
+    Remembers both found movies and "Movie not found!" answers, each with
+    its own TTL. Once the cache holds more than max_entries rows, the least
+    recently used entries are evicted.
+    """
+
+    def __init__(self, path, positive_ttl=30 * DAY, negative_ttl=DAY, max_entries=10000):
+        """
+        Open (and create if needed) the cache database.
+
+        :param path: Path to the SQLite cache file
+        :param positive_ttl: Seconds a found movie stays valid
+        :param negative_ttl: Seconds a not-found answer stays valid
+        :param max_entries: Maximum number of cached titles
+        """
+        dirpath = os.path.dirname(str(path))
+        if dirpath and not os.path.exists(dirpath):
+            os.makedirs(dirpath)
+        self._positive_ttl = positive_ttl
+        self._negative_ttl = negative_ttl
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, title):
+        """
+        Look up a title.
+
+        :param title: Movie title
+        :return: None on a miss or expired entry, otherwise (found, payload)
+                 where payload is the OMDb dict if found, else the error message
+        """
+        key = normalize_title(title)
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                'SELECT found, payload, stored_at FROM omdb_cache WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            found, payload, stored_at = row
+            ttl = self._positive_ttl if found else self._negative_ttl
+            if now - stored_at > ttl:
+                self._conn.execute('DELETE FROM omdb_cache WHERE key = ?', (key,))
+                return None
+            self._conn.execute(
+                'UPDATE omdb_cache SET last_used = ? WHERE key = ?', (now, key)
+            )
+        return bool(found), json.loads(payload)
+
+    def put(self, title, data):
+        """
+        Remember a successful lookup.
+
+        :param title: Movie title as requested
+        :param data: OMDb response dict
+        """
+        self._store(title, True, data)
+
+    def put_not_found(self, title, error):
+        """
+        Remember that OMDb has no such movie.
+
+        :param title: Movie title as requested
+        :param error: OMDb error message
+        """
+        self._store(title, False, error)
+
+    def clear(self):
+        """Remove all cached entries."""
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM omdb_cache')
+
+    def close(self):
+        """Close the cache database."""
+        self._conn.close()
+
+    def _store(self, title, found, payload):
+        """Insert or replace an entry and evict the least recently used overflow."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO omdb_cache (key, found, payload, stored_at, last_used) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (normalize_title(title), int(found), json.dumps(payload), now, now),
+            )
+            (count,) = self._conn.execute('SELECT COUNT(*) FROM omdb_cache').fetchone()
+            if count > self._max_entries:
+                self._conn.execute(
+                    'DELETE FROM omdb_cache WHERE key IN ('
+                    'SELECT key FROM omdb_cache ORDER BY last_used LIMIT ?)',
+                    (count - self._max_entries,),
+                )
@@ -1,17 +1,23 @@
 # omdb_client.py
 
 import os
+import random
+import threading
+import time
 from pathlib import Path
 
-import requests
-from dotenv import load_dotenv
+from instrumentation import timed
 
-# Load environment variables from .env
+# requests, python-dotenv and the sqlite-backed cache are imported on first
+# use, so importing this module (e.g. for parse_movie_data) stays cheap
 env_path = Path(__file__).parent / 'config' / '.env'
-load_dotenv(dotenv_path=env_path)
 
-API_KEY = os.getenv('OMDB_API_KEY')
 OMDB_URL = 'http://www.omdbapi.com/'
+CACHE_PATH = Path(__file__).parent / 'data' / 'omdb_cache.db'
+
+_cache = None
+_client = None
+_api_key = None
 
 
 class OmdbAPIError(Exception):
@@ -24,32 +30,245 @@ class MovieNotFoundError(Exception):
     pass
 
 
-def get_movie_data(title: str) -> dict:
+class TokenBucket:
+    """
+    Thread-safe token bucket used to stay under the OMDb request quota.
     """
-    Fetch movie details from OMDb by title.
 
-    :param title: Movie title to search for
-    :return: Dict with keys 'Title', 'Year', 'imdbRating', 'Poster', ...
-    :raises MovieNotFoundError: If OMDb responds with no such movie
-    :raises OmdbAPIError: On network issues or HTTP errors
+    def __init__(self, rate: float, capacity: float):
+        """
+        :param rate: Tokens added per second
+        :param capacity: Maximum burst size
+        """
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._capacity,
+                                   self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self._rate
+            time.sleep(wait)
+
+
+class OmdbClient:
+    """
+    OMDb client with a pooled keep-alive session, retries with jittered
+    exponential backoff on transient errors, and client-side rate limiting.
     """
-    if not API_KEY:
-        raise OmdbAPIError('OMDB_API_KEY is not set in environment')
 
-    params = {
-        'apikey': API_KEY,
-        't': title,
-    }
+    def __init__(self, api_key=None, url=OMDB_URL, cache=None, timeout=5,
+                 max_retries=3, backoff=0.5, rate=10.0, burst=10, pool_size=10):
+        """
+        :param api_key: OMDb API key
+        :param url: OMDb endpoint
+        :param cache: Optional OmdbCache consulted before the network
+        :param timeout: Per-request timeout in seconds
+        :param max_retries: Retries after the first attempt for 5xx/timeouts
+        :param backoff: Base delay in seconds for exponential backoff
+        :param rate: Maximum requests per second
+        :param burst: Maximum burst of requests above the rate
+        :param pool_size: Maximum kept-alive connections
+        """
+        self._api_key = api_key
+        self._url = url
+        self._cache = cache
+        self._timeout = timeout
+        self._max_retries = max_retries
+        self._backoff = backoff
+        import requests
+        from requests.adapters import HTTPAdapter
 
-    try:
-        response = requests.get(OMDB_URL, params=params, timeout=5)
-        response.raise_for_status()
-    except requests.RequestException as exc:
-        raise OmdbAPIError(f'Failed to reach OMDb API: {exc}') from exc
+        self._bucket = TokenBucket(rate, burst)
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
+    @timed('omdb.get_movie_data')
+    def get_movie_data(self, title: str, fresh: bool = False) -> dict:
+        """
+        Fetch movie details from OMDb by title.
+
+        Answers (including "not found") are served from the cache when
+        available, so repeated lookups cost no network time.
+
+        :param title: Movie title to search for
+        :param fresh: Skip the cache lookup and ask OMDb (the answer is still cached)
+        :return: Dict with keys 'Title', 'Year', 'imdbRating', 'Poster', ...
+        :raises MovieNotFoundError: If OMDb responds with no such movie
+        :raises OmdbAPIError: On network issues or HTTP errors
+        """
+        cached = None if fresh else lookup_cache(self._cache, title)
+        if cached is not None:
+            return cached
+
+        if not self._api_key:
+            raise OmdbAPIError('OMDB_API_KEY is not set in environment')
+
+        data = self._request({'apikey': self._api_key, 't': title})
+        return handle_answer(self._cache, title, data)
 
-    data = response.json()
+    def close(self):
+        """Close pooled connections."""
+        self._session.close()
+
+    def _request(self, params):
+        """
+        Perform a rate-limited GET, retrying transient failures.
+
+        :param params: Query parameters
+        :return: Decoded JSON response
+        :raises OmdbAPIError: When all attempts fail or on non-transient errors
+        """
+        import requests
+
+        attempt = 0
+        while True:
+            self._bucket.acquire()
+            try:
+                with timed('omdb.http'):
+                    response = self._session.get(self._url, params=params, timeout=self._timeout)
+                if response.status_code < 500:
+                    response.raise_for_status()
+                    return response.json()
+                error = requests.HTTPError(f'{response.status_code} Server Error', response=response)
+            except (requests.Timeout, requests.ConnectionError) as exc:
+                error = exc
+            except requests.RequestException as exc:
+                raise OmdbAPIError(f'Failed to reach OMDb API: {exc}') from exc
+
+            if attempt >= self._max_retries:
+                raise OmdbAPIError(f'Failed to reach OMDb API: {error}') from error
+            # Full jitter keeps concurrent retries from arriving together
+            time.sleep(random.uniform(0, self._backoff * 2 ** attempt))
+            attempt += 1
+
+
+def lookup_cache(cache, title: str):
+    """
+    Serve a lookup from the cache if possible.
+
+    :param cache: OmdbCache or None
+    :param title: Movie title
+    :return: Cached OMDb dict, or None on a miss
+    :raises MovieNotFoundError: If a not-found answer is cached
+    """
+    if cache is None:
+        return None
+    cached = cache.get(title)
+    if cached is None:
+        return None
+    found, payload = cached
+    if not found:
+        raise MovieNotFoundError(payload)
+    return payload
+
+
+def handle_answer(cache, title: str, data: dict) -> dict:
+    """
+    Interpret a decoded OMDb answer and remember it in the cache.
+
+    :param cache: OmdbCache or None
+    :param title: Movie title as requested
+    :param data: Decoded OMDb JSON response
+    :return: data, if OMDb found the movie
+    :raises MovieNotFoundError: If OMDb responds with no such movie
+    """
     if data.get('Response') == 'False':
         # OMDb returns {"Response":"False","Error":"Movie not found!"}
-        raise MovieNotFoundError(data.get('Error', 'Movie not found'))
+        error = data.get('Error', 'Movie not found')
+        if cache is not None and 'not found' in error.lower():
+            # Do not remember errors such as "Invalid API key!"
+            cache.put_not_found(title, error)
+        raise MovieNotFoundError(error)
 
+    if cache is not None:
+        cache.put(title, data)
     return data
+
+
+def parse_movie_data(data: dict) -> tuple:
+    """
+    Extract and normalize the fields stored for a movie.
+
+    :param data: Dict returned by get_movie_data
+    :return: (title, year, rating, poster)
+    :raises ValueError: If the year cannot be parsed
+    """
+    title = data.get('Title')
+    year = int(data.get('Year', 0))
+    try:
+        rating = float(data.get('imdbRating', 0.0))
+    except (TypeError, ValueError):
+        rating = 0.0
+    poster = data.get('Poster', '')
+    return title, year, rating, poster
+
+
+def get_api_key():
+    """
+    Return OMDB_API_KEY, loading config/.env on first use.
+
+    :return: API key, or None if it is not configured
+    """
+    global _api_key
+    if _api_key is None:
+        from dotenv import load_dotenv
+        load_dotenv(dotenv_path=env_path)
+        _api_key = os.getenv('OMDB_API_KEY')
+    return _api_key
+
+
+def __getattr__(name):
+    # Keep omdb_client.API_KEY working without reading .env at import time
+    if name == 'API_KEY':
+        return get_api_key()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_cache():
+    """
+    Return the shared response cache, opening it on first use.
+
+    :return: OmdbCache stored at CACHE_PATH
+    """
+    global _cache
+    if _cache is None:
+        from omdb_cache import OmdbCache
+        _cache = OmdbCache(CACHE_PATH)
+    return _cache
+
+
+def get_client() -> OmdbClient:
+    """
+    Return the shared OmdbClient, creating it on first use.
+
+    :return: OmdbClient using the configured API key and the shared cache
+    """
+    global _client
+    if _client is None:
+        _client = OmdbClient(get_api_key(), cache=get_cache())
+    return _client
+
+
+def get_movie_data(title: str) -> dict:
+    """
+    Fetch movie details from OMDb by title via the shared OmdbClient.
+
+    :param title: Movie title to search for
+    :return: Dict with keys 'Title', 'Year', 'imdbRating', 'Poster', ...
+    :raises MovieNotFoundError: If OMDb responds with no such movie
+    :raises OmdbAPIError: On network issues or HTTP errors
+    """
+    return get_client().get_movie_data(title)
@@ -0,0 +1,117 @@
+# poster_mirror.py
+
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from instrumentation import timed
+from storage.safe_io import atomic_write
+
+POSTER_DIR_NAME = 'posters'
+MANIFEST_NAME = 'manifest.json'
+
+
+@timed('website.mirror_posters')
+def mirror_posters(movies, static_dir, workers=8, timeout=10):
+    """
+    Download remote posters into <static_dir>/posters/ and map URLs to local copies.
+
+    Files are content-addressed (sha256 of the image bytes), so identical
+    images are stored once. A manifest remembers each URL's ETag and size;
+    on later runs the download is skipped with a conditional request when
+    the server reports the poster unchanged. Failed downloads keep their
+    remote URL.
+
+    :param movies: dict of movies keyed by title
+    :param static_dir: Directory holding the generated site
+    :param workers: Maximum concurrent downloads
+    :param timeout: Per-request timeout in seconds
+    :return: dict mapping poster URL to path relative to static_dir
+    """
+    poster_dir = os.path.join(static_dir, POSTER_DIR_NAME)
+    os.makedirs(poster_dir, exist_ok=True)
+    manifest_path = os.path.join(poster_dir, MANIFEST_NAME)
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        manifest = {}
+
+    urls = sorted({info.get('poster', '') for info in movies.values()
+                   if _is_remote(info.get('poster', ''))})
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=workers)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    lock = threading.Lock()
+
+    def fetch(url):
+        entry = manifest.get(url)
+        entry = _download(session, url, entry, poster_dir, timeout, lock)
+        return url, entry
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(fetch, urls))
+    session.close()
+
+    mapping = {}
+    for url, entry in results:
+        if entry is None:
+            manifest.pop(url, None)
+            continue
+        manifest[url] = entry
+        mapping[url] = f"{POSTER_DIR_NAME}/{entry['file']}"
+
+    with atomic_write(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return mapping
+
+
+def _is_remote(url):
+    """True for http(s) URLs."""
+    return urlparse(url).scheme in ('http', 'https')
+
+
+def _download(session, url, entry, poster_dir, timeout, lock):
+    """
+    Fetch one poster unless the cached copy is still fresh.
+
+    :param entry: Manifest entry from a previous run, or None
+    :return: Manifest entry {'file', 'etag', 'size'}, or None on failure
+    """
+    cached_path = os.path.join(poster_dir, entry['file']) if entry else None
+    has_copy = cached_path is not None and os.path.exists(cached_path)
+
+    try:
+        headers = {}
+        if has_copy and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        elif has_copy:
+            # Without an ETag, treat an unchanged size as fresh
+            head = session.head(url, timeout=timeout, allow_redirects=True)
+            if head.ok and head.headers.get('Content-Length') == str(entry['size']):
+                return entry
+        response = session.get(url, headers=headers, timeout=timeout)
+        if response.status_code == 304 and has_copy:
+            return entry
+        response.raise_for_status()
+    except requests.RequestException:
+        # Keep serving the old copy if there is one
+        return entry if has_copy else None
+
+    content = response.content
+    ext = os.path.splitext(urlparse(url).path)[1].lower() or '.jpg'
+    file_name = hashlib.sha256(content).hexdigest() + ext
+    path = os.path.join(poster_dir, file_name)
+    with lock:
+        if not os.path.exists(path):
+            with atomic_write(path, 'wb') as f:
+                f.write(content)
+    return {'file': file_name, 'etag': response.headers.get('ETag'), 'size': len(content)}
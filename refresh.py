@@ -0,0 +1,184 @@
+# refresh.py
+
+"""
+Re-fetch stale OMDb data for stored movies.
+
+The library is walked in pages of chunk_size movies. A movie is stale when
+its 'fetched_at' is missing or older than the cutoff (now - max_age).
+Stale titles are looked up concurrently on a bounded worker pool through
+a rate-limited OmdbClient, and each chunk is written back with one
+IStorage.update_movies_bulk() call.
+
+After every chunk the cutoff, the offset of the next page, the last
+title processed and the failures so far are saved to a JSON checkpoint.
+An interrupted run resumes from there, and the checkpoint is removed once
+the run completes. If movies were added or deleted in between, the title
+at the saved offset no longer matches and the walk starts over from the
+first page. The cutoff is kept, so movies refreshed before the
+interruption are no longer stale and are only re-checked, not fetched
+again. Titles that already failed are not retried.
+"""
+import contextlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import omdb_client
+from storage.safe_io import atomic_write
+
+DEFAULT_CHECKPOINT = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  'data', 'refresh_checkpoint.json')
+DAY = 24 * 60 * 60
+
+
+class RefreshReport:
+    """Outcome of a refresh run."""
+
+    def __init__(self):
+        self.resumed = False
+        self.checked = 0
+        self.refreshed = []
+        self.changed = []
+        self.failed = []
+
+    def summary(self) -> str:
+        """One-line summary of the refresh."""
+        return (f"Checked {self.checked}, refreshed {len(self.refreshed)} "
+                f"({len(self.changed)} changed), {len(self.failed)} failed.")
+
+
+def refresh_library(storage, max_age=30 * DAY, workers=8, rate=10.0, chunk_size=500,
+                    checkpoint_path=DEFAULT_CHECKPOINT, client=None):
+    """
+    Re-fetch movies whose OMDb data is older than max_age and store the changes.
+
+    Every re-fetched movie gets a new 'fetched_at', even if OMDb returned
+    the same data, so it is not stale again on the next run. Titles OMDb
+    no longer finds are reported as failed and left unchanged.
+
+    :param storage: IStorage instance
+    :param max_age: Refresh movies fetched more than this many seconds ago
+    :param workers: Maximum number of concurrent OMDb lookups
+    :param rate: Maximum OMDb requests per second (ignored if client is given)
+    :param chunk_size: Movies read and written back per step
+    :param checkpoint_path: JSON file used to resume an interrupted run, or None
+    :param client: OmdbClient to use; by default one is created with the given rate
+    :return: RefreshReport
+    :raises omdb_client.OmdbAPIError: If every lookup in a chunk failed with an
+                                      API error (e.g. OMDb unreachable); the
+                                      checkpoint is kept so the run can resume
+    """
+    report = RefreshReport()
+    state = load_checkpoint(checkpoint_path) if checkpoint_path else None
+    if state is None:
+        state = {'cutoff': int(time.time() - max_age), 'offset': 0, 'last_title': None,
+                 'failed': {}}
+    else:
+        report.resumed = True
+        if not _at_checkpoint(storage, state):
+            state['offset'] = 0
+
+    owns_client = client is None
+    if owns_client:
+        client = omdb_client.OmdbClient(omdb_client.get_api_key(), cache=omdb_client.get_cache(),
+                                        rate=rate, burst=max(1.0, rate), pool_size=workers)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while True:
+                _, page = storage.list_page(state['offset'], chunk_size)
+                if not page:
+                    break
+                report.checked += len(page)
+                stale = [(title, info) for title, info in page
+                         if info.get('fetched_at', 0) < state['cutoff']
+                         and title not in state['failed']]
+                results = list(pool.map(lambda item: _fetch(client, item[0]), stale))
+                if stale and all(isinstance(error, omdb_client.OmdbAPIError)
+                                 for _, error in results):
+                    raise results[0][1]
+
+                fetched_at = int(time.time())
+                changes = {}
+                for (title, info), (fields, error) in zip(stale, results):
+                    if error is not None:
+                        state['failed'][title] = _describe(error)
+                        continue
+                    changes[title] = dict(fields, fetched_at=fetched_at)
+                    report.refreshed.append(title)
+                    if any(info.get(key) != value for key, value in fields.items()):
+                        report.changed.append(title)
+                if changes:
+                    storage.update_movies_bulk(changes)
+
+                state['offset'] += len(page)
+                state['last_title'] = page[-1][0]
+                if checkpoint_path:
+                    save_checkpoint(checkpoint_path, state)
+    finally:
+        if owns_client:
+            client.close()
+
+    report.failed = list(state['failed'].items())
+    if checkpoint_path:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(checkpoint_path)
+    return report
+
+
+def load_checkpoint(path):
+    """
+    Read a refresh checkpoint.
+    :param path: Checkpoint file path
+    :return: dict with 'cutoff', 'offset', 'last_title' and 'failed', or None if there is none
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_checkpoint(path, state):
+    """
+    Write a refresh checkpoint atomically.
+    :param path: Checkpoint file path
+    :param state: dict with 'cutoff', 'offset', 'last_title' and 'failed'
+    """
+    with atomic_write(path, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+
+
+def _at_checkpoint(storage, state):
+    """
+    Check that the library order still matches a checkpoint.
+    :return: True if the movie before the saved offset is the last title processed
+    """
+    if state['offset'] == 0:
+        return True
+    _, page = storage.list_page(state['offset'] - 1, 1)
+    return bool(page) and page[0][0] == state.get('last_title')
+
+
+def _fetch(client, title):
+    """
+    Look up one stored title, bypassing the response cache.
+
+    :return: ({'year', 'rating', 'poster'}, None) or (None, exception)
+    """
+    try:
+        data = client.get_movie_data(title, fresh=True)
+        _, year, rating, poster = omdb_client.parse_movie_data(data)
+        return {'year': year, 'rating': rating, 'poster': poster}, None
+    except (omdb_client.MovieNotFoundError, omdb_client.OmdbAPIError,
+            TypeError, ValueError) as exc:
+        return None, exc
+
+
+def _describe(error):
+    """Human-readable failure reason, worded like bulk_import's report."""
+    if isinstance(error, omdb_client.MovieNotFoundError):
+        return 'not found in OMDb'
+    if isinstance(error, omdb_client.OmdbAPIError):
+        return f'OMDb API error: {error}'
+    return f'invalid OMDb data: {error}'
@@ -0,0 +1,381 @@
+import contextlib
+import os
+import threading
+from abc import abstractmethod
+
+from instrumentation import timed
+from storage.istorage import IStorage
+from storage.movie_table import MovieTable
+from storage.rating_stats import RatingStats
+from storage.safe_io import FileLock
+from storage.title_index import TitleIndex
+
+
+class FileStorage(IStorage):
+    """
+    Base class for single-file IStorage backends.
+
+    Keeps a parsed in-memory copy of the file that is loaded once and
+    served for every read. Mutations update the copy and write it through
+    to disk. The copy is reloaded when the file's mtime or size changes
+    underneath it, so external edits are still picked up.
+
+    Writes are atomic (temp file, fsync, rename), so a crash never leaves
+    a truncated file. Each mutation runs under an advisory lock on
+    <file_path>.lock and re-reads the file first if another process
+    changed it, so concurrent processes do not lose each other's updates.
+    Mutations queued by concurrent threads are group-committed into one
+    rewrite, and batch() does the same for a block of mutations.
+
+    A trigram TitleIndex for search and a RatingStats aggregator are built
+    on first use and kept up to date as movies are added, deleted and
+    re-rated.
+
+    With columnar=True the cache is a MovieTable instead of a dict of
+    dicts, which cuts the resident size of large libraries. Sorting and
+    statistics are then computed over its arrays.
+
+    Subclasses only implement _load_movies() and _save_movies().
+    """
+
+    def __init__(self, file_path, columnar=False):
+        """
+        Initialize storage with the given file path.
+        :param file_path: Path to the storage file
+        :param columnar: Keep the cache as a compact MovieTable
+        """
+        self._file_path = file_path
+        self._columnar = columnar
+        self._movies = None
+        self._signature = None
+        self._title_index = None
+        self._stats = None
+        self._lock = FileLock(file_path + '.lock')
+        self._queue = []
+        self._queue_cond = threading.Condition()
+        self._committing = False
+        self._batch_owner = None
+        self._batch_dirty = False
+
+    def list_movies(self):
+        """
+        Return all movies, served from the in-memory cache.
+        The returned mapping is shared with the cache and must not be modified.
+        :return: dict (or MovieTable, if columnar) of movies keyed by title
+        """
+        signature = self._file_signature()
+        if self._movies is None or signature != self._signature:
+            movies = {}
+            if signature:
+                with timed('storage.parse'):
+                    movies = self._load_movies()
+            self._movies = MovieTable(movies) if self._columnar else movies
+            self._signature = signature
+            self._title_index = None
+            self._stats = None
+        return self._movies
+
+    def add_movie(self, title, year, rating, poster, fetched_at=None):
+        """
+        Add a new movie to storage and save changes.
+        :param title: Movie title
+        :param year: Release year
+        :param rating: Movie rating
+        :param poster: URL or path to poster image
+        :param fetched_at: Unix time the data was fetched from OMDb, or None if unknown
+        """
+        info = _make_info(year, rating, poster, fetched_at)
+
+        def op():
+            self._set_movie(title, info)
+            return True
+
+        self._mutate(op)
+
+    def add_movies_bulk(self, movies):
+        """
+        Add many movies and save them with a single write.
+        :param movies: dict mapping title to info dict with 'year', 'rating', 'poster'
+                       and optionally 'fetched_at'
+        """
+        infos = {
+            title: _make_info(info['year'], info['rating'], info.get('poster', ''),
+                              info.get('fetched_at'))
+            for title, info in movies.items()
+        }
+
+        def op():
+            for title, info in infos.items():
+                self._set_movie(title, info)
+            return bool(infos)
+
+        self._mutate(op)
+
+    def delete_movie(self, title):
+        """
+        Delete a movie from storage by title.
+        :param title: Movie title to delete
+        """
+        def op():
+            if title not in self._movies:
+                return False
+            self._remove_movie(title)
+            return True
+
+        self._mutate(op)
+
+    def update_movie(self, title, rating):
+        """
+        Update an existing movie's rating and save changes.
+        :param title: Movie title
+        :param rating: New rating
+        """
+        def op():
+            if title not in self._movies:
+                return False
+            self._set_movie(title, dict(self._movies[title], rating=rating))
+            return True
+
+        self._mutate(op)
+
+    def update_movies_bulk(self, changes):
+        """
+        Change fields of many existing movies and save them with a single write.
+        Unknown titles are skipped.
+        :param changes: dict mapping title to a dict with any of 'year', 'rating',
+                        'poster' and 'fetched_at'
+        """
+        def op():
+            changed = False
+            for title, fields in changes.items():
+                if title in self._movies:
+                    self._set_movie(title, dict(self._movies[title], **fields))
+                    changed = True
+            return changed
+
+        self._mutate(op)
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Apply every mutation made in the block with one locked rewrite.
+
+        The file lock is held for the whole block, so other processes
+        cannot interleave their changes. If the block raises, its changes
+        are discarded and the file is left as it was.
+        """
+        with self._lock:
+            outermost = self._batch_owner is None
+            if outermost:
+                self.list_movies()
+                self._batch_owner = threading.get_ident()
+                self._batch_dirty = False
+            try:
+                yield self
+            except BaseException:
+                if outermost:
+                    self._movies = None
+                raise
+            else:
+                if outermost and self._batch_dirty:
+                    self._write_through()
+            finally:
+                if outermost:
+                    self._batch_owner = None
+
+    def search_title(self, substring):
+        """
+        Find movies whose title contains substring, using the trigram index.
+        :param substring: Part of a movie title
+        :return: list of (title, info) tuples
+        """
+        movies = self.list_movies()
+        return [(title, movies[title]) for title in self._index().search(substring)]
+
+    def fuzzy_search_title(self, query, limit=5):
+        """
+        Find movies whose title is similar to query, using the trigram index.
+        :param query: Approximate movie title
+        :param limit: Maximum number of results
+        :return: list of (title, info) tuples, most similar first
+        """
+        movies = self.list_movies()
+        return [(title, movies[title]) for title, _ in self._index().fuzzy(query, limit)]
+
+    def top_by_rating(self, n=None, descending=True):
+        """
+        Return movies ordered by rating, sorted over the rating column if columnar.
+        :param n: Maximum number of movies to return, or None for all
+        :param descending: Highest rating first if True
+        :return: list of (title, info) tuples
+        """
+        if self._columnar:
+            return self.list_movies().sorted_by_rating(n, descending)
+        return super().top_by_rating(n, descending)
+
+    def rating_stats(self):
+        """
+        Return rating statistics from the incrementally maintained aggregator,
+        or computed over the rating column if columnar.
+        :return: dict as described in IStorage.rating_stats, or None if empty
+        """
+        if self._columnar:
+            return self.list_movies().rating_summary()
+        return self._rating_stats().summary()
+
+    def rating_breakdown(self, period='year'):
+        """
+        Return per-year or per-decade rating counts and averages.
+        :param period: 'year' or 'decade'
+        :return: dict mapping year/decade to {'count', 'average'}
+        """
+        if self._columnar:
+            return self.list_movies().rating_breakdown(period)
+        stats = self._rating_stats()
+        return stats.by_decade() if period == 'decade' else stats.by_year()
+
+    def _index(self):
+        """Return the title index for the current cache, building it if needed."""
+        movies = self.list_movies()
+        if self._title_index is None:
+            self._title_index = TitleIndex(movies)
+        return self._title_index
+
+    def _rating_stats(self):
+        """Return the rating aggregator for the current cache, building it if needed."""
+        movies = self.list_movies()
+        if self._stats is None:
+            self._stats = RatingStats(movies)
+        return self._stats
+
+    def _set_movie(self, title, info):
+        """Insert or replace a cached movie and keep the index and stats in sync."""
+        old = self._movies.get(title)
+        if self._stats is not None:
+            if old is not None:
+                self._stats.remove(title, old)
+            self._stats.add(title, info)
+        if self._title_index is not None:
+            self._title_index.add(title)
+        self._movies[title] = info
+
+    def _remove_movie(self, title):
+        """Remove a cached movie and keep the index and stats in sync."""
+        info = self._movies.pop(title)
+        if self._stats is not None:
+            self._stats.remove(title, info)
+        if self._title_index is not None:
+            self._title_index.remove(title)
+
+    def _mutate(self, op):
+        """
+        Apply a mutation and wait until it is on disk.
+
+        Mutations queued by concurrent threads are group-committed: the
+        first waiting thread becomes the leader, takes the file lock,
+        re-reads the file if another process changed it, applies every
+        queued mutation and writes the result once.
+
+        :param op: Callable that changes the cache; returns True if it changed anything
+        """
+        if self._batch_owner == threading.get_ident():
+            self._batch_dirty |= bool(op())
+            return
+        entry = _Pending(op)
+        with self._queue_cond:
+            self._queue.append(entry)
+            while not entry.done:
+                if self._committing:
+                    self._queue_cond.wait()
+                    continue
+                self._committing = True
+                entries, self._queue = self._queue, []
+                self._queue_cond.release()
+                try:
+                    self._commit(entries)
+                finally:
+                    self._queue_cond.acquire()
+                    self._committing = False
+                    self._queue_cond.notify_all()
+        if entry.error is not None:
+            raise entry.error
+
+    def _commit(self, entries):
+        """
+        Apply queued mutations under the file lock and write them through once.
+        :param entries: list of _Pending mutations
+        """
+        try:
+            with self._lock:
+                self.list_movies()
+                changed = False
+                for entry in entries:
+                    try:
+                        changed |= bool(entry.op())
+                    except Exception as exc:
+                        entry.error = exc
+                if changed:
+                    self._write_through()
+        except BaseException as exc:
+            # The cache may hold changes that never reached the disk
+            self._movies = None
+            for entry in entries:
+                entry.error = entry.error or exc
+            if not isinstance(exc, Exception):
+                raise
+        finally:
+            for entry in entries:
+                entry.done = True
+
+    def _write_through(self):
+        """Persist the cached movies and remember the resulting file state."""
+        with timed('storage.write'):
+            self._save_movies(self._movies)
+        self._signature = self._file_signature()
+
+    def _file_signature(self):
+        """
+        Return (inode, mtime_ns, size) of the storage file, or None if it is missing.
+        The inode changes on every atomic rewrite, even within one mtime tick.
+        """
+        try:
+            st = os.stat(self._file_path)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    @abstractmethod
+    def _load_movies(self):
+        """
+        Parse the storage file.
+        :return: dict of movies keyed by title
+        """
+        pass
+
+    @abstractmethod
+    def _save_movies(self, movies):
+        """
+        Write all movies to the storage file, overwriting existing data.
+        Implementations should write through safe_io.atomic_write.
+        :param movies: dict of movies keyed by title
+        """
+        pass
+
+
+def _make_info(year, rating, poster, fetched_at):
+    """Build an info dict; 'fetched_at' is only present when known."""
+    info = {'year': year, 'rating': rating, 'poster': poster}
+    if fetched_at is not None:
+        info['fetched_at'] = fetched_at
+    return info
+
+
+class _Pending:
+    """A mutation waiting in the group-commit queue."""
+
+    __slots__ = ('op', 'done', 'error')
+
+    def __init__(self, op):
+        self.op = op
+        self.done = False
+        self.error = None
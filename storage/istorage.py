@@ -1,9 +1,20 @@
+import contextlib
+import heapq
+import itertools
+import sys
 from abc import ABC, abstractmethod
 
+from storage.rating_stats import RatingStats
+from storage.title_index import TitleIndex
+
 
 class IStorage(ABC):
     """
     Interface for movie storage, defining the CRUD operations.
+
+    The query methods (get_movie, list_page, search_title, fuzzy_search_title, top_by_rating,
+    rating_stats, rating_breakdown, random_movie) have default
+    implementations built on list_movies().
     """
 
     @abstractmethod
@@ -15,13 +26,14 @@ class IStorage(ABC):
         pass
 
     @abstractmethod
-    def add_movie(self, title, year, rating, poster):
+    def add_movie(self, title, year, rating, poster, fetched_at=None):
         """
         Add a movie to storage.
         :param title: Movie title
         :param year: Release year
         :param rating: Movie rating
         :param poster: URL or path to poster image
+        :param fetched_at: Unix time the data was fetched from OMDb, or None if unknown
         """
         pass
 
@@ -40,4 +52,148 @@ class IStorage(ABC):
         :param title: Movie title
         :param rating: New rating
         """
-        pass
\ No newline at end of file
+        pass
+
+    def add_movies_bulk(self, movies):
+        """
+        Add many movies at once.
+        Backends should override this to persist the batch with one write.
+        :param movies: dict mapping title to info dict with 'year', 'rating', 'poster'
+                       and optionally 'fetched_at'
+        """
+        for title, info in movies.items():
+            self.add_movie(title, info['year'], info['rating'], info.get('poster', ''),
+                           fetched_at=info.get('fetched_at'))
+
+    def update_movies_bulk(self, changes):
+        """
+        Change fields of many existing movies at once; unknown titles are skipped.
+        Backends should override this to persist the batch with one write.
+        :param changes: dict mapping title to a dict with any of 'year', 'rating',
+                        'poster' and 'fetched_at'
+        """
+        with self.batch():
+            for title, fields in changes.items():
+                info = self.get_movie(title)
+                if info is None:
+                    continue
+                info = dict(info, **fields)
+                self.add_movie(title, info['year'], info['rating'], info.get('poster', ''),
+                               fetched_at=info.get('fetched_at'))
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Context manager grouping several mutations.
+        Backends may override this to persist the whole block with one write;
+        by default every mutation is written on its own.
+        """
+        yield self
+
+    def get_movie(self, title):
+        """
+        Look up a single movie by exact title.
+        Backends may override this to avoid loading the whole library.
+        :param title: Movie title
+        :return: info dict, or None if not found
+        """
+        return self.list_movies().get(title)
+
+    def list_page(self, offset, limit=None):
+        """
+        Return one page of movies in listing order.
+        Backends may override this to avoid loading the whole library.
+        :param offset: Number of movies to skip
+        :param limit: Maximum number of movies to return; None returns all after offset
+        :return: (total movie count, list of (title, info) tuples)
+        """
+        movies = self.list_movies()
+        stop = None if limit is None else min(offset + limit, sys.maxsize)
+        return len(movies), list(itertools.islice(movies.items(), offset, stop))
+
+    def search_title(self, substring):
+        """
+        Find movies whose title contains substring (case-insensitive).
+        Backends may override this with an indexed version.
+        :param substring: Part of a movie title
+        :return: list of (title, info) tuples
+        """
+        query = substring.lower()
+        return [(title, info) for title, info in self.list_movies().items()
+                if query in title.lower()]
+
+    def fuzzy_search_title(self, query, limit=5):
+        """
+        Find movies whose title is similar to query, tolerating typos.
+        Backends may override this to reuse a persistent index.
+        :param query: Approximate movie title
+        :param limit: Maximum number of results
+        :return: list of (title, info) tuples, most similar first
+        """
+        movies = self.list_movies()
+        index = TitleIndex(movies)
+        return [(title, movies[title]) for title, _ in index.fuzzy(query, limit)]
+
+    def top_by_rating(self, n=None, descending=True):
+        """
+        Return movies ordered by rating.
+        Backends may override this with an indexed version.
+        :param n: Maximum number of movies to return, or None for all
+        :param descending: Highest rating first if True
+        :return: list of (title, info) tuples
+        """
+        items = self.list_movies().items()
+        key = lambda item: item[1]['rating']
+        if n is None:
+            return sorted(items, key=key, reverse=descending)
+        if descending:
+            return heapq.nlargest(n, items, key=key)
+        return heapq.nsmallest(n, items, key=key)
+
+    def rating_stats(self):
+        """
+        Aggregate rating statistics over the whole library.
+        Backends may override this with an indexed or streaming version.
+        :return: dict with 'count', 'average', 'median', 'best_rating',
+                 'worst_rating', 'best' and 'worst' (lists of titles),
+                 or None if storage is empty
+        """
+        import statistics
+        movies = self.list_movies()
+        if not movies:
+            return None
+        ratings = [info['rating'] for info in movies.values()]
+        best_rating = max(ratings)
+        worst_rating = min(ratings)
+        return {
+            'count': len(ratings),
+            'average': statistics.mean(ratings),
+            'median': statistics.median(ratings),
+            'best_rating': best_rating,
+            'worst_rating': worst_rating,
+            'best': [t for t, info in movies.items() if info['rating'] == best_rating],
+            'worst': [t for t, info in movies.items() if info['rating'] == worst_rating],
+        }
+
+    def rating_breakdown(self, period='year'):
+        """
+        Return rating counts and averages per year or per decade.
+        Backends may override this with an incrementally maintained version.
+        :param period: 'year' or 'decade'
+        :return: dict mapping year/decade to {'count', 'average'}, in ascending order
+        """
+        stats = RatingStats(self.list_movies())
+        return stats.by_decade() if period == 'decade' else stats.by_year()
+
+    def random_movie(self):
+        """
+        Pick a random movie.
+        Backends may override this to avoid loading the whole library.
+        :return: (title, info) tuple, or None if storage is empty
+        """
+        import random
+        movies = self.list_movies()
+        if not movies:
+            return None
+        title = random.choice(list(movies))
+        return title, movies[title]
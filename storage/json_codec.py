@@ -0,0 +1,133 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # ujson is optional
+    ujson = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional; only needed for .zst files
+    zstandard = None
+
+
+class JsonCodec:
+    """
+    Encoder/decoder pair used by StorageJson.
+
+    dumps() returns UTF-8 bytes, loads() accepts bytes, so callers can
+    compress and write the result without another encode step.
+    """
+
+    def __init__(self, name, dumps, loads):
+        """
+        :param name: Codec name ('orjson', 'ujson' or 'json')
+        :param dumps: Callable (obj, indent) -> bytes
+        :param loads: Callable (bytes) -> obj
+        """
+        self.name = name
+        self._dumps = dumps
+        self._loads = loads
+
+    def __repr__(self):
+        return f'JsonCodec({self.name!r})'
+
+    def dumps(self, obj, indent=True):
+        """
+        Serialize obj.
+        :param obj: JSON-compatible object
+        :param indent: Pretty-print with two-space indentation; compact if False
+        :return: UTF-8 encoded bytes
+        """
+        return self._dumps(obj, indent)
+
+    def loads(self, data):
+        """
+        Parse JSON.
+        :param data: UTF-8 encoded bytes
+        :return: Decoded object
+        """
+        return self._loads(data)
+
+
+def _orjson_dumps(obj, indent):
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+
+
+def _ujson_dumps(obj, indent):
+    return ujson.dumps(obj, indent=2 if indent else 0, ensure_ascii=False).encode('utf-8')
+
+
+def _stdlib_dumps(obj, indent):
+    if indent:
+        text = json.dumps(obj, indent=2, ensure_ascii=False)
+    else:
+        text = json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+    return text.encode('utf-8')
+
+
+CODECS = {'json': JsonCodec('json', _stdlib_dumps, json.loads)}
+if ujson is not None:
+    CODECS['ujson'] = JsonCodec('ujson', _ujson_dumps, ujson.loads)
+if orjson is not None:
+    CODECS['orjson'] = JsonCodec('orjson', _orjson_dumps, orjson.loads)
+
+# Fastest first
+_PREFERENCE = ('orjson', 'ujson', 'json')
+
+
+def get_codec(name=None):
+    """
+    Return a codec by name, or the fastest installed one.
+    :param name: 'orjson', 'ujson', 'json', or None/'auto' for the best available
+    :return: JsonCodec
+    :raises ValueError: If the named codec is unknown or not installed
+    """
+    if name in (None, 'auto'):
+        return next(CODECS[n] for n in _PREFERENCE if n in CODECS)
+    if name not in CODECS:
+        raise ValueError(f"JSON codec '{name}' is not available "
+                         f"(installed: {', '.join(sorted(CODECS))})")
+    return CODECS[name]
+
+
+def compress(data, path):
+    """
+    Compress data according to the file extension of path.
+    :param data: Bytes to store
+    :param path: Target file path; '.gz' and '.zst' are compressed, anything else is not
+    :return: Bytes to write
+    """
+    if path.endswith('.gz'):
+        import gzip
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    if path.endswith('.zst'):
+        return _zstandard().ZstdCompressor(level=3).compress(data)
+    return data
+
+
+def decompress(data, path):
+    """
+    Undo compress() for a file read from path.
+    :param data: Bytes read from the file
+    :param path: Source file path
+    :return: Uncompressed bytes
+    """
+    if path.endswith('.gz'):
+        import gzip
+        return gzip.decompress(data)
+    if path.endswith('.zst'):
+        return _zstandard().ZstdDecompressor().decompress(data)
+    return data
+
+
+def _zstandard():
+    """Return the zstandard module or explain how to get it."""
+    if zstandard is None:
+        raise ValueError(".zst files require the 'zstandard' package (pip install zstandard)")
+    return zstandard
@@ -0,0 +1,231 @@
+import math
+import sys
+from array import array
+from collections.abc import ItemsView, MutableMapping, ValuesView
+
+_NOT_IMPORTED = object()
+# NumPy is optional and slow to import: loaded on first sort/stats call,
+# None if it is not installed (pure-Python fallbacks are used then)
+numpy = _NOT_IMPORTED
+
+# Compact away deleted rows once they make up this share of the table
+_COMPACT_RATIO = 0.5
+_COMPACT_MIN_ROWS = 1024
+
+
+def _numpy():
+    """Return the numpy module, importing it on first use, or None."""
+    global numpy
+    if numpy is _NOT_IMPORTED:
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        numpy = np
+    return numpy
+
+
+def _decode_rating(value):
+    """Undo float32 rounding noise (7.699999809 -> 7.7)."""
+    return round(value, 5)
+
+
+class MovieTable(MutableMapping):
+    """
+    Columnar in-memory representation of the movie library.
+
+    Titles are kept in one list, years in array('H'), ratings in
+    array('f'), fetch times in array('q') (0 if unknown) and posters as
+    interned strings, plus a title -> row index.
+    This avoids one dict per movie. The table behaves like the usual
+    title -> {'year', 'rating', 'poster'} dict: info dicts are built on
+    access, so existing callers keep working. Note that writes to a
+    returned info dict do not change the table.
+
+    Deleted rows are marked with a NaN rating and compacted away once
+    they make up half of the table, so iteration order matches insertion
+    order just like a dict. Sorting and statistics run over the
+    contiguous arrays, vectorized with NumPy when it is installed.
+    """
+
+    def __init__(self, movies=None):
+        """
+        Build the table.
+        :param movies: Optional dict of movies keyed by title
+        """
+        self._titles = []
+        self._years = array('H')
+        self._ratings = array('f')
+        self._fetched = array('q')
+        self._posters = []
+        self._rows = {}
+        if movies:
+            for title, info in movies.items():
+                self[title] = info
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __iter__(self):
+        for title in self._titles:
+            if title is not None:
+                yield title
+
+    def __contains__(self, title):
+        return title in self._rows
+
+    def __getitem__(self, title):
+        return self._info(self._rows[title])
+
+    def __setitem__(self, title, info):
+        year = info.get('year') or 0
+        rating = info['rating']
+        poster = sys.intern(info.get('poster') or '')
+        fetched_at = int(info.get('fetched_at') or 0)
+        row = self._rows.get(title)
+        if row is None:
+            self._rows[title] = len(self._titles)
+            self._titles.append(title)
+            self._years.append(year)
+            self._ratings.append(rating)
+            self._fetched.append(fetched_at)
+            self._posters.append(poster)
+        else:
+            self._years[row] = year
+            self._ratings[row] = rating
+            self._fetched[row] = fetched_at
+            self._posters[row] = poster
+
+    def __delitem__(self, title):
+        row = self._rows.pop(title)
+        self._titles[row] = None
+        self._ratings[row] = math.nan
+        self._posters[row] = ''
+        dead = len(self._titles) - len(self._rows)
+        if dead >= _COMPACT_MIN_ROWS and dead > _COMPACT_RATIO * len(self._titles):
+            self._compact()
+
+    def items(self):
+        """View of (title, info) pairs that iterates rows without index lookups."""
+        return _TableItemsView(self)
+
+    def values(self):
+        """View of info dicts that iterates rows without index lookups."""
+        return _TableValuesView(self)
+
+    def sorted_by_rating(self, n=None, descending=True):
+        """
+        Return movies ordered by rating; ties keep insertion order.
+        :param n: Maximum number of movies to return, or None for all
+        :param descending: Highest rating first if True
+        :return: list of (title, info) tuples
+        """
+        numpy = _numpy()
+        if numpy is not None:
+            ratings = numpy.frombuffer(self._ratings, dtype=numpy.float32)
+            rows = numpy.flatnonzero(~numpy.isnan(ratings))
+            keys = -ratings[rows] if descending else ratings[rows]
+            rows = rows[numpy.argsort(keys, kind='stable')].tolist()
+        else:
+            rows = sorted(self._live_rows(), key=self._ratings.__getitem__, reverse=descending)
+        if n is not None:
+            rows = rows[:n]
+        return [(self._titles[row], self._info(row)) for row in rows]
+
+    def rating_summary(self):
+        """
+        Compute rating statistics over the rating column.
+        :return: dict as described in IStorage.rating_stats, or None if empty
+        """
+        if not self._rows:
+            return None
+        numpy = _numpy()
+        if numpy is not None:
+            ratings = numpy.frombuffer(self._ratings, dtype=numpy.float32)
+            live = ~numpy.isnan(ratings)
+            values = numpy.round(ratings[live].astype(numpy.float64), 5)
+            best_rating = float(values.max())
+            worst_rating = float(values.min())
+            average = float(values.mean())
+            median = float(numpy.median(values))
+            rows = numpy.flatnonzero(live)
+            best = [self._titles[r] for r in rows[values == best_rating].tolist()]
+            worst = [self._titles[r] for r in rows[values == worst_rating].tolist()]
+        else:
+            import statistics
+            rows = list(self._live_rows())
+            values = [_decode_rating(self._ratings[r]) for r in rows]
+            best_rating = max(values)
+            worst_rating = min(values)
+            average = statistics.fmean(values)
+            median = statistics.median(values)
+            best = [self._titles[r] for r, v in zip(rows, values) if v == best_rating]
+            worst = [self._titles[r] for r, v in zip(rows, values) if v == worst_rating]
+        return {
+            'count': len(self._rows),
+            'average': average,
+            'median': median,
+            'best_rating': best_rating,
+            'worst_rating': worst_rating,
+            'best': best,
+            'worst': worst,
+        }
+
+    def rating_breakdown(self, period='year'):
+        """
+        Rating counts and averages per year or decade over the columns.
+        :param period: 'year' or 'decade'
+        :return: dict mapping year/decade to {'count', 'average'}, in ascending order
+        """
+        groups = {}
+        for row in self._live_rows():
+            year = self._years[row]
+            key = year // 10 * 10 if period == 'decade' else year
+            group = groups.setdefault(key, [0, 0.0])
+            group[0] += 1
+            group[1] += _decode_rating(self._ratings[row])
+        return {
+            key: {'count': count, 'average': total / count}
+            for key, (count, total) in sorted(groups.items())
+        }
+
+    def _iter_items(self):
+        """Yield (title, info) pairs in insertion order."""
+        for row, title in enumerate(self._titles):
+            if title is not None:
+                yield title, self._info(row)
+
+    def _live_rows(self):
+        """Row numbers of movies that have not been deleted."""
+        return (row for row, title in enumerate(self._titles) if title is not None)
+
+    def _info(self, row):
+        """Build the info dict for a row; 'fetched_at' is only present when known."""
+        info = {
+            'year': self._years[row],
+            'rating': _decode_rating(self._ratings[row]),
+            'poster': self._posters[row],
+        }
+        if self._fetched[row]:
+            info['fetched_at'] = self._fetched[row]
+        return info
+
+    def _compact(self):
+        """Drop deleted rows and renumber the index."""
+        rows = list(self._live_rows())
+        self._titles = [self._titles[r] for r in rows]
+        self._years = array('H', (self._years[r] for r in rows))
+        self._ratings = array('f', (self._ratings[r] for r in rows))
+        self._fetched = array('q', (self._fetched[r] for r in rows))
+        self._posters = [self._posters[r] for r in rows]
+        self._rows = {title: row for row, title in enumerate(self._titles)}
+
+
+class _TableItemsView(ItemsView):
+    def __iter__(self):
+        return self._mapping._iter_items()
+
+
+class _TableValuesView(ValuesView):
+    def __iter__(self):
+        return (info for _, info in self._mapping._iter_items())
@@ -0,0 +1,112 @@
+import bisect
+
+
+class RatingStats:
+    """
+    Incrementally maintained rating statistics.
+
+    Keeps a running sum and count for the average, a sorted list of
+    ratings for the median (bisect insert/remove), and rating -> titles
+    buckets for the best and worst movies. Per-year counts and sums are
+    kept alongside, so per-year and per-decade breakdowns come from the
+    same structure. Queries no longer need a pass over the library.
+    """
+
+    def __init__(self, movies=None):
+        """
+        Build the statistics.
+        :param movies: Optional dict of movies keyed by title
+        """
+        self._sum = 0.0
+        self._sorted = []
+        self._buckets = {}
+        self._years = {}
+        for title, info in (movies or {}).items():
+            self.add(title, info)
+
+    def __len__(self):
+        return len(self._sorted)
+
+    def add(self, title, info):
+        """
+        Account for a movie.
+        :param title: Movie title
+        :param info: Movie info dict with 'year' and 'rating'
+        """
+        rating = info['rating']
+        self._sum += rating
+        bisect.insort(self._sorted, rating)
+        self._buckets.setdefault(rating, {})[title] = None
+        year = self._years.setdefault(info.get('year', 0), [0, 0.0])
+        year[0] += 1
+        year[1] += rating
+
+    def remove(self, title, info):
+        """
+        Stop accounting for a movie.
+        :param title: Movie title
+        :param info: The movie's info dict as it was added
+        """
+        rating = info['rating']
+        self._sum -= rating
+        del self._sorted[bisect.bisect_left(self._sorted, rating)]
+        bucket = self._buckets[rating]
+        del bucket[title]
+        if not bucket:
+            del self._buckets[rating]
+        year_key = info.get('year', 0)
+        year = self._years[year_key]
+        year[0] -= 1
+        year[1] -= rating
+        if not year[0]:
+            del self._years[year_key]
+        if not self._sorted:
+            # Reset to avoid carrying floating-point drift into an empty library
+            self._sum = 0.0
+
+    def summary(self):
+        """
+        :return: dict as described in IStorage.rating_stats, or None if empty
+        """
+        count = len(self._sorted)
+        if not count:
+            return None
+        middle = count // 2
+        if count % 2:
+            median = self._sorted[middle]
+        else:
+            median = (self._sorted[middle - 1] + self._sorted[middle]) / 2
+        best_rating = self._sorted[-1]
+        worst_rating = self._sorted[0]
+        return {
+            'count': count,
+            'average': self._sum / count,
+            'median': median,
+            'best_rating': best_rating,
+            'worst_rating': worst_rating,
+            'best': list(self._buckets[best_rating]),
+            'worst': list(self._buckets[worst_rating]),
+        }
+
+    def by_year(self):
+        """
+        :return: dict mapping year to {'count', 'average'}, ordered by year
+        """
+        return {
+            year: {'count': count, 'average': total / count}
+            for year, (count, total) in sorted(self._years.items())
+        }
+
+    def by_decade(self):
+        """
+        :return: dict mapping decade (e.g. 1990) to {'count', 'average'}, ordered by decade
+        """
+        decades = {}
+        for year, (count, total) in self._years.items():
+            decade = decades.setdefault(year // 10 * 10, [0, 0.0])
+            decade[0] += count
+            decade[1] += total
+        return {
+            decade: {'count': count, 'average': total / count}
+            for decade, (count, total) in sorted(decades.items())
+        }
@@ -0,0 +1,107 @@
+import contextlib
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: locking degrades to in-process only
+    fcntl = None
+
+
+@contextlib.contextmanager
+def atomic_write(path, mode='w', **open_kwargs):
+    """
+    Open a temporary file next to path and move it into place on success.
+
+    The data is flushed and fsynced before the rename, so after a crash
+    path holds either the old or the new content, never a truncated mix.
+    If the block raises, the temporary file is removed and path is untouched.
+
+    :param path: Target file path
+    :param mode: 'w' or 'wb'
+    :param open_kwargs: Passed on to open() (encoding, newline, ...)
+    """
+    import tempfile  # pulls in random/shutil; only needed once something is written
+    dirpath = os.path.dirname(path)
+    if dirpath:
+        os.makedirs(dirpath, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=dirpath or '.', prefix=os.path.basename(path) + '.',
+                                    suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode, **open_kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
+    _fsync_dir(dirpath or '.')
+
+
+def _fsync_dir(dirpath):
+    """Persist a rename by syncing its directory (not supported on Windows)."""
+    try:
+        fd = os.open(dirpath, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class FileLock:
+    """
+    Exclusive advisory lock shared by threads and processes.
+
+    Within a process a reentrant lock serializes threads; across processes
+    fcntl.flock() on a sidecar lock file does the same. Without fcntl
+    (Windows) only the in-process part applies.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: Lock file path (created on first use)
+        """
+        self._path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def acquire(self):
+        """Block until the lock is held; reentrant for the owning thread."""
+        self._lock.acquire()
+        if self._depth == 0 and fcntl is not None:
+            try:
+                dirpath = os.path.dirname(self._path)
+                if dirpath:
+                    os.makedirs(dirpath, exist_ok=True)
+                self._fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            except BaseException:
+                if self._fd is not None:
+                    os.close(self._fd)
+                    self._fd = None
+                self._lock.release()
+                raise
+        self._depth += 1
+
+    def release(self):
+        """Release one level of the lock."""
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
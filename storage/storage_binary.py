@@ -0,0 +1,324 @@
+import contextlib
+import mmap
+import os
+import struct
+from collections.abc import ItemsView, Mapping, ValuesView
+
+from instrumentation import timed
+from storage.istorage import IStorage
+from storage.safe_io import atomic_write
+
+MAGIC = b'MVDB'
+VERSION = 2
+
+# magic, version, reserved, record count, index offset, heap offset
+HEADER = struct.Struct('<4sHHQQQ')
+# title offset, title length, poster offset, poster length, year, rating,
+# fetched_at (Unix time, 0 if unknown)
+RECORD = struct.Struct('<QIQIHdq')
+# Record layout by format version; version 1 had no fetched_at
+RECORDS = {1: struct.Struct('<QIQIHd'), VERSION: RECORD}
+# record number, in title order
+INDEX = struct.Struct('<I')
+
+
+class BinarySnapshot(Mapping):
+    """
+    Read-only, memory-mapped view of a binary movie snapshot.
+
+    File layout (little-endian):
+        header   HEADER
+        records  count x RECORD, in insertion order (fixed width)
+        index    count x INDEX, record numbers sorted by UTF-8 title
+        heap     UTF-8 titles and posters referenced by the records
+
+    Opening only maps the file; a record is decoded when it is touched.
+    Title lookups binary-search the index over the map. Version 1 files,
+    whose records lack fetched_at, are still read.
+    """
+
+    def __init__(self, file_path):
+        """
+        Map the snapshot file.
+        :param file_path: Path to an existing snapshot file
+        :raises ValueError: If the file is not a movie snapshot
+        """
+        with open(file_path, 'rb') as f:
+            # mmap cannot map an empty file, and a short one has no header
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                raise ValueError(f'{file_path} is not a movie snapshot (file too short)')
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, count, index_offset, heap_offset = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f'{file_path} is not a movie snapshot (bad magic number {magic!r})')
+        if version not in RECORDS:
+            raise ValueError(f'{file_path} has unsupported snapshot version {version} '
+                             f'(supported: {", ".join(map(str, sorted(RECORDS)))})')
+        self._record_struct = RECORDS[version]
+        self._count = count
+        self._index_offset = index_offset
+        self._heap_offset = heap_offset
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for number in range(self._count):
+            yield self._title(number)
+
+    def __contains__(self, title):
+        return isinstance(title, str) and self._find(title) is not None
+
+    def __getitem__(self, title):
+        number = self._find(title) if isinstance(title, str) else None
+        if number is None:
+            raise KeyError(title)
+        return self._info(number)
+
+    def items(self):
+        """View of (title, info) pairs that decodes records without index lookups."""
+        return _SnapshotItemsView(self)
+
+    def values(self):
+        """View of info dicts that decodes records without index lookups."""
+        return _SnapshotValuesView(self)
+
+    def _iter_items(self):
+        """Yield (title, info) pairs in insertion order."""
+        for number in range(self._count):
+            yield self._title(number), self._info(number)
+
+    def _record(self, number):
+        record = self._record_struct
+        return record.unpack_from(self._map, HEADER.size + number * record.size)
+
+    def _text(self, offset, length):
+        start = self._heap_offset + offset
+        return self._map[start:start + length].decode('utf-8')
+
+    def _title(self, number):
+        title_off, title_len = self._record(number)[:2]
+        return self._text(title_off, title_len)
+
+    def _info(self, number):
+        _, _, poster_off, poster_len, year, rating, *fetched_at = self._record(number)
+        info = {'year': year, 'rating': rating, 'poster': self._text(poster_off, poster_len)}
+        if fetched_at and fetched_at[0]:
+            info['fetched_at'] = fetched_at[0]
+        return info
+
+    def _title_bytes(self, number):
+        title_off, title_len = self._record(number)[:2]
+        start = self._heap_offset + title_off
+        return self._map[start:start + title_len]
+
+    def _find(self, title):
+        """Binary-search the title index; return the record number or None."""
+        key = title.encode('utf-8')
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            (number,) = INDEX.unpack_from(self._map, self._index_offset + mid * INDEX.size)
+            current = self._title_bytes(number)
+            if current < key:
+                lo = mid + 1
+            elif current > key:
+                hi = mid
+            else:
+                return number
+        return None
+
+
+class _SnapshotItemsView(ItemsView):
+    def __iter__(self):
+        return self._mapping._iter_items()
+
+
+class _SnapshotValuesView(ValuesView):
+    def __iter__(self):
+        return (info for _, info in self._mapping._iter_items())
+
+
+def write_snapshot(file_path, movies):
+    """
+    Write movies as a binary snapshot, replacing file_path atomically.
+    :param file_path: Target path
+    :param movies: Iterable of (title, info) pairs, or a mapping of movies
+    """
+    if isinstance(movies, Mapping):
+        movies = movies.items()
+    records = bytearray()
+    heap = bytearray()
+    title_keys = []
+    for title, info in movies:
+        title_bytes = title.encode('utf-8')
+        poster_bytes = (info.get('poster') or '').encode('utf-8')
+        title_off = len(heap)
+        heap += title_bytes
+        poster_off = len(heap)
+        heap += poster_bytes
+        records += RECORD.pack(title_off, len(title_bytes), poster_off, len(poster_bytes),
+                               info.get('year') or 0, float(info['rating']),
+                               int(info.get('fetched_at') or 0))
+        title_keys.append(title_bytes)
+
+    count = len(title_keys)
+    order = sorted(range(count), key=title_keys.__getitem__)
+    index_offset = HEADER.size + len(records)
+    heap_offset = index_offset + count * INDEX.size
+
+    with atomic_write(file_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, count, index_offset, heap_offset))
+        f.write(records)
+        f.write(b''.join(INDEX.pack(number) for number in order))
+        f.write(heap)
+
+
+class StorageBinary(IStorage):
+    """
+    Binary snapshot implementation of the IStorage interface.
+
+    The library is memory-mapped instead of parsed, so startup is near
+    instant regardless of size, and records are decoded only when read.
+    Mutations rewrite the snapshot (streaming the unchanged records from
+    the current map) and re-map it; inside batch() they are collected in
+    memory and written as one snapshot.
+    """
+
+    def __init__(self, file_path):
+        """
+        Initialize binary storage with the given file path.
+        :param file_path: Path to the snapshot file
+        """
+        self._file_path = file_path
+        self._snapshot = None
+        self._signature = None
+        self._batch_movies = None
+        self._batch_dirty = False
+
+    def list_movies(self):
+        """
+        Return a lazy, read-only mapping of all movies.
+        :return: BinarySnapshot (or empty dict) keyed by title; a plain dict inside batch()
+        """
+        if self._batch_movies is not None:
+            return self._batch_movies
+        signature = self._file_signature()
+        if signature is None or signature[2] == 0:
+            # Missing or empty (e.g. created but never written): no movies yet
+            self._snapshot = None
+            return {}
+        if self._snapshot is None or signature != self._signature:
+            with timed('storage.parse'):
+                self._snapshot = BinarySnapshot(self._file_path)
+            self._signature = signature
+        return self._snapshot
+
+    def get_movie(self, title):
+        """
+        Look up one movie by binary search over the mapped index.
+        :param title: Movie title
+        :return: info dict, or None if not found
+        """
+        return self.list_movies().get(title)
+
+    def add_movie(self, title, year, rating, poster, fetched_at=None):
+        """
+        Add a movie and rewrite the snapshot.
+        :param title: Movie title
+        :param year: Release year
+        :param rating: Movie rating
+        :param poster: URL or path to poster image
+        :param fetched_at: Unix time the data was fetched from OMDb, or None if unknown
+        """
+        info = {'year': year, 'rating': rating, 'poster': poster}
+        if fetched_at is not None:
+            info['fetched_at'] = fetched_at
+        self._rewrite({title: info})
+
+    def add_movies_bulk(self, movies):
+        """
+        Add many movies with a single snapshot rewrite.
+        :param movies: dict mapping title to info dict with 'year', 'rating', 'poster'
+                       and optionally 'fetched_at'
+        """
+        self._rewrite(dict(movies))
+
+    def delete_movie(self, title):
+        """
+        Delete a movie by title and rewrite the snapshot.
+        :param title: Movie title to delete
+        """
+        if title in self.list_movies():
+            self._rewrite({title: None})
+
+    def update_movie(self, title, rating):
+        """
+        Update an existing movie's rating and rewrite the snapshot.
+        :param title: Movie title
+        :param rating: New rating
+        """
+        info = self.get_movie(title)
+        if info is not None:
+            self._rewrite({title: dict(info, rating=rating)})
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Apply the block's mutations to an in-memory copy and write one
+        snapshot at the end. If the block raises, nothing is written.
+        """
+        if self._batch_movies is not None:  # nested batch: the outer one writes
+            yield self
+            return
+        self._batch_movies = dict(self.list_movies().items())
+        self._batch_dirty = False
+        try:
+            yield self
+            if self._batch_dirty:
+                with timed('storage.write'):
+                    write_snapshot(self._file_path, self._batch_movies.items())
+                self._snapshot = None
+        finally:
+            self._batch_movies = None
+
+    def _rewrite(self, changes):
+        """
+        Write a new snapshot with changes applied.
+        :param changes: dict mapping title to new info dict, or None to delete
+        """
+        if self._batch_movies is not None:
+            for title, info in changes.items():
+                if info is None:
+                    self._batch_movies.pop(title, None)
+                else:
+                    self._batch_movies[title] = info
+            self._batch_dirty = True
+            return
+        current = self.list_movies()
+
+        def merged():
+            for title, info in current.items():
+                if title in changes:
+                    info = changes.pop(title)
+                    if info is None:
+                        continue
+                yield title, info
+            for title, info in changes.items():
+                if info is not None:
+                    yield title, info
+
+        with timed('storage.write'):
+            write_snapshot(self._file_path, merged())
+        self._snapshot = None
+
+    def _file_signature(self):
+        """
+        Return (inode, mtime_ns, size) of the snapshot file, or None if it is missing.
+        The inode changes on every atomic replace, even if mtime and size do not.
+        """
+        try:
+            st = os.stat(self._file_path)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
@@ -1,97 +1,428 @@
 import csv
+import io
 import os
+import shutil
+from collections import namedtuple
+from collections.abc import ItemsView, Mapping, ValuesView
 
+from storage.file_storage import FileStorage
 from storage.istorage import IStorage
+from storage.safe_io import FileLock, atomic_write
 
+FIELDS = ['title', 'year', 'rating', 'poster', 'fetched_at']
 
-class StorageCsv(IStorage):
+# One CSV row; fetched_at is None when unknown
+MovieRow = namedtuple('MovieRow', FIELDS)
+
+_COPY_CHUNK = 1024 * 1024
+
+
+def iter_movies(file_path):
+    """
+    Stream the movies in a CSV file without building the whole library.
+
+    Rows are parsed with csv.reader using the column positions from the
+    header, so no dict is allocated per row. Files without a fetched_at
+    column are read as well.
+
+    :param file_path: Path to the CSV file
+    :return: Iterator of MovieRow tuples in file order (empty if the file is missing)
+    """
+    try:
+        csvfile = open(file_path, newline='', encoding='utf-8')
+    except FileNotFoundError:
+        return
+    with csvfile:
+        reader = csv.reader(csvfile)
+        header = next(reader, None)
+        if header is None:
+            return
+        parse = _row_parser(header)
+        for row in reader:
+            if row:
+                yield parse(row)
+
+
+class StorageCsv(FileStorage):
     """
     CSV-based implementation of the IStorage interface.
-    Stores movies in a CSV file with columns: title, year, rating, poster.
+    Stores movies in a CSV file with columns: title, year, rating, poster,
+    fetched_at. fetched_at is empty when unknown; files without the
+    column are still read.
+    """
+
+    def iter_movies(self):
+        """
+        Stream the movies in the file as MovieRow tuples, bypassing the cache.
+        :return: Iterator of MovieRow tuples
+        """
+        return iter_movies(self._file_path)
+
+    def _load_movies(self):
+        """
+        Load and return all movies from the CSV file.
+        :return: dict of movies keyed by title
+        """
+        return {row.title: _row_info(row) for row in iter_movies(self._file_path)}
+
+    def _save_movies(self, movies):
+        """
+        Save all movies to the CSV file atomically, overwriting existing data.
+        :param movies: dict of movies keyed by title
+        """
+        with atomic_write(self._file_path, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(FIELDS)
+            writer.writerows(_row_values(title, info) for title, info in movies.items())
+
+
+class StreamingStorageCsv(IStorage):
+    """
+    CSV implementation of the IStorage interface for very large files.
+
+    Nothing is cached: reads stream the file through iter_movies(), so
+    scans run in constant memory, and list_movies() is a lazy mapping over
+    the file. Mutations locate the affected rows by byte offset. If the
+    new rows have the same length as the old ones, only those byte ranges
+    are overwritten in place. Otherwise the file is stream-copied to a
+    temporary file with the rows replaced. New movies are appended.
+    Unlike the stream copy, in-place edits and appends are not atomic: a
+    crash in the middle can leave a partly written row.
+
+    Mutations hold the same advisory lock on <file_path>.lock as
+    StorageCsv, so both classes can share a file.
     """
 
     def __init__(self, file_path):
         """
-        Initialize CSV storage with the given file path.
-        :param file_path: Path to CSV file
+        Initialize streaming CSV storage with the given file path.
+        :param file_path: Path to the CSV file
         """
         self._file_path = file_path
+        self._lock = FileLock(file_path + '.lock')
+
+    def iter_movies(self):
+        """
+        Stream the movies in the file as MovieRow tuples.
+        :return: Iterator of MovieRow tuples
+        """
+        return iter_movies(self._file_path)
 
     def list_movies(self):
         """
-        Load and return all movies from CSV storage.
-        :return: dict of movies keyed by title
+        Return a lazy, read-only mapping over the file.
+        Iteration streams the file; a lookup by title scans it.
+        :return: Mapping of movies keyed by title
         """
-        if not os.path.exists(self._file_path):
-            return {}
+        return _CsvMapping(self)
 
-        movies = {}
-        with open(self._file_path, newline='', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                title = row['title']
-                movies[title] = {
-                    'year': int(row['year']),
-                    'rating': float(row['rating']),
-                    'poster': row.get('poster', '')
-                }
-        return movies
-
-    def add_movie(self, title, year, rating, poster):
-        """
-        Add a new movie to CSV storage and save changes.
+    def get_movie(self, title):
+        """
+        Look up one movie by scanning the file.
+        :param title: Movie title
+        :return: info dict, or None if not found
+        """
+        for row in self.iter_movies():
+            if row.title == title:
+                return _row_info(row)
+        return None
+
+    def list_page(self, offset, limit=None):
+        """
+        Return one page of movies in file order, in a single pass.
+        :param offset: Number of movies to skip
+        :param limit: Maximum number of movies to return; None returns all after offset
+        :return: (total movie count, list of (title, info) tuples)
+        """
+        total = 0
+        page = []
+        for total, row in enumerate(self.iter_movies(), start=1):
+            if offset < total and (limit is None or total <= offset + limit):
+                page.append((row.title, _row_info(row)))
+        return total, page
+
+    def add_movie(self, title, year, rating, poster, fetched_at=None):
+        """
+        Add a movie, replacing the row of an existing movie with the same title.
         :param title: Movie title
         :param year: Release year
         :param rating: Movie rating
         :param poster: URL or path to poster image
+        :param fetched_at: Unix time the data was fetched from OMDb, or None if unknown
+        """
+        info = {'year': year, 'rating': rating, 'poster': poster, 'fetched_at': fetched_at}
+        self._apply({title: info}, merge=False)
+
+    def add_movies_bulk(self, movies):
         """
-        movies = self.list_movies()
-        movies[title] = {
-            'year': year,
-            'rating': rating,
-            'poster': poster,
-        }
-        self._save_movies(movies)
+        Add many movies with a single pass over the file.
+        :param movies: dict mapping title to info dict with 'year', 'rating', 'poster'
+                       and optionally 'fetched_at'
+        """
+        self._apply(dict(movies), merge=False)
 
     def delete_movie(self, title):
         """
-        Delete a movie from CSV storage by title.
+        Delete a movie by title.
         :param title: Movie title to delete
         """
-        movies = self.list_movies()
-        if title in movies:
-            del movies[title]
-            self._save_movies(movies)
+        self._apply({title: None}, merge=True)
 
     def update_movie(self, title, rating):
         """
-        Update an existing movie's rating and save changes.
+        Update an existing movie's rating, in place if the row keeps its length.
         :param title: Movie title
         :param rating: New rating
         """
-        movies = self.list_movies()
-        if title in movies:
-            movies[title]['rating'] = rating
-            self._save_movies(movies)
+        self._apply({title: {'rating': rating}}, merge=True)
 
-    def _save_movies(self, movies):
+    def update_movies_bulk(self, changes):
         """
-        Save all movies to the CSV file, overwriting existing data.
-        :param movies: dict of movies keyed by title
+        Change fields of many existing movies with a single pass over the file.
+        Unknown titles are skipped.
+        :param changes: dict mapping title to a dict with any of 'year', 'rating',
+                        'poster' and 'fetched_at'
+        """
+        self._apply(dict(changes), merge=True)
+
+    def _apply(self, changes, merge):
+        """
+        Write changed rows to the file.
+
+        :param changes: dict mapping title to an info dict (or to the changed
+                        fields if merge), or to None to delete the movie
+        :param merge: Merge into existing rows and skip unknown titles; otherwise
+                      replace existing rows and append new ones
+        """
+        if not changes:
+            return
+        with self._lock:
+            self._upgrade_header()
+            edits = []
+            with open(self._file_path, 'rb') as f:
+                for start, end, raw in _scan_records(f):
+                    if start == 0 or _record_title(raw) not in changes:
+                        continue
+                    fields = _parse_record(raw)
+                    info = changes.pop(fields[0])
+                    if info is not None:
+                        if merge:
+                            info = dict(_row_info(_parse_row(fields)), **info)
+                        info = _encode_row(fields[0], info, _terminator(raw))
+                    edits.append((start, end, info or b''))
+                    if merge and not changes:
+                        break  # every row to change was found
+            appended = b''.join(_encode_row(title, info) for title, info in changes.items()
+                                if info is not None and not merge)
+
+            if all(len(new) == end - start for start, end, new in edits):
+                self._write_in_place(edits, appended)
+            else:
+                self._stream_copy(edits, appended)
+
+    def _write_in_place(self, edits, appended):
+        """
+        Overwrite same-length byte ranges and append new rows.
+        :param edits: list of (start, end, new bytes) with len(new) == end - start
+        :param appended: Encoded rows to add at the end of the file
+        """
+        if not edits and not appended:
+            return
+        with open(self._file_path, 'r+b') as f:
+            for start, _, new in edits:
+                f.seek(start)
+                f.write(new)
+            if appended:
+                f.seek(0, os.SEEK_END)
+                if f.tell():
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        f.write(b'\r\n')
+                f.write(appended)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _stream_copy(self, edits, appended):
+        """
+        Copy the file to a temporary file with byte ranges replaced, then swap it in.
+        :param edits: list of (start, end, new bytes), in file order
+        :param appended: Encoded rows to add at the end of the file
+        """
+        with open(self._file_path, 'rb') as src, atomic_write(self._file_path, 'wb') as dst:
+            position = 0
+            for start, end, new in edits:
+                _copy_bytes(src, dst, start - position)
+                dst.write(new)
+                src.seek(end)
+                position = end
+            shutil.copyfileobj(src, dst, _COPY_CHUNK)
+            if appended:
+                if dst.tell() and not _ends_with_newline(src):
+                    dst.write(b'\r\n')
+                dst.write(appended)
+
+    def _upgrade_header(self):
+        """
+        Create the file if it is missing, and rewrite files whose header is
+        not FIELDS (e.g. without fetched_at) so rows can be edited in place.
         """
-        # Ensure directory exists
         dirpath = os.path.dirname(self._file_path)
         if dirpath and not os.path.exists(dirpath):
             os.makedirs(dirpath)
+        with open(self._file_path, 'ab'):
+            pass
+        with open(self._file_path, newline='', encoding='utf-8') as csvfile:
+            header = next(csv.reader(csvfile), None)
+        if header == FIELDS:
+            return
+        rows = iter_movies(self._file_path) if header else ()
+        with atomic_write(self._file_path, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(FIELDS)
+            writer.writerows(_row_values(row.title, _row_info(row)) for row in rows)
+
+
+class _CsvMapping(Mapping):
+    """Read-only title -> info view that streams the CSV file on every access."""
+
+    def __init__(self, storage):
+        self._storage = storage
+
+    def __len__(self):
+        return sum(1 for _ in self._storage.iter_movies())
+
+    def __iter__(self):
+        return (row.title for row in self._storage.iter_movies())
+
+    def __getitem__(self, title):
+        info = self._storage.get_movie(title)
+        if info is None:
+            raise KeyError(title)
+        return info
+
+    def items(self):
+        """View of (title, info) pairs that streams the file once."""
+        return _CsvItemsView(self)
+
+    def values(self):
+        """View of info dicts that streams the file once."""
+        return _CsvValuesView(self)
+
+    def _iter_items(self):
+        return ((row.title, _row_info(row)) for row in self._storage.iter_movies())
+
+
+class _CsvItemsView(ItemsView):
+    def __iter__(self):
+        return self._mapping._iter_items()
+
+
+class _CsvValuesView(ValuesView):
+    def __iter__(self):
+        return (info for _, info in self._mapping._iter_items())
+
+
+def _row_parser(header):
+    """
+    Return a function turning a csv.reader row into a MovieRow.
+    :param header: Header row naming the columns
+    """
+    columns = {name: i for i, name in enumerate(header)}
+    title, year, rating = columns['title'], columns['year'], columns['rating']
+    poster = columns.get('poster')
+    fetched_at = columns.get('fetched_at')
+
+    def parse(row):
+        poster_value = row[poster] if poster is not None and poster < len(row) else ''
+        fetched_value = row[fetched_at] if fetched_at is not None and fetched_at < len(row) else ''
+        return MovieRow(row[title], int(row[year]), float(row[rating]), poster_value,
+                        int(fetched_value) if fetched_value else None)
+
+    return parse
+
+
+_parse_row = _row_parser(FIELDS)
+
+
+def _row_info(row):
+    """Build the info dict for a MovieRow; 'fetched_at' is only present when known."""
+    info = {'year': row.year, 'rating': row.rating, 'poster': row.poster}
+    if row.fetched_at is not None:
+        info['fetched_at'] = row.fetched_at
+    return info
+
+
+def _row_values(title, info):
+    """Column values for one movie, in FIELDS order."""
+    fetched_at = info.get('fetched_at')
+    return [title, info['year'], info['rating'], info.get('poster', ''),
+            '' if fetched_at is None else fetched_at]
+
+
+def _encode_row(title, info, terminator='\r\n'):
+    """Encode one movie as a UTF-8 CSV row."""
+    out = io.StringIO()
+    csv.writer(out, lineterminator=terminator).writerow(_row_values(title, info))
+    return out.getvalue().encode('utf-8')
+
+
+def _terminator(raw):
+    """Line terminator of an encoded row, so a replacement keeps the file's style."""
+    return '\r\n' if raw.endswith(b'\r\n') else '\n'
+
+
+def _scan_records(f):
+    """
+    Yield (start, end, raw bytes) for every record of a binary CSV file.
+    Quoted fields may contain newlines, so physical lines are joined until
+    their quotes balance.
+    """
+    start = 0
+    pending = []
+    quotes = 0
+    for line in f:
+        pending.append(line)
+        quotes += line.count(b'"')
+        if quotes % 2:
+            continue
+        raw = b''.join(pending) if len(pending) > 1 else line
+        yield start, start + len(raw), raw
+        start += len(raw)
+        pending = []
+        quotes = 0
+
+
+def _parse_record(raw):
+    """Split one encoded CSV record into its fields."""
+    return next(csv.reader([raw.decode('utf-8')]), [])
+
+
+def _record_title(raw):
+    """
+    Return the title (first field) of an encoded record, or None for a blank line.
+    Unquoted titles are cut at the first comma without running the CSV parser.
+    """
+    if raw.startswith(b'"'):
+        fields = _parse_record(raw)
+    else:
+        fields = raw.rstrip(b'\r\n').split(b',', 1)
+        fields = [fields[0].decode('utf-8')] if fields[0] else []
+    return fields[0] if fields else None
+
+
+def _copy_bytes(src, dst, count):
+    """Copy count bytes from src to dst in bounded chunks."""
+    while count > 0:
+        chunk = src.read(min(count, _COPY_CHUNK))
+        if not chunk:
+            break
+        dst.write(chunk)
+        count -= len(chunk)
+
 
-        with open(self._file_path, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['title', 'year', 'rating', 'poster']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            for title, info in movies.items():
-                writer.writerow({
-                    'title': title,
-                    'year': info['year'],
-                    'rating': info['rating'],
-                    'poster': info.get('poster', '')
-                })
+def _ends_with_newline(f):
+    """Whether the file behind binary handle f is empty or ends with a newline."""
+    if not f.seek(0, os.SEEK_END):
+        return True
+    f.seek(-1, os.SEEK_END)
+    return f.read(1) == b'\n'
@@ -0,0 +1,265 @@
+import json
+import os
+
+from instrumentation import timed
+from storage.istorage import IStorage
+from storage.rating_stats import RatingStats
+from storage.safe_io import atomic_write
+from storage.title_index import TitleIndex
+
+
+class StorageJournal(IStorage):
+    """
+    Append-only journal implementation of the IStorage interface.
+
+    Every mutation is appended as one JSON line to the log file, so a
+    write costs O(1) regardless of library size; each append is fsynced
+    before the call returns. State is rebuilt on startup by loading the
+    snapshot (<file_path>.snapshot) and replaying the log on top of it.
+    Once the log grows past compact_ratio times the snapshot size, the
+    current state is written as a new snapshot and the log is truncated.
+
+    Log records are absolute (set/delete), so replaying a log over a
+    snapshot that already contains it yields the same state. This makes a
+    crash between writing the snapshot and truncating the log harmless.
+    """
+
+    def __init__(self, file_path, compact_ratio=2.0, min_compact_bytes=64 * 1024):
+        """
+        Initialize journal storage and replay the log.
+        :param file_path: Path to the log file
+        :param compact_ratio: Compact once log size exceeds this multiple of the snapshot size
+        :param min_compact_bytes: Never compact while the log is smaller than this
+        """
+        self._file_path = file_path
+        self._snapshot_path = file_path + '.snapshot'
+        self._compact_ratio = compact_ratio
+        self._min_compact_bytes = min_compact_bytes
+        self._movies = {}
+        self._title_index = None
+        self._stats = None
+        self._log_bytes = 0
+        self._snapshot_bytes = 0
+        with timed('storage.parse'):
+            self._replay()
+        self._title_index = TitleIndex(self._movies)
+        self._stats = RatingStats(self._movies)
+
+    def list_movies(self):
+        """
+        Return all movies from the in-memory state.
+        The returned dict is shared with the storage and must not be modified.
+        :return: dict of movies keyed by title
+        """
+        return self._movies
+
+    def add_movie(self, title, year, rating, poster, fetched_at=None):
+        """
+        Add a new movie and append the change to the log.
+        :param title: Movie title
+        :param year: Release year
+        :param rating: Movie rating
+        :param poster: URL or path to poster image
+        :param fetched_at: Unix time the data was fetched from OMDb, or None if unknown
+        """
+        record = _add_record(title, {'year': year, 'rating': rating, 'poster': poster,
+                                     'fetched_at': fetched_at})
+        self._apply(record)
+        self._append([record])
+
+    def add_movies_bulk(self, movies):
+        """
+        Add many movies and append them to the log in one write.
+        :param movies: dict mapping title to info dict with 'year', 'rating', 'poster'
+                       and optionally 'fetched_at'
+        """
+        records = [_add_record(title, info) for title, info in movies.items()]
+        for record in records:
+            self._apply(record)
+        if records:
+            self._append(records)
+
+    def update_movies_bulk(self, changes):
+        """
+        Change fields of many existing movies and append them to the log in one write.
+        Unknown titles are skipped.
+        :param changes: dict mapping title to a dict with any of 'year', 'rating',
+                        'poster' and 'fetched_at'
+        """
+        records = [_add_record(title, dict(self._movies[title], **fields))
+                   for title, fields in changes.items() if title in self._movies]
+        for record in records:
+            self._apply(record)
+        if records:
+            self._append(records)
+
+    def delete_movie(self, title):
+        """
+        Delete a movie by title and append the change to the log.
+        :param title: Movie title to delete
+        """
+        if title in self._movies:
+            record = {'op': 'delete', 'title': title}
+            self._apply(record)
+            self._append([record])
+
+    def update_movie(self, title, rating):
+        """
+        Update an existing movie's rating and append the change to the log.
+        :param title: Movie title
+        :param rating: New rating
+        """
+        if title in self._movies:
+            record = {'op': 'update', 'title': title, 'rating': rating}
+            self._apply(record)
+            self._append([record])
+
+    def search_title(self, substring):
+        """
+        Find movies whose title contains substring, using the trigram index.
+        :param substring: Part of a movie title
+        :return: list of (title, info) tuples
+        """
+        return [(title, self._movies[title]) for title in self._title_index.search(substring)]
+
+    def fuzzy_search_title(self, query, limit=5):
+        """
+        Find movies whose title is similar to query, using the trigram index.
+        :param query: Approximate movie title
+        :param limit: Maximum number of results
+        :return: list of (title, info) tuples, most similar first
+        """
+        return [(title, self._movies[title])
+                for title, _ in self._title_index.fuzzy(query, limit)]
+
+    def rating_stats(self):
+        """
+        Return rating statistics from the incrementally maintained aggregator.
+        :return: dict as described in IStorage.rating_stats, or None if empty
+        """
+        return self._stats.summary()
+
+    def rating_breakdown(self, period='year'):
+        """
+        Return per-year or per-decade rating counts and averages.
+        :param period: 'year' or 'decade'
+        :return: dict mapping year/decade to {'count', 'average'}
+        """
+        return self._stats.by_decade() if period == 'decade' else self._stats.by_year()
+
+    @timed('storage.compact')
+    def compact(self):
+        """
+        Write the current state as a snapshot and truncate the log.
+        """
+        with atomic_write(self._snapshot_path, 'w', encoding='utf-8') as f:
+            json.dump(self._movies, f)
+        with open(self._file_path, 'w', encoding='utf-8'):
+            pass
+        self._snapshot_bytes = os.path.getsize(self._snapshot_path)
+        self._log_bytes = 0
+
+    def _apply(self, record):
+        """
+        Apply a single log record to the in-memory state.
+        :param record: dict with an 'op' key and its arguments
+        """
+        op = record['op']
+        title = record['title']
+        if op == 'add':
+            info = {
+                'year': record['year'],
+                'rating': record['rating'],
+                'poster': record['poster'],
+            }
+            if record.get('fetched_at') is not None:
+                info['fetched_at'] = record['fetched_at']
+            self._set_movie(title, info)
+        elif op == 'delete':
+            if title in self._movies:
+                self._remove_movie(title)
+        elif op == 'update':
+            if title in self._movies:
+                self._set_movie(title, dict(self._movies[title], rating=record['rating']))
+
+    def _set_movie(self, title, info):
+        """Insert or replace a movie and keep the index and stats in sync."""
+        old = self._movies.get(title)
+        if self._stats is not None:
+            if old is not None:
+                self._stats.remove(title, old)
+            self._stats.add(title, info)
+        if self._title_index is not None:
+            self._title_index.add(title)
+        self._movies[title] = info
+
+    def _remove_movie(self, title):
+        """Remove a movie and keep the index and stats in sync."""
+        info = self._movies.pop(title)
+        if self._stats is not None:
+            self._stats.remove(title, info)
+        if self._title_index is not None:
+            self._title_index.remove(title)
+
+    @timed('storage.write')
+    def _append(self, records):
+        """
+        Append records to the log and compact if it has grown too large.
+        :param records: list of log record dicts
+        """
+        self._ensure_dir()
+        data = ''.join(json.dumps(r) + '\n' for r in records)
+        with open(self._file_path, 'a', encoding='utf-8') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self._log_bytes += len(data.encode('utf-8'))
+        threshold = max(self._snapshot_bytes, self._min_compact_bytes)
+        if self._log_bytes > self._compact_ratio * threshold:
+            self.compact()
+
+    def _replay(self):
+        """
+        Rebuild state from the snapshot and the log.
+        Only a torn final line (no trailing newline) is dropped; a corrupt
+        line before it is never truncated away.
+        :raises ValueError: If a complete line in the log is not a valid record
+        """
+        if os.path.exists(self._snapshot_path):
+            with open(self._snapshot_path, 'r', encoding='utf-8') as f:
+                self._movies = json.load(f)
+            self._snapshot_bytes = os.path.getsize(self._snapshot_path)
+
+        if not os.path.exists(self._file_path):
+            return
+        valid_bytes = 0
+        with open(self._file_path, 'rb') as f:
+            for number, line in enumerate(f, 1):
+                if not line.endswith(b'\n'):
+                    # A torn final line from an interrupted append
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    raise ValueError(f'{self._file_path}: corrupt record on line {number}') from None
+                self._apply(record)
+                valid_bytes += len(line)
+        if valid_bytes != os.path.getsize(self._file_path):
+            # Drop the torn tail so later appends start on a clean line
+            os.truncate(self._file_path, valid_bytes)
+        self._log_bytes = valid_bytes
+
+    def _ensure_dir(self):
+        """Create the directory holding the log file if needed."""
+        dirpath = os.path.dirname(self._file_path)
+        if dirpath and not os.path.exists(dirpath):
+            os.makedirs(dirpath)
+
+
+def _add_record(title, info):
+    """Build an 'add' log record; 'fetched_at' is only written when known."""
+    record = {'op': 'add', 'title': title, 'year': info['year'],
+              'rating': info['rating'], 'poster': info.get('poster', '')}
+    if info.get('fetched_at') is not None:
+        record['fetched_at'] = info['fetched_at']
+    return record
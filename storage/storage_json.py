@@ -1,72 +1,45 @@
-import json
-import os
+from storage import json_codec
+from storage.file_storage import FileStorage
+from storage.safe_io import atomic_write
 
-from storage.istorage import IStorage
 
-
-class StorageJson(IStorage):
+class StorageJson(FileStorage):
     """
     JSON-based implementation of the IStorage interface.
+
+    Encoding goes through a pluggable codec (orjson or ujson when
+    installed, stdlib json otherwise). Files ending in .gz or .zst are
+    stored compressed.
     """
 
-    def __init__(self, file_path):
+    def __init__(self, file_path, columnar=False, codec=None, compact=False):
         """
-        Initialize storage with the given JSON file path.
-        :param file_path: Path to JSON file
+        Initialize JSON storage with the given file path.
+        :param file_path: Path to the JSON file (.json, .json.gz or .json.zst)
+        :param columnar: Keep the cache as a compact MovieTable
+        :param codec: Codec name ('orjson', 'ujson', 'json'), or None for the fastest installed
+        :param compact: Write without indentation
         """
-        self._file_path = file_path
+        super().__init__(file_path, columnar=columnar)
+        self._codec = json_codec.get_codec(codec)
+        self._compact = compact
 
-    def list_movies(self):
+    def _load_movies(self):
         """
-        Load and return all movies from JSON storage.
+        Load and return all movies from the JSON file.
         :return: dict of movies
         """
-        if not os.path.exists(self._file_path):
-            return {}
-        with open(self._file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-
-    def add_movie(self, title, year, rating, poster):
-        """
-        Add a new movie to storage and save changes.
-        :param title: Movie title
-        :param year: Release year
-        :param rating: Movie rating
-        :param poster: URL or path to poster image
-        """
-        movies = self.list_movies()
-        movies[title] = {
-            'year': year,
-            'rating': rating,
-            'poster': poster,
-        }
-        self._save_movies(movies)
-
-    def delete_movie(self, title):
-        """
-        Delete a movie from storage by title.
-        :param title: Movie title to delete
-        """
-        movies = self.list_movies()
-        if title in movies:
-            del movies[title]
-            self._save_movies(movies)
-
-    def update_movie(self, title, rating):
-        """
-        Update an existing movie's rating and save changes.
-        :param title: Movie title
-        :param rating: New rating
-        """
-        movies = self.list_movies()
-        if title in movies:
-            movies[title]['rating'] = rating
-            self._save_movies(movies)
+        with open(self._file_path, 'rb') as f:
+            data = f.read()
+        return self._codec.loads(json_codec.decompress(data, self._file_path))
 
     def _save_movies(self, movies):
         """
-        Save the given movies dictionary to the JSON file.
+        Save the given movies dictionary to the JSON file atomically.
         :param movies: dict of movies
         """
-        with open(self._file_path, 'w', encoding='utf-8') as f:
-            json.dump(movies, f, indent=2)
\ No newline at end of file
+        if not isinstance(movies, dict):
+            movies = dict(movies.items())
+        data = self._codec.dumps(movies, indent=not self._compact)
+        with atomic_write(self._file_path, 'wb') as f:
+            f.write(json_codec.compress(data, self._file_path))
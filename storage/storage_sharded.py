@@ -0,0 +1,341 @@
+import contextlib
+import itertools
+import json
+import os
+import shutil
+import threading
+import zlib
+from collections.abc import ItemsView, Mapping, ValuesView
+from concurrent.futures import ThreadPoolExecutor
+
+from storage.istorage import IStorage
+from storage.safe_io import FileLock, atomic_write
+from storage.storage_csv import StorageCsv
+from storage.storage_json import StorageJson
+
+SHARD_FORMATS = {'json': StorageJson, 'csv': StorageCsv}
+DEFAULT_SHARDS = 16
+MANIFEST = 'manifest.json'
+
+
+def shard_of(title, count):
+    """
+    Return the shard number of a title.
+    :param title: Movie title
+    :param count: Number of shards
+    :return: int in range(count)
+    """
+    return zlib.crc32(title.encode('utf-8')) % count
+
+
+class StorageSharded(IStorage):
+    """
+    Hash-sharded implementation of the IStorage interface.
+
+    Movies are spread over N JSON or CSV files by crc32 of the title, so
+    a mutation rewrites only the shard that holds the movie. Each shard is
+    a regular StorageJson/StorageCsv with its own cache, file lock and
+    group commit.
+
+    file_path is a directory holding manifest.json, which records the
+    shard count, the shard format and the current generation, plus one
+    gen-<n>/ directory with the shard files. Shards are loaded in parallel
+    on a thread pool, and list_movies() merges them lazily: lookups go to
+    a single shard, and iteration walks the shards in turn.
+
+    Changing the shard count (or format) reshards online. The shards are
+    read, a new generation is written next to the current one, and the
+    manifest is swapped atomically. Readers see the old layout until the
+    swap. Mutations are absolute (set/delete), so a mutation that landed
+    in the old generation during a reshard is applied again to the new one.
+    """
+
+    def __init__(self, file_path, shards=None, shard_format=None, workers=None):
+        """
+        Open (and create if needed) sharded storage.
+        :param file_path: Directory holding the manifest and shard files
+        :param shards: Shard count; resharding happens if it differs from the manifest.
+                       None keeps the current count (DEFAULT_SHARDS for a new library)
+        :param shard_format: 'json' or 'csv'; None keeps the current format (json if new)
+        :param workers: Threads used to load and write shards in parallel
+        """
+        if shards is not None and shards < 1:
+            raise ValueError('shards must be at least 1')
+        if shard_format is not None and shard_format not in SHARD_FORMATS:
+            raise ValueError(f"Unknown shard format '{shard_format}' "
+                             f"(choose from {', '.join(SHARD_FORMATS)})")
+        self._dir = file_path
+        self._manifest_path = os.path.join(file_path, MANIFEST)
+        self._lock = FileLock(os.path.join(file_path, 'manifest.lock'))
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._layout_lock = threading.Lock()
+        self._manifest = None
+        self._signature = None
+        self._shards = []
+
+        with self._lock:
+            manifest = self._read_manifest()
+            if manifest is None:
+                manifest = {'shards': shards or DEFAULT_SHARDS,
+                            'format': shard_format or 'json', 'generation': 1}
+                self._write_manifest(manifest)
+            self._refresh_layout()
+        if ((shards is not None and shards != self._manifest['shards'])
+                or (shard_format is not None and shard_format != self._manifest['format'])):
+            self.reshard(shards or self._manifest['shards'], shard_format)
+
+    @property
+    def shard_count(self):
+        """Current number of shards."""
+        return self._layout()[0]['shards']
+
+    def list_movies(self):
+        """
+        Return a lazy, read-only view over all shards.
+        Shards are (re)loaded in parallel; the view does not copy them.
+        :return: Mapping of movies keyed by title, in shard order
+        """
+        _, shards = self._layout()
+        return _ShardedView(list(self._pool.map(lambda shard: shard.list_movies(), shards)))
+
+    def get_movie(self, title):
+        """
+        Look up one movie in the shard that holds it, loading only that shard.
+        :param title: Movie title
+        :return: info dict, or None if not found
+        """
+        _, shards = self._layout()
+        return shards[shard_of(title, len(shards))].get_movie(title)
+
+    def search_title(self, substring):
+        """
+        Find movies whose title contains substring, using every shard's trigram index.
+        :param substring: Part of a movie title
+        :return: list of (title, info) tuples
+        """
+        _, shards = self._layout()
+        results = self._pool.map(lambda shard: shard.search_title(substring), shards)
+        return list(itertools.chain.from_iterable(results))
+
+    def add_movie(self, title, year, rating, poster, fetched_at=None):
+        """
+        Add a movie to its shard; only that shard is rewritten.
+        :param title: Movie title
+        :param year: Release year
+        :param rating: Movie rating
+        :param poster: URL or path to poster image
+        :param fetched_at: Unix time the data was fetched from OMDb, or None if unknown
+        """
+        self._route(title, lambda shard: shard.add_movie(title, year, rating, poster,
+                                                         fetched_at=fetched_at))
+
+    def delete_movie(self, title):
+        """
+        Delete a movie from its shard.
+        :param title: Movie title to delete
+        """
+        self._route(title, lambda shard: shard.delete_movie(title))
+
+    def update_movie(self, title, rating):
+        """
+        Update a movie's rating in its shard.
+        :param title: Movie title
+        :param rating: New rating
+        """
+        self._route(title, lambda shard: shard.update_movie(title, rating))
+
+    def add_movies_bulk(self, movies):
+        """
+        Add many movies with one write per affected shard, shards in parallel.
+        :param movies: dict mapping title to info dict with 'year', 'rating', 'poster'
+                       and optionally 'fetched_at'
+        """
+        self._bulk(movies, lambda shard, part: shard.add_movies_bulk(part))
+
+    def update_movies_bulk(self, changes):
+        """
+        Change fields of many existing movies with one write per affected shard.
+        Unknown titles are skipped.
+        :param changes: dict mapping title to a dict with any of 'year', 'rating',
+                        'poster' and 'fetched_at'
+        """
+        self._bulk(changes, lambda shard, part: shard.update_movies_bulk(part))
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Group mutations: each shard changed in the block is written once.
+        Holds every shard's lock for the block; if it raises, nothing is saved.
+        """
+        _, shards = self._layout()
+        with contextlib.ExitStack() as stack:
+            for shard in shards:
+                stack.enter_context(shard.batch())
+            yield self
+
+    def reshard(self, shards, shard_format=None):
+        """
+        Redistribute the library over a new number of shards (or a new format).
+
+        The new generation is written next to the current one and the
+        manifest is swapped atomically, so readers never see a partial
+        layout. Every current shard stays locked while its movies are
+        copied, so no mutation is lost.
+
+        :param shards: New shard count
+        :param shard_format: 'json' or 'csv'; None keeps the current format
+        """
+        if shards < 1:
+            raise ValueError('shards must be at least 1')
+        with self._lock:
+            manifest, old_shards = self._refresh_layout()
+            new_manifest = {'shards': shards, 'format': shard_format or manifest['format'],
+                            'generation': manifest['generation'] + 1}
+            new_dir = self._generation_dir(new_manifest['generation'])
+            shutil.rmtree(new_dir, ignore_errors=True)  # left over from an interrupted reshard
+            with contextlib.ExitStack() as stack:
+                for shard in old_shards:
+                    stack.enter_context(shard.batch())
+                parts = [{} for _ in range(shards)]
+                for movies in self._pool.map(lambda shard: shard.list_movies(), old_shards):
+                    for title, info in movies.items():
+                        parts[shard_of(title, shards)][title] = info
+                new_shards = self._open_shards(new_manifest)
+                list(self._pool.map(lambda pair: pair[0].add_movies_bulk(pair[1]),
+                                    zip(new_shards, parts)))
+                self._write_manifest(new_manifest)
+            self._refresh_layout()
+            self._remove_old_generations(new_manifest['generation'])
+
+    def close(self):
+        """Stop the loader threads."""
+        self._pool.shutdown()
+
+    def _route(self, title, op):
+        """
+        Apply op to the shard holding title.
+        If a reshard swapped the layout meanwhile, op is applied again to the
+        new layout, since the write may have gone to the old generation.
+        """
+        manifest, shards = self._layout()
+        op(shards[shard_of(title, len(shards))])
+        current, shards = self._layout()
+        if current is not manifest:
+            op(shards[shard_of(title, len(shards))])
+
+    def _bulk(self, movies, op):
+        """
+        Split movies by shard and apply op(shard, part) to each part in parallel,
+        repeating it on the new layout if a reshard happened meanwhile.
+        """
+        manifest, _ = self._layout()
+        while True:
+            _, shards = self._layout()
+            parts = {}
+            for title, info in movies.items():
+                parts.setdefault(shard_of(title, len(shards)), {})[title] = info
+            list(self._pool.map(lambda item: op(shards[item[0]], item[1]), parts.items()))
+            current, _ = self._layout()
+            if current is manifest:
+                return
+            manifest = current
+
+    def _layout(self):
+        """
+        Return (manifest, shard storages), reloading them if the manifest changed.
+        """
+        signature = self._manifest_signature()
+        if signature != self._signature:
+            self._refresh_layout()
+        return self._manifest, self._shards
+
+    def _refresh_layout(self):
+        """Read the manifest and open the shards it names."""
+        with self._layout_lock:
+            signature = self._manifest_signature()
+            manifest = self._read_manifest()
+            if manifest != self._manifest:
+                self._shards = self._open_shards(manifest)
+                self._manifest = manifest
+            self._signature = signature
+            return self._manifest, self._shards
+
+    def _open_shards(self, manifest):
+        """Create the storage objects for every shard of a manifest."""
+        cls = SHARD_FORMATS[manifest['format']]
+        directory = self._generation_dir(manifest['generation'])
+        return [cls(os.path.join(directory, f"shard-{number:04d}.{manifest['format']}"))
+                for number in range(manifest['shards'])]
+
+    def _generation_dir(self, generation):
+        return os.path.join(self._dir, f'gen-{generation}')
+
+    def _remove_old_generations(self, current):
+        """Delete shard directories of generations before current."""
+        for name in os.listdir(self._dir):
+            if name.startswith('gen-') and name != f'gen-{current}':
+                shutil.rmtree(os.path.join(self._dir, name), ignore_errors=True)
+
+    def _read_manifest(self):
+        try:
+            with open(self._manifest_path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _write_manifest(self, manifest):
+        with atomic_write(self._manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+
+    def _manifest_signature(self):
+        """(inode, mtime_ns, size) of the manifest; the inode changes on every swap."""
+        try:
+            st = os.stat(self._manifest_path)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+class _ShardedView(Mapping):
+    """Read-only title -> info view over the shards' own mappings, without copying."""
+
+    def __init__(self, shards):
+        self._shards = shards
+
+    def __len__(self):
+        return sum(len(movies) for movies in self._shards)
+
+    def __iter__(self):
+        return itertools.chain.from_iterable(self._shards)
+
+    def __contains__(self, title):
+        return isinstance(title, str) and title in self._shard(title)
+
+    def __getitem__(self, title):
+        if not isinstance(title, str):
+            raise KeyError(title)
+        return self._shard(title)[title]
+
+    def items(self):
+        """View of (title, info) pairs, shard by shard."""
+        return _ShardedItemsView(self)
+
+    def values(self):
+        """View of info dicts, shard by shard."""
+        return _ShardedValuesView(self)
+
+    def _shard(self, title):
+        return self._shards[shard_of(title, len(self._shards))]
+
+    def _iter_items(self):
+        return itertools.chain.from_iterable(movies.items() for movies in self._shards)
+
+
+class _ShardedItemsView(ItemsView):
+    def __iter__(self):
+        return self._mapping._iter_items()
+
+
+class _ShardedValuesView(ValuesView):
+    def __iter__(self):
+        return (info for _, info in self._mapping._iter_items())
@@ -0,0 +1,266 @@
+import os
+import random
+import sqlite3
+import sys
+
+from storage.istorage import IStorage
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS movies (
+    title TEXT PRIMARY KEY,
+    year INTEGER NOT NULL,
+    rating REAL NOT NULL,
+    poster TEXT NOT NULL DEFAULT '',
+    fetched_at INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_movies_year ON movies (year);
+CREATE INDEX IF NOT EXISTS idx_movies_rating ON movies (rating);
+"""
+
+# Columns selected for a (title, info) item
+_COLUMNS = 'title, year, rating, poster, fetched_at'
+
+
+class StorageSqlite(IStorage):
+    """
+    SQLite-based implementation of the IStorage interface.
+    Stores movies in a single table keyed by title, with secondary
+    indexes on year and rating. Mutations touch a single row.
+    """
+
+    def __init__(self, file_path):
+        """
+        Open (and create if needed) the SQLite database at file_path.
+        :param file_path: Path to the SQLite database file
+        """
+        self._file_path = file_path
+        dirpath = os.path.dirname(file_path)
+        if dirpath and not os.path.exists(dirpath):
+            os.makedirs(dirpath)
+
+        # Callers that share the instance across threads (e.g. the API server)
+        # serialize access themselves
+        self._conn = sqlite3.connect(file_path, check_same_thread=False)
+        # WAL lets readers run while a writer commits
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+
+    def list_movies(self):
+        """
+        Load and return all movies from the database.
+        :return: dict of movies keyed by title
+        """
+        rows = self._conn.execute(f'SELECT {_COLUMNS} FROM movies')
+        return dict(_row_to_item(row) for row in rows)
+
+    def add_movie(self, title, year, rating, poster, fetched_at=None):
+        """
+        Add a movie, replacing any existing row with the same title.
+        :param title: Movie title
+        :param year: Release year
+        :param rating: Movie rating
+        :param poster: URL or path to poster image
+        :param fetched_at: Unix time the data was fetched from OMDb, or None if unknown
+        """
+        with self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO movies (title, year, rating, poster, fetched_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (title, year, rating, poster, fetched_at),
+            )
+
+    def delete_movie(self, title):
+        """
+        Delete a movie by title.
+        :param title: Movie title to delete
+        """
+        with self._conn:
+            self._conn.execute('DELETE FROM movies WHERE title = ?', (title,))
+
+    def update_movie(self, title, rating):
+        """
+        Update an existing movie's rating.
+        :param title: Movie title
+        :param rating: New rating
+        """
+        with self._conn:
+            self._conn.execute(
+                'UPDATE movies SET rating = ? WHERE title = ?', (rating, title)
+            )
+
+    def get_movie(self, title):
+        """
+        Look up a single movie by its primary key.
+        :param title: Movie title
+        :return: info dict, or None if not found
+        """
+        row = self._conn.execute(
+            f'SELECT {_COLUMNS} FROM movies WHERE title = ?', (title,)
+        ).fetchone()
+        return _row_to_item(row)[1] if row else None
+
+    def list_page(self, offset, limit=None):
+        """
+        Return one page of movies in insertion (rowid) order.
+        :param offset: Number of movies to skip
+        :param limit: Maximum number of movies to return; None returns all after offset
+        :return: (total movie count, list of (title, info) tuples)
+        """
+        (total,) = self._conn.execute('SELECT COUNT(*) FROM movies').fetchone()
+        # LIMIT -1 means no limit; SQLite integers stop at 2**63 - 1
+        limit = -1 if limit is None else min(limit, sys.maxsize)
+        rows = self._conn.execute(
+            f'SELECT {_COLUMNS} FROM movies ORDER BY rowid LIMIT ? OFFSET ?',
+            (limit, offset),
+        )
+        return total, [_row_to_item(row) for row in rows]
+
+    def search_title(self, substring):
+        """
+        Find movies whose title contains substring (case-insensitive for ASCII).
+        :param substring: Part of a movie title
+        :return: list of (title, info) tuples
+        """
+        pattern = '%' + _escape_like(substring) + '%'
+        rows = self._conn.execute(
+            f"SELECT {_COLUMNS} FROM movies "
+            "WHERE title LIKE ? ESCAPE '\\'",
+            (pattern,),
+        )
+        return [_row_to_item(row) for row in rows]
+
+    def top_by_rating(self, n=None, descending=True):
+        """
+        Return movies ordered by rating, read through the rating index.
+        :param n: Maximum number of movies to return, or None for all
+        :param descending: Highest rating first if True
+        :return: list of (title, info) tuples
+        """
+        order = 'DESC' if descending else 'ASC'
+        rows = self._conn.execute(
+            f'SELECT {_COLUMNS} FROM movies '
+            f'ORDER BY rating {order}, rowid LIMIT ?',
+            (-1 if n is None else n,),
+        )
+        return [_row_to_item(row) for row in rows]
+
+    def rating_stats(self):
+        """
+        Aggregate rating statistics in SQL without loading the library.
+        :return: dict as described in IStorage.rating_stats, or None if empty
+        """
+        count, average, worst_rating, best_rating = self._conn.execute(
+            'SELECT COUNT(*), AVG(rating), MIN(rating), MAX(rating) FROM movies'
+        ).fetchone()
+        if not count:
+            return None
+        middle = self._conn.execute(
+            'SELECT rating FROM movies ORDER BY rating LIMIT ? OFFSET ?',
+            (2 - count % 2, (count - 1) // 2),
+        ).fetchall()
+        median = sum(r for (r,) in middle) / len(middle)
+        return {
+            'count': count,
+            'average': average,
+            'median': median,
+            'best_rating': best_rating,
+            'worst_rating': worst_rating,
+            'best': self._titles_with_rating(best_rating),
+            'worst': self._titles_with_rating(worst_rating),
+        }
+
+    def rating_breakdown(self, period='year'):
+        """
+        Return per-year or per-decade rating counts and averages via GROUP BY.
+        :param period: 'year' or 'decade'
+        :return: dict mapping year/decade to {'count', 'average'}, in ascending order
+        """
+        key = '(year / 10) * 10' if period == 'decade' else 'year'
+        rows = self._conn.execute(
+            f'SELECT {key} AS k, COUNT(*), AVG(rating) FROM movies GROUP BY k ORDER BY k'
+        )
+        return {k: {'count': count, 'average': average} for k, count, average in rows}
+
+    def random_movie(self):
+        """
+        Pick a random movie without loading the library.
+        :return: (title, info) tuple, or None if storage is empty
+        """
+        (count,) = self._conn.execute('SELECT COUNT(*) FROM movies').fetchone()
+        if not count:
+            return None
+        row = self._conn.execute(
+            f'SELECT {_COLUMNS} FROM movies LIMIT 1 OFFSET ?',
+            (random.randrange(count),),
+        ).fetchone()
+        return _row_to_item(row)
+
+    def add_movies_bulk(self, movies):
+        """
+        Bulk-load movies in a single transaction.
+        :param movies: dict mapping title to info dict with 'year', 'rating', 'poster'
+                       and optionally 'fetched_at'
+        """
+        with self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO movies (title, year, rating, poster, fetched_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (
+                    (title, info['year'], info['rating'], info.get('poster', ''),
+                     info.get('fetched_at'))
+                    for title, info in movies.items()
+                ),
+            )
+
+    def update_movies_bulk(self, changes):
+        """
+        Change fields of many existing movies in a single transaction.
+        Rows are updated in place, so listing order is kept; unknown titles are skipped.
+        :param changes: dict mapping title to a dict with any of 'year', 'rating',
+                        'poster' and 'fetched_at'
+        """
+        rows = []
+        for title, fields in changes.items():
+            info = self.get_movie(title)
+            if info is not None:
+                info = dict(info, **fields)
+                rows.append((info['year'], info['rating'], info.get('poster', ''),
+                             info.get('fetched_at'), title))
+        with self._conn:
+            self._conn.executemany(
+                'UPDATE movies SET year = ?, rating = ?, poster = ?, fetched_at = ? '
+                'WHERE title = ?',
+                rows,
+            )
+
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
+
+    def _migrate(self):
+        """Add columns introduced after a database was created."""
+        columns = {name for _, name, *_ in self._conn.execute('PRAGMA table_info(movies)')}
+        if 'fetched_at' not in columns:
+            with self._conn:
+                self._conn.execute('ALTER TABLE movies ADD COLUMN fetched_at INTEGER')
+
+    def _titles_with_rating(self, rating):
+        """Return all titles with exactly the given rating."""
+        rows = self._conn.execute('SELECT title FROM movies WHERE rating = ?', (rating,))
+        return [title for (title,) in rows]
+
+
+def _row_to_item(row):
+    """Convert a (title, year, rating, poster, fetched_at) row to a (title, info) tuple."""
+    title, year, rating, poster, fetched_at = row
+    info = {'year': year, 'rating': rating, 'poster': poster}
+    if fetched_at is not None:
+        info['fetched_at'] = fetched_at
+    return title, info
+
+
+def _escape_like(text):
+    """Escape LIKE wildcards so text matches literally."""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
@@ -0,0 +1,124 @@
+import itertools
+
+
+def trigrams(text):
+    """
+    Return the set of 3-character substrings of text.
+    :param text: Lowercased text
+    :return: set of trigrams (empty for text shorter than 3 characters)
+    """
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TitleIndex:
+    """
+    Trigram inverted index over movie titles.
+
+    Substring queries intersect the posting sets of the query's trigrams
+    and only verify the remaining candidates, instead of scanning every
+    title. Fuzzy queries rank titles by trigram (Dice) similarity, so
+    small typos still find the intended movie. Results are returned in the
+    order titles were added.
+    """
+
+    def __init__(self, titles=()):
+        """
+        Build the index.
+        :param titles: Iterable of movie titles
+        """
+        self._postings = {}
+        self._lower = {}
+        self._seq = {}
+        self._gram_count = {}
+        self._counter = itertools.count()
+        for title in titles:
+            self.add(title)
+
+    def __len__(self):
+        return len(self._lower)
+
+    def __contains__(self, title):
+        return title in self._lower
+
+    def add(self, title):
+        """
+        Index a title (no-op if it is already indexed).
+        :param title: Movie title
+        """
+        if title in self._lower:
+            return
+        lower = title.lower()
+        self._lower[title] = lower
+        self._seq[title] = next(self._counter)
+        grams = trigrams(lower)
+        self._gram_count[title] = len(grams)
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(title)
+
+    def remove(self, title):
+        """
+        Remove a title from the index (no-op if it is not indexed).
+        :param title: Movie title
+        """
+        lower = self._lower.pop(title, None)
+        if lower is None:
+            return
+        del self._seq[title]
+        del self._gram_count[title]
+        for gram in trigrams(lower):
+            posting = self._postings[gram]
+            posting.discard(title)
+            if not posting:
+                del self._postings[gram]
+
+    def search(self, substring):
+        """
+        Find titles containing substring (case-insensitive).
+        :param substring: Part of a movie title
+        :return: list of matching titles
+        """
+        query = substring.lower()
+        grams = trigrams(query)
+        if not grams:
+            # Too short for trigrams; fall back to a scan of the lowercased titles
+            return [title for title, lower in self._lower.items() if query in lower]
+
+        postings = []
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if not posting:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                return []
+        matches = [title for title in candidates if query in self._lower[title]]
+        matches.sort(key=self._seq.__getitem__)
+        return matches
+
+    def fuzzy(self, query, limit=5, min_similarity=0.3):
+        """
+        Find titles similar to query, tolerating typos.
+        :param query: Approximate movie title
+        :param limit: Maximum number of results
+        :param min_similarity: Minimum trigram Dice similarity (0-1)
+        :return: list of (title, similarity) tuples, most similar first
+        """
+        grams = trigrams(query.lower())
+        if not grams:
+            return []
+        overlap = {}
+        for gram in grams:
+            for title in self._postings.get(gram, ()):
+                overlap[title] = overlap.get(title, 0) + 1
+
+        scored = []
+        for title, shared in overlap.items():
+            similarity = 2 * shared / (len(grams) + self._gram_count[title])
+            if similarity >= min_similarity:
+                scored.append((title, similarity))
+        scored.sort(key=lambda item: (-item[1], self._seq[item[0]]))
+        return scored[:limit]
@@ -0,0 +1,68 @@
+# conftest.py
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+
+class FakeOmdbHandler(BaseHTTPRequestHandler):
+    """Answers OMDb-style '?t=<title>' queries from server.movies."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        title = parse_qs(urlparse(self.path).query).get('t', [''])[0]
+        with server.lock:
+            server.requested.append(title)
+            server.client_ports.add(self.client_address[1])
+            failing = server.fail_next > 0
+            if failing:
+                server.fail_next -= 1
+
+        if failing:
+            self._send(503, {'Error': 'Service Unavailable'})
+            return
+        movie = server.movies.get(title.lower())
+        if movie is None:
+            self._send(200, {'Response': 'False', 'Error': 'Movie not found!'})
+        else:
+            self._send(200, dict(movie, Response='True'))
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def omdb_server():
+    """
+    Local fake OMDb server. Tests can adjust .movies (keyed by lowercase
+    title) and .fail_next, and inspect .requested and .client_ports.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeOmdbHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.movies = {
+        'inception': {'Title': 'Inception', 'Year': '2010',
+                      'imdbRating': '8.8', 'Poster': 'inception.jpg'},
+    }
+    server.fail_next = 0
+    server.requested = []
+    server.client_ports = set()
+    server.url = f'http://127.0.0.1:{server.server_address[1]}/'
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,115 @@
+# test_api_server.py
+
+import http.client
+import json
+import threading
+from urllib.parse import quote
+
+import pytest
+
+import omdb_client
+from api_server import MovieApiServer
+from omdb_client import OmdbClient
+from storage.storage_json import StorageJson
+from storage.storage_sqlite import StorageSqlite
+
+
+@pytest.fixture(params=[StorageJson, StorageSqlite], ids=["json", "sqlite"])
+def api(request, tmp_path, omdb_server, monkeypatch):
+    """API server on a free port over a small library, with OMDb faked locally."""
+    suffix = "json" if request.param is StorageJson else "db"
+    storage = request.param(str(tmp_path / f"movies.{suffix}"))
+    storage.add_movies_bulk({
+        f"Movie {i}": {'year': 1990 + i, 'rating': i / 2, 'poster': ''} for i in range(1, 8)
+    })
+    monkeypatch.setattr(omdb_client, "_client", OmdbClient("test-key", url=omdb_server.url))
+    server = MovieApiServer(("127.0.0.1", 0), storage, workers=4)
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def call(server, method, path, body=None, headers=None):
+    conn = http.client.HTTPConnection(*server.server_address[:2], timeout=5)
+    payload = json.dumps(body) if body is not None else None
+    conn.request(method, path, body=payload, headers=headers or {})
+    response = conn.getresponse()
+    data = response.read()
+    conn.close()
+    return response.status, response.headers, json.loads(data) if data else None
+
+
+def test_list_is_paginated_with_etag(api):
+    status, headers, page = call(api, "GET", "/movies?page=2&per_page=3")
+    assert status == 200
+    assert page["total"] == 7 and page["pages"] == 3
+    assert [m["title"] for m in page["movies"]] == ["Movie 4", "Movie 5", "Movie 6"]
+
+    etag = headers["ETag"]
+    status, _, body = call(api, "GET", "/movies?page=2&per_page=3", headers={"If-None-Match": etag})
+    assert status == 304 and body is None
+
+    call(api, "PATCH", "/movies/Movie%204", {"rating": 9.5})
+    status, headers, _ = call(api, "GET", "/movies?page=2&per_page=3",
+                              headers={"If-None-Match": etag})
+    assert status == 200 and headers["ETag"] != etag
+
+
+def test_search_and_stats(api):
+    _, _, found = call(api, "GET", "/search?q=movie%203")
+    assert [m["title"] for m in found["results"]] == ["Movie 3"]
+    _, _, fuzzy = call(api, "GET", "/search?q=Mvie%206")
+    assert fuzzy["results"] == [] and fuzzy["suggestions"]
+    _, _, stats = call(api, "GET", "/stats")
+    assert stats["stats"]["best"] == ["Movie 7"]
+    assert stats["decades"]["1990"]["count"] == 7
+
+
+def test_add_update_delete(api):
+    status, _, movie = call(api, "POST", "/movies", {"title": "inception"})
+    assert status == 201 and movie["title"] == "Inception"
+    assert call(api, "POST", "/movies", {"title": "Inception"})[0] == 409
+    assert call(api, "POST", "/movies", {"title": "No Such Film"})[0] == 404
+
+    status, _, movie = call(api, "PATCH", "/movies/" + quote("Inception"), {"rating": 9.1})
+    assert status == 200 and movie["rating"] == 9.1
+    assert call(api, "PATCH", "/movies/Inception", {"rating": "high"})[0] == 400
+
+    assert call(api, "DELETE", "/movies/Inception")[0] == 204
+    assert call(api, "GET", "/movies/Inception")[0] == 404
+    assert call(api, "DELETE", "/movies/Inception")[0] == 404
+
+
+def test_malformed_omdb_data_is_a_bad_gateway(api, omdb_server):
+    omdb_server.movies["dark"] = {'Title': 'Dark', 'Year': '2017–2020',
+                                  'imdbRating': '8.7', 'Poster': ''}
+    status, _, body = call(api, "POST", "/movies", {"title": "Dark"})
+    assert status == 502 and "Invalid OMDb data" in body["error"]
+    assert call(api, "GET", "/movies/Dark")[0] == 404
+
+
+def test_concurrent_requests_share_storage(api):
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(10):
+                assert call(api, "PATCH", "/movies/Movie%201", {"rating": n + i / 10})[0] == 200
+                assert call(api, "GET", "/movies?per_page=100")[0] == 200
+        except Exception as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert call(api, "GET", "/movies?per_page=100")[2]["total"] == 7
+
+
+def test_unknown_endpoint(api):
+    assert call(api, "GET", "/nope")[0] == 404
+    assert call(api, "GET", "/movies?page=0")[0] == 400
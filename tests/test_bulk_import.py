@@ -0,0 +1,54 @@
+# test_bulk_import.py
+
+import pytest
+
+import bulk_import
+import omdb_client
+from omdb_client import OmdbClient
+from storage.storage_json import StorageJson
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return StorageJson(str(tmp_path / "movies.json"))
+
+
+@pytest.fixture(autouse=True)
+def fake_client(omdb_server, monkeypatch):
+    """Route omdb_client.get_movie_data to the local fake server."""
+    omdb_server.movies.update({
+        'heat': {'Title': 'Heat', 'Year': '1995', 'imdbRating': '8.3', 'Poster': ''},
+        'up': {'Title': 'Up', 'Year': '2009', 'imdbRating': 'N/A', 'Poster': ''},
+    })
+    client = OmdbClient('test-key', url=omdb_server.url, rate=1000, burst=1000)
+    monkeypatch.setattr(omdb_client, '_client', client)
+    yield
+    client.close()
+
+
+def test_import_dedupes_and_reports_failures(storage, monkeypatch):
+    """Known titles are skipped, failures are reported, the rest is saved once."""
+    storage.add_movie("Heat", 1995, 8.3, "")
+    writes = []
+    original = storage._save_movies
+    monkeypatch.setattr(storage, "_save_movies", lambda m: (writes.append(1), original(m)))
+
+    report = bulk_import.import_titles(
+        storage, ["Inception", "heat", "Up", "inception", "Nope"], workers=4)
+
+    assert sorted(report.added) == ["Inception", "Up"]
+    assert sorted(report.skipped) == ["heat", "inception"]
+    assert report.failed == [("Nope", "not found in OMDb")]
+    assert len(writes) == 1
+    assert storage.list_movies()["Up"]["rating"] == 0.0
+
+
+def test_read_titles(tmp_path):
+    """Titles are read from text files and from a CSV 'title' column."""
+    txt = tmp_path / "titles.txt"
+    txt.write_text("Inception\n\n  Heat \n", encoding="utf-8")
+    csv_file = tmp_path / "titles.csv"
+    csv_file.write_text("year,title\n2010,Inception\n1995,\"Heat, the\"\n", encoding="utf-8")
+
+    assert bulk_import.read_titles(str(txt)) == ["Inception", "Heat"]
+    assert bulk_import.read_titles(str(csv_file)) == ["Inception", "Heat, the"]
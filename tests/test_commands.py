@@ -0,0 +1,133 @@
+# test_commands.py
+
+import io
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import commands
+from storage.storage_binary import StorageBinary
+from storage.storage_json import StorageJson
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BATCH = """
+# seed the library
+add "The Matrix" --year 1999 --rating 8.7
+add Heat --year 1995 --rating 8.3
+update Heat 9.0
+delete "Not There"
+frobnicate
+list --limit 1
+stats
+"""
+
+
+def run_batch(storage, text):
+    out = io.StringIO()
+    failures = commands.run_batch(storage, io.StringIO(text), out)
+    return failures, [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def test_batch_reports_every_command(tmp_path):
+    storage = StorageJson(str(tmp_path / "movies.json"))
+    failures, records = run_batch(storage, BATCH)
+    assert failures == 2
+    assert [r['command'] for r in records] == ['add', 'add', 'update', 'delete', None,
+                                               'list', 'stats']
+    assert [r['line'] for r in records] == [3, 4, 5, 6, 7, 8, 9]
+    assert records[2]['result']['movie']['rating'] == 9.0
+    assert records[3] == {'command': 'delete', 'ok': False,
+                          'error': "Movie 'Not There' not found", 'line': 6}
+    assert 'invalid choice' in records[4]['error']
+    assert records[5]['result']['total'] == 2
+    assert len(records[5]['result']['movies']) == 1
+    assert records[6]['result']['stats']['count'] == 2
+
+
+@pytest.mark.parametrize("cls, name", [(StorageJson, "movies.json"),
+                                       (StorageBinary, "movies.bin")])
+def test_batch_writes_once(cls, name, tmp_path, monkeypatch):
+    """Every mutation in a batch file is persisted with a single write."""
+    path = str(tmp_path / name)
+    storage = cls(path)
+    writes = []
+    real_atomic_write = sys.modules[cls.__module__].atomic_write
+
+    def counting_atomic_write(*args, **kwargs):
+        writes.append(args[0])
+        return real_atomic_write(*args, **kwargs)
+
+    monkeypatch.setattr(sys.modules[cls.__module__], "atomic_write", counting_atomic_write)
+    lines = "".join(f'add "Movie {i}" --year 2000 --rating 7\n' for i in range(50))
+    failures, records = run_batch(storage, lines + 'delete "Movie 0"\nupdate "Movie 1" 9.5\n')
+    assert failures == 0 and len(records) == 52
+    assert writes == [path]
+    reopened = cls(path).list_movies()
+    assert len(reopened) == 49
+    assert reopened["Movie 1"]["rating"] == 9.5
+
+
+@pytest.mark.parametrize("cls, name", [(StorageJson, "movies.json"),
+                                       (StorageBinary, "movies.bin")])
+def test_list_pages_with_offset_and_limit(cls, name, tmp_path):
+    """list uses IStorage.list_page; --offset without --limit returns the rest."""
+    storage = cls(str(tmp_path / name))
+    storage.add_movies_bulk({f"M{i}": {'year': 2000, 'rating': 5.0, 'poster': ''}
+                             for i in range(5)})
+    failures, records = run_batch(storage, "list --offset 1\nlist --offset 1 --limit 2\n"
+                                           "list --offset 9\n")
+    assert failures == 0
+    assert [[m['title'] for m in r['result']['movies']] for r in records] == [
+        ["M1", "M2", "M3", "M4"], ["M1", "M2"], []]
+    assert all(r['result']['total'] == 5 for r in records)
+
+
+def test_add_uses_omdb_without_year_and_rating(tmp_path, monkeypatch):
+    import omdb_client
+
+    monkeypatch.setattr(omdb_client, "get_movie_data", lambda title: {
+        'Title': 'Heat', 'Year': '1995', 'imdbRating': '8.3', 'Poster': 'heat.jpg'})
+    storage = StorageJson(str(tmp_path / "movies.json"))
+    failures, records = run_batch(storage, "add heat\nadd heat\n")
+    assert failures == 1
+    assert records[0]['result']['movie'] == {'title': 'Heat', 'year': 1995, 'rating': 8.3,
+                                             'poster': 'heat.jpg'}
+    assert records[1]['error'] == "Movie 'Heat' already exists"
+
+
+def test_bad_omdb_data_fails_only_its_line(tmp_path, monkeypatch):
+    import omdb_client
+
+    monkeypatch.setattr(omdb_client, "get_movie_data", lambda title: {
+        'Title': 'Dark', 'Year': '2017–2020', 'imdbRating': '8.7', 'Poster': ''})
+    path = str(tmp_path / "movies.json")
+    failures, records = run_batch(StorageJson(path), 'add Heat --year 1995 --rating 8.3\n'
+                                                     'add dark\n')
+    assert failures == 1
+    assert records[1]['error'].startswith("Invalid OMDb data for 'dark'")
+    assert list(StorageJson(path).list_movies()) == ["Heat"]
+
+
+def test_refresh_is_rejected_in_batch(tmp_path):
+    failures, records = run_batch(StorageJson(str(tmp_path / "movies.json")), "refresh\n")
+    assert failures == 1
+    assert "cannot run inside --batch" in records[0]['error']
+
+
+def test_cli_subcommand_and_stdin_batch(tmp_path):
+    path = str(tmp_path / "movies.json")
+    base = [sys.executable, "main.py", "--file", path]
+    result = subprocess.run(base + ["add", "Heat", "--year", "1995", "--rating", "8.3"],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    assert json.loads(result.stdout)['ok'] is True
+
+    result = subprocess.run(base + ["--batch", "-"], input='search heat\ndelete Nope\n',
+                            cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 1
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert records[0]['result']['results'][0]['title'] == 'Heat'
+    assert records[1]['ok'] is False
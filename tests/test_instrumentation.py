@@ -0,0 +1,77 @@
+# test_instrumentation.py
+
+import pytest
+
+import instrumentation
+from instrumentation import timed
+from storage.storage_json import StorageJson
+
+
+@pytest.fixture(autouse=True)
+def clean_recording():
+    instrumentation.reset()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+@timed("test.double")
+def double(x):
+    return 2 * x
+
+
+def test_disabled_timers_record_nothing():
+    assert double(2) == 4
+    with timed("test.block"):
+        pass
+    assert instrumentation.snapshot() == {}
+
+
+def test_decorator_and_context_manager_record():
+    instrumentation.enable()
+    double(1)
+    double(2)
+    with timed("test.block"):
+        pass
+    metrics = instrumentation.snapshot()
+    assert metrics["test.double"].count == 2
+    assert metrics["test.block"].count == 1
+    assert sum(metrics["test.double"].buckets) == 2
+
+
+def test_errors_are_timed_and_propagate():
+    instrumentation.enable()
+
+    @timed("test.fail")
+    def fail():
+        raise KeyError
+
+    with pytest.raises(KeyError):
+        fail()
+    assert instrumentation.snapshot()["test.fail"].count == 1
+
+
+def test_percentile_uses_histogram_buckets():
+    metric = instrumentation.Metric()
+    for ms in [0.05] * 98 + [20, 700]:
+        metric.add(ms / 1000)
+    assert metric.percentile(0.5) == 0.1
+    assert metric.percentile(0.99) == 50
+    assert metric.percentile(1.0) == pytest.approx(700)
+
+
+def test_instrumented_storage_attributes_io(tmp_path):
+    """Public storage calls and the file parse/write inside them are timed separately."""
+    instrumentation.enable()
+    storage = instrumentation.instrument(StorageJson(str(tmp_path / "m.json")), "storage",
+                                         ["add_movie", "list_movies"])
+    storage.add_movie("A", 2000, 7.0, "")
+    StorageJson(str(tmp_path / "m.json")).list_movies()
+    assert storage.get_movie("A")["rating"] == 7.0  # not instrumented, still forwarded
+
+    metrics = instrumentation.snapshot()
+    assert metrics["storage.add_movie"].count == 1
+    assert metrics["storage.write"].count == 1
+    assert metrics["storage.parse"].count == 1
+    assert "storage.get_movie" not in metrics
+    assert "storage.add_movie" in instrumentation.format_report()
@@ -0,0 +1,55 @@
+# test_json_codec.py
+
+import pytest
+
+from storage import json_codec
+from storage.storage_json import StorageJson
+
+MOVIES = {
+    "Amélie": {'year': 2001, 'rating': 8.3, 'poster': 'https://example.com/a.jpg'},
+    "Brazil": {'year': 1985, 'rating': 7.9, 'poster': ''},
+}
+
+
+@pytest.mark.parametrize("name", sorted(json_codec.CODECS))
+def test_codecs_roundtrip(name):
+    codec = json_codec.get_codec(name)
+    pretty = codec.dumps(MOVIES)
+    compact = codec.dumps(MOVIES, indent=False)
+    assert codec.loads(pretty) == MOVIES
+    assert json_codec.get_codec("json").loads(compact) == MOVIES
+    assert len(compact) < len(pretty)
+    assert b"\n" not in compact
+
+
+def test_auto_prefers_fastest_installed():
+    best = json_codec.get_codec()
+    assert best.name == next(n for n in ("orjson", "ujson", "json") if n in json_codec.CODECS)
+
+
+def test_unknown_codec_is_rejected():
+    with pytest.raises(ValueError):
+        json_codec.get_codec("simplejson")
+
+
+def test_reads_files_written_by_other_codecs(tmp_path):
+    """Files stay interchangeable: stdlib-written files load with the default codec."""
+    path = str(tmp_path / "movies.json")
+    StorageJson(path, codec="json").add_movies_bulk(MOVIES)
+    assert StorageJson(path).list_movies() == MOVIES
+
+
+def test_gzip_storage(tmp_path):
+    path = str(tmp_path / "movies.json.gz")
+    storage = StorageJson(path, compact=True)
+    storage.add_movies_bulk(MOVIES)
+    with open(path, "rb") as f:
+        assert f.read(2) == b"\x1f\x8b"
+    assert StorageJson(path).list_movies() == MOVIES
+
+
+def test_zstd_storage(tmp_path):
+    pytest.importorskip("zstandard")
+    path = str(tmp_path / "movies.json.zst")
+    StorageJson(path).add_movies_bulk(MOVIES)
+    assert StorageJson(path).list_movies() == MOVIES
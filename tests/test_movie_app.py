@@ -91,3 +91,25 @@ def test_multiple_storage_files(tmp_path):
     assert "SaraMovie" not in j.list_movies()
     assert "SaraMovie" in s.list_movies()
     assert "JohnMovie" not in s.list_movies()
+
+
+def test_search_command(capsys, monkeypatch, app):
+    """_command_search_movies nutzt search_title und ignoriert Groß-/Kleinschreibung."""
+    s = app._storage
+    s.add_movie("The Matrix", 1999, 8.7, "")
+    s.add_movie("Heat", 1995, 8.3, "")
+    monkeypatch.setattr("builtins.input", lambda _: "matrix")
+    app._command_search_movies()
+    out = capsys.readouterr().out
+    assert "The Matrix (1999), 8.7" in out
+    assert "Heat" not in out
+
+
+def test_search_suggests_similar_titles(capsys, monkeypatch, app):
+    """Bei Tippfehlern schlägt _command_search_movies ähnliche Titel vor."""
+    app._storage.add_movie("The Godfather", 1972, 9.2, "")
+    monkeypatch.setattr("builtins.input", lambda _: "godfater")
+    app._command_search_movies()
+    out = capsys.readouterr().out
+    assert "No matching movies found." in out
+    assert "The Godfather (1972), 9.2" in out
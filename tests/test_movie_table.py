@@ -0,0 +1,76 @@
+# test_movie_table.py
+
+import pytest
+
+from movie_app import MovieApp
+from storage import movie_table
+from storage.movie_table import MovieTable
+from storage.storage_csv import StorageCsv
+from storage.storage_json import StorageJson
+
+MOVIES = {
+    "A": {'year': 1994, 'rating': 7.7, 'poster': 'a.jpg'},
+    "B": {'year': 1999, 'rating': 9.1, 'poster': ''},
+    "C": {'year': 2003, 'rating': 7.7, 'poster': 'a.jpg'},
+}
+
+
+def test_behaves_like_dict():
+    """The table round-trips the dict representation, in insertion order."""
+    table = MovieTable(MOVIES)
+    assert dict(table) == MOVIES
+    assert list(table.items()) == list(MOVIES.items())
+    assert len(table.values()) == 3
+    table["B"] = dict(MOVIES["B"], rating=8.0)
+    del table["A"]
+    assert list(table) == ["B", "C"]
+    assert table["B"]["rating"] == 8.0
+    assert "A" not in table
+
+
+def test_deleted_rows_are_compacted(monkeypatch):
+    monkeypatch.setattr(movie_table, "_COMPACT_MIN_ROWS", 2)
+    table = MovieTable({f"M{i}": {'year': 2000, 'rating': i / 10, 'poster': ''} for i in range(6)})
+    for i in range(4):
+        del table[f"M{i}"]
+    assert len(table._titles) < 6
+    assert dict(table) == {"M4": {'year': 2000, 'rating': 0.4, 'poster': ''},
+                           "M5": {'year': 2000, 'rating': 0.5, 'poster': ''}}
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_sort_and_stats(use_numpy, monkeypatch):
+    """Sorting and stats agree with and without NumPy."""
+    if not use_numpy:
+        monkeypatch.setattr(movie_table, "numpy", None)
+    elif movie_table._numpy() is None:
+        pytest.skip("NumPy not installed")
+    table = MovieTable(MOVIES)
+    assert [t for t, _ in table.sorted_by_rating()] == ["B", "A", "C"]
+    assert [t for t, _ in table.sorted_by_rating(2, descending=False)] == ["A", "C"]
+    stats = table.rating_summary()
+    assert stats['median'] == 7.7
+    assert stats['average'] == pytest.approx(8.1666667)
+    assert stats['best'] == ["B"] and stats['worst'] == ["A", "C"]
+    assert table.rating_breakdown('decade')[1990] == {'count': 2, 'average': pytest.approx(8.4)}
+
+
+@pytest.mark.parametrize("backend, name", [(StorageJson, "m.json"), (StorageCsv, "m.csv")])
+def test_columnar_storage_with_movie_app(backend, name, tmp_path, capsys):
+    """MovieApp works unchanged on a columnar backend, and data survives a reload."""
+    storage = backend(str(tmp_path / name), columnar=True)
+    storage.add_movies_bulk(MOVIES)
+    storage.update_movie("A", 5.0)
+    storage.delete_movie("C")
+
+    app = MovieApp(storage)
+    app._command_list_movies()
+    app._command_show_stats()
+    out = capsys.readouterr().out
+    assert "A (1994): 5.0" in out
+    assert "Best movie (9.1): B" in out
+
+    assert backend(str(tmp_path / name)).list_movies() == {
+        "A": {'year': 1994, 'rating': 5.0, 'poster': 'a.jpg'},
+        "B": {'year': 1999, 'rating': 9.1, 'poster': ''},
+    }
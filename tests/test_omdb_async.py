@@ -0,0 +1,49 @@
+# test_omdb_async.py
+
+import asyncio
+
+import pytest
+
+import omdb_client
+from omdb_async import AsyncOmdbClient
+from omdb_cache import OmdbCache
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_lookup_and_errors(omdb_server):
+    """Found, not found and server errors map to the omdb_client types."""
+    async def scenario():
+        async with AsyncOmdbClient('test-key', url=omdb_server.url, backoff=0.001,
+                                   max_retries=1) as client:
+            data = await client.get_movie_data('Inception')
+            with pytest.raises(omdb_client.MovieNotFoundError):
+                await client.get_movie_data('Nope')
+            omdb_server.fail_next = 5
+            with pytest.raises(omdb_client.OmdbAPIError):
+                await client.get_movie_data('Inception')
+            return data
+
+    assert run(scenario())['Year'] == '2010'
+
+
+def test_get_many_keeps_order_and_uses_cache(omdb_server, tmp_path):
+    """get_many returns results in input order and shares the cache."""
+    cache = OmdbCache(tmp_path / 'cache.db')
+
+    async def scenario():
+        async with AsyncOmdbClient('test-key', url=omdb_server.url, cache=cache,
+                                   max_concurrency=4) as client:
+            first = await client.get_many(['Inception', 'Nope', 'Heat'])
+            requests_made = len(omdb_server.requested)
+            second = await client.get_many(['Inception', 'Nope'])
+            return first, second, requests_made
+
+    first, second, requests_made = run(scenario())
+    assert first[0]['Title'] == 'Inception'
+    assert isinstance(first[1], omdb_client.MovieNotFoundError)
+    assert isinstance(first[2], omdb_client.MovieNotFoundError)
+    assert isinstance(second[1], omdb_client.MovieNotFoundError)
+    assert len(omdb_server.requested) == requests_made == 3
@@ -0,0 +1,101 @@
+# test_omdb_client.py
+
+import pytest
+
+import omdb_client
+from omdb_cache import OmdbCache
+from omdb_client import OmdbClient, TokenBucket
+
+
+@pytest.fixture
+def client(omdb_server, tmp_path):
+    """OmdbClient pointed at the local fake server with a temp cache."""
+    c = OmdbClient('test-key', url=omdb_server.url, cache=OmdbCache(tmp_path / 'cache.db'),
+                   backoff=0.001, rate=1000, burst=1000)
+    yield c
+    c.close()
+
+
+def test_positive_answer_is_cached(client, omdb_server):
+    """A second lookup of the same (normalized) title does not hit the network."""
+    assert client.get_movie_data('Inception')['Year'] == '2010'
+    assert client.get_movie_data('  inception ')['Title'] == 'Inception'
+    assert omdb_server.requested == ['Inception']
+
+
+def test_negative_answer_is_cached(client, omdb_server):
+    """'Movie not found!' answers are remembered too."""
+    for _ in range(2):
+        with pytest.raises(omdb_client.MovieNotFoundError):
+            client.get_movie_data('No Such Film')
+    assert omdb_server.requested == ['No Such Film']
+
+
+def test_retries_transient_server_errors(client, omdb_server):
+    """5xx answers are retried until the server recovers."""
+    omdb_server.fail_next = 2
+    assert client.get_movie_data('Inception')['Title'] == 'Inception'
+    assert len(omdb_server.requested) == 3
+
+
+def test_gives_up_after_max_retries(client, omdb_server):
+    """Persistent 5xx answers surface as OmdbAPIError."""
+    omdb_server.fail_next = 10
+    with pytest.raises(omdb_client.OmdbAPIError):
+        client.get_movie_data('Inception')
+    assert len(omdb_server.requested) == 4
+
+
+def test_connections_are_reused(omdb_server):
+    """Sequential lookups share one kept-alive connection."""
+    omdb_server.movies['heat'] = {'Title': 'Heat', 'Year': '1995'}
+    c = OmdbClient('test-key', url=omdb_server.url, rate=1000, burst=1000)
+    for title in ('Inception', 'Heat', 'Inception'):
+        c.get_movie_data(title)
+    c.close()
+    assert len(omdb_server.client_ports) == 1
+
+
+def test_module_function_wraps_shared_client(client, monkeypatch):
+    """get_movie_data delegates to the shared OmdbClient."""
+    monkeypatch.setattr(omdb_client, '_client', client)
+    assert omdb_client.get_movie_data('Inception')['imdbRating'] == '8.8'
+
+
+def test_token_bucket_limits_rate(monkeypatch):
+    """Once the burst is used up, acquire waits for refills."""
+    now = [0.0]
+    slept = []
+    monkeypatch.setattr('omdb_client.time.monotonic', lambda: now[0])
+
+    def fake_sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr('omdb_client.time.sleep', fake_sleep)
+    bucket = TokenBucket(rate=2, capacity=2)
+    for _ in range(4):
+        bucket.acquire()
+    assert sum(slept) == pytest.approx(1.0)
+
+
+def test_cache_ttl_and_lru(tmp_path, monkeypatch):
+    """Expired entries miss, and the least recently used entry is evicted."""
+    now = [1000.0]
+    monkeypatch.setattr('omdb_cache.time.time', lambda: now[0])
+    cache = OmdbCache(tmp_path / 'cache.db', positive_ttl=100, negative_ttl=10, max_entries=2)
+
+    cache.put('A', {'Title': 'A'})
+    cache.put_not_found('B', 'Movie not found!')
+    now[0] += 20
+    assert cache.get('B') is None
+    assert cache.get('A') == (True, {'Title': 'A'})
+
+    now[0] += 1
+    cache.put('C', {'Title': 'C'})
+    now[0] += 1
+    cache.get('A')
+    now[0] += 1
+    cache.put('D', {'Title': 'D'})
+    assert cache.get('C') is None
+    assert cache.get('A') is not None
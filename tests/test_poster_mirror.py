@@ -0,0 +1,108 @@
+# test_poster_mirror.py
+
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import poster_mirror
+import website_generator
+from storage.storage_json import StorageJson
+
+POSTERS = {
+    '/a.jpg': (b'image-a', '"etag-a"'),
+    '/copy-of-a.jpg': (b'image-a', '"etag-a"'),
+    '/b.jpg': (b'image-bb', None),
+}
+
+
+class PosterHandler(BaseHTTPRequestHandler):
+    """Serves POSTERS; honours If-None-Match and answers HEAD requests."""
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def _respond(self, send_body):
+        self.server.log.append((self.command, self.path))
+        if self.path not in POSTERS:
+            self.send_error(404)
+            return
+        body, etag = POSTERS[self.path]
+        if etag and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def poster_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), PosterHandler)
+    server.daemon_threads = True
+    server.log = []
+    server.url = f'http://127.0.0.1:{server.server_address[1]}'
+    threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def movies(poster_server):
+    url = poster_server.url
+    return {
+        'A': {'year': 2000, 'rating': 5.0, 'poster': f'{url}/a.jpg'},
+        'A2': {'year': 2001, 'rating': 6.0, 'poster': f'{url}/copy-of-a.jpg'},
+        'B': {'year': 2002, 'rating': 7.0, 'poster': f'{url}/b.jpg'},
+        'Missing': {'year': 2003, 'rating': 8.0, 'poster': f'{url}/missing.jpg'},
+        'Local': {'year': 2004, 'rating': 9.0, 'poster': 'local.png'},
+    }
+
+
+def test_mirror_dedupes_and_skips_fresh_copies(movies, poster_server, tmp_path):
+    """Identical images share one file; fresh copies are not downloaded again."""
+    static_dir = str(tmp_path)
+    mapping = poster_mirror.mirror_posters(movies, static_dir, workers=4)
+
+    url = poster_server.url
+    assert mapping[f'{url}/a.jpg'] == mapping[f'{url}/copy-of-a.jpg']
+    assert f'{url}/missing.jpg' not in mapping
+    assert 'local.png' not in mapping
+    files = [f for f in os.listdir(tmp_path / 'posters') if f != 'manifest.json']
+    assert len(files) == 2
+
+    poster_server.log.clear()
+    assert poster_mirror.mirror_posters(movies, static_dir) == mapping
+    full_downloads = [path for method, path in poster_server.log
+                      if method == 'GET' and path != '/missing.jpg']
+    assert sorted(full_downloads) == ['/a.jpg', '/copy-of-a.jpg']  # answered with 304
+    assert ('HEAD', '/b.jpg') in poster_server.log
+
+
+def test_generator_uses_local_copies(movies, tmp_path):
+    """Mapped posters are rendered with their local path."""
+    storage = StorageJson(str(tmp_path / 'movies.json'))
+    storage.add_movies_bulk(movies)
+    template = tmp_path / 'template.html'
+    template.write_text('__TEMPLATE_TITLE__ __TEMPLATE_MOVIE_GRID__', encoding='utf-8')
+
+    mapping = poster_mirror.mirror_posters(movies, str(tmp_path))
+    out = str(tmp_path / 'index.html')
+    website_generator.generate_website(storage, str(template), out, 'Lib', poster_map=mapping)
+    with open(out, encoding='utf-8') as f:
+        html = f.read()
+    assert 'src="posters/' in html
+    assert 'missing.jpg' in html
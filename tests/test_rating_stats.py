@@ -0,0 +1,71 @@
+# test_rating_stats.py
+
+import random
+import statistics
+
+import pytest
+
+from storage.rating_stats import RatingStats
+from storage.storage_journal import StorageJournal
+from storage.storage_json import StorageJson
+from storage.storage_sqlite import StorageSqlite
+
+
+def test_matches_full_recomputation():
+    """After random adds, re-ratings and deletes the summary equals a fresh computation."""
+    rng = random.Random(3)
+    movies = {}
+    stats = RatingStats()
+    for step in range(500):
+        title = f"M{rng.randrange(60)}"
+        if title in movies and rng.random() < 0.4:
+            stats.remove(title, movies.pop(title))
+            continue
+        info = {'year': rng.randrange(1950, 2025), 'rating': rng.randrange(10, 100) / 10}
+        if title in movies:
+            stats.remove(title, movies[title])
+        stats.add(title, info)
+        movies[title] = info
+
+    ratings = [info['rating'] for info in movies.values()]
+    summary = stats.summary()
+    assert summary['count'] == len(ratings)
+    assert summary['average'] == pytest.approx(statistics.mean(ratings))
+    assert summary['median'] == statistics.median(ratings)
+    assert sorted(summary['best']) == sorted(t for t, i in movies.items() if i['rating'] == max(ratings))
+    assert sorted(summary['worst']) == sorted(t for t, i in movies.items() if i['rating'] == min(ratings))
+
+
+def test_empty_and_breakdowns():
+    stats = RatingStats()
+    assert stats.summary() is None
+    stats.add("A", {'year': 1994, 'rating': 8.0})
+    stats.add("B", {'year': 1999, 'rating': 6.0})
+    stats.add("C", {'year': 2001, 'rating': 7.0})
+    assert stats.by_year()[1994] == {'count': 1, 'average': 8.0}
+    assert stats.by_decade() == {1990: {'count': 2, 'average': 7.0},
+                                 2000: {'count': 1, 'average': 7.0}}
+    stats.remove("C", {'year': 2001, 'rating': 7.0})
+    assert list(stats.by_decade()) == [1990]
+
+
+@pytest.mark.parametrize("factory", [
+    lambda p: StorageJson(str(p / "m.json")),
+    lambda p: StorageJournal(str(p / "m.journal")),
+    lambda p: StorageSqlite(str(p / "m.db")),
+])
+def test_backends_keep_stats_in_sync(factory, tmp_path):
+    """Backends report the same stats as the list_movies()-based defaults."""
+    storage = factory(tmp_path)
+    storage.add_movie("A", 1994, 5.0, "")
+    storage.rating_stats()
+    storage.add_movie("B", 1999, 9.0, "")
+    storage.add_movie("C", 2003, 7.0, "")
+    storage.update_movie("A", 9.0)
+    storage.delete_movie("C")
+
+    stats = storage.rating_stats()
+    assert stats['median'] == 9.0
+    assert sorted(stats['best']) == ["A", "B"]
+    assert stats['worst_rating'] == 9.0
+    assert storage.rating_breakdown('decade') == {1990: {'count': 2, 'average': 9.0}}
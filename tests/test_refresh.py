@@ -0,0 +1,158 @@
+# test_refresh.py
+
+import json
+import time
+
+import pytest
+
+import omdb_client
+import refresh
+from storage.storage_binary import StorageBinary
+from storage.storage_csv import StorageCsv, StreamingStorageCsv
+from storage.storage_journal import StorageJournal
+from storage.storage_json import StorageJson
+from storage.storage_sqlite import StorageSqlite
+
+BACKENDS = [
+    (StorageJson, "movies.json", {}),
+    (StorageJson, "movies.json", {'columnar': True}),
+    (StorageCsv, "movies.csv", {}),
+    (StreamingStorageCsv, "movies.csv", {}),
+    (StorageJournal, "movies.journal", {}),
+    (StorageSqlite, "movies.db", {}),
+    (StorageBinary, "movies.bin", {}),
+]
+BACKEND_IDS = ["json", "columnar", "csv", "csv-stream", "journal", "sqlite", "binary"]
+
+DAY = refresh.DAY
+
+
+class FakeClient:
+    """Stands in for OmdbClient; answers from a dict and counts lookups."""
+
+    def __init__(self, answers, fail_after=None):
+        self.answers = answers
+        self.fail_after = fail_after
+        self.requested = []
+
+    def get_movie_data(self, title, fresh=False):
+        assert fresh, "refresh must bypass the response cache"
+        if self.fail_after is not None and len(self.requested) >= self.fail_after:
+            raise KeyboardInterrupt
+        self.requested.append(title)
+        answer = self.answers.get(title)
+        if isinstance(answer, Exception):
+            raise answer
+        if answer is None:
+            raise omdb_client.MovieNotFoundError('Movie not found!')
+        year, rating, poster = answer
+        return {'Title': title, 'Year': str(year), 'imdbRating': str(rating), 'Poster': poster}
+
+    def close(self):
+        pass
+
+
+@pytest.mark.parametrize("cls, name, options", BACKENDS, ids=BACKEND_IDS)
+def test_fetched_at_roundtrip_and_bulk_update(cls, name, options, tmp_path):
+    """Every backend stores fetched_at and applies update_movies_bulk in place."""
+    path = str(tmp_path / name)
+    storage = cls(path, **options)
+    storage.add_movie("Old", 1990, 6.0, "old.jpg")
+    storage.add_movie("Known", 2000, 7.0, "", fetched_at=1_000_000)
+    storage.add_movies_bulk({"Bulk": {'year': 2010, 'rating': 8.0, 'poster': '',
+                                      'fetched_at': 2_000_000}})
+    storage.update_movies_bulk({"Old": {'rating': 6.5, 'fetched_at': 3_000_000},
+                                "Missing": {'rating': 1.0}})
+
+    movies = dict(cls(path, **options).list_movies().items())
+    assert list(movies) == ["Old", "Known", "Bulk"]
+    assert movies["Old"] == {'year': 1990, 'rating': 6.5, 'poster': 'old.jpg',
+                             'fetched_at': 3_000_000}
+    assert movies["Known"]["fetched_at"] == 1_000_000
+    assert movies["Bulk"]["fetched_at"] == 2_000_000
+
+
+@pytest.mark.parametrize("cls, name, options", BACKENDS, ids=BACKEND_IDS)
+def test_refresh_updates_only_stale_movies(cls, name, options, tmp_path):
+    storage = cls(str(tmp_path / name), **options)
+    now = int(time.time())
+    storage.add_movies_bulk({
+        "Never": {'year': 1999, 'rating': 5.0, 'poster': ''},
+        "Stale": {'year': 2001, 'rating': 6.0, 'poster': 's.jpg', 'fetched_at': now - 40 * DAY},
+        "Fresh": {'year': 2002, 'rating': 7.0, 'poster': '', 'fetched_at': now - DAY},
+        "Same": {'year': 2003, 'rating': 8.0, 'poster': '', 'fetched_at': now - 90 * DAY},
+        "Gone": {'year': 2004, 'rating': 4.0, 'poster': ''},
+    })
+    client = FakeClient({"Never": (1999, 5.5, 'n.jpg'), "Stale": (2001, 6.4, 's.jpg'),
+                         "Same": (2003, 8.0, ''), "Fresh": (2002, 1.0, '')})
+
+    report = refresh.refresh_library(storage, max_age=30 * DAY, chunk_size=2,
+                                     checkpoint_path=str(tmp_path / "cp.json"), client=client)
+
+    assert sorted(client.requested) == ["Gone", "Never", "Same", "Stale"]
+    assert report.checked == 5
+    assert sorted(report.refreshed) == ["Never", "Same", "Stale"]
+    assert sorted(report.changed) == ["Never", "Stale"]
+    assert report.failed == [("Gone", "not found in OMDb")]
+    movies = storage.list_movies()
+    assert movies["Never"]["rating"] == 5.5 and movies["Never"]["poster"] == 'n.jpg'
+    assert movies["Stale"]["rating"] == 6.4
+    assert movies["Same"]["fetched_at"] >= now
+    assert movies["Fresh"] == {'year': 2002, 'rating': 7.0, 'poster': '',
+                               'fetched_at': now - DAY}
+    assert "fetched_at" not in movies["Gone"]
+    assert not (tmp_path / "cp.json").exists()
+
+
+def test_interrupted_refresh_resumes_from_checkpoint(tmp_path):
+    storage = StorageJson(str(tmp_path / "movies.json"))
+    titles = [f"Movie {i}" for i in range(10)]
+    storage.add_movies_bulk({t: {'year': 2000, 'rating': 5.0, 'poster': ''} for t in titles})
+    answers = {t: (2000, 6.0, '') for t in titles}
+    checkpoint = str(tmp_path / "cp.json")
+
+    first = FakeClient(answers, fail_after=6)
+    with pytest.raises(KeyboardInterrupt):
+        refresh.refresh_library(storage, chunk_size=3, workers=1, checkpoint_path=checkpoint,
+                                client=first)
+    with open(checkpoint, encoding='utf-8') as f:
+        assert json.load(f)['offset'] == 6
+
+    second = FakeClient(answers)
+    report = refresh.refresh_library(storage, chunk_size=3, checkpoint_path=checkpoint,
+                                     client=second)
+    assert report.resumed
+    assert second.requested == titles[6:]
+    assert all(info['rating'] == 6.0 for info in storage.list_movies().values())
+
+
+def test_resume_after_delete_skips_nothing(tmp_path):
+    """A delete before the checkpoint shifts the order; the walk restarts instead of skipping."""
+    storage = StorageJson(str(tmp_path / "movies.json"))
+    titles = [f"Movie {i}" for i in range(10)]
+    storage.add_movies_bulk({t: {'year': 2000, 'rating': 5.0, 'poster': ''} for t in titles})
+    answers = {t: (2000, 6.0, '') for t in titles}
+    checkpoint = str(tmp_path / "cp.json")
+
+    with pytest.raises(KeyboardInterrupt):
+        refresh.refresh_library(storage, chunk_size=3, workers=1, checkpoint_path=checkpoint,
+                                client=FakeClient(answers, fail_after=6))
+    storage.delete_movie("Movie 0")
+
+    second = FakeClient(answers)
+    refresh.refresh_library(storage, chunk_size=3, checkpoint_path=checkpoint, client=second)
+    assert second.requested == titles[6:]
+    assert all(info['rating'] == 6.0 for info in storage.list_movies().values())
+
+
+def test_refresh_stops_when_omdb_is_unreachable(tmp_path):
+    storage = StorageJson(str(tmp_path / "movies.json"))
+    storage.add_movies_bulk({f"M{i}": {'year': 2000, 'rating': 5.0, 'poster': ''}
+                             for i in range(4)})
+    client = FakeClient({f"M{i}": omdb_client.OmdbAPIError('down') for i in range(4)})
+    checkpoint = str(tmp_path / "cp.json")
+    with pytest.raises(omdb_client.OmdbAPIError):
+        refresh.refresh_library(storage, chunk_size=2, checkpoint_path=checkpoint,
+                                client=client)
+    assert client.requested == ["M0", "M1"]
+    assert not (tmp_path / "cp.json").exists()  # nothing done yet, nothing to resume
@@ -0,0 +1,43 @@
+# test_startup.py
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that only specific commands need
+HEAVY = {'requests', 'dotenv', 'statistics', 'numpy', 'aiohttp', 'omdb_client',
+         'website_generator', 'poster_mirror', 'api_server', 'bulk_import'}
+BACKEND_MODULES = {'storage.storage_json', 'storage.storage_csv', 'storage.storage_journal',
+                   'storage.storage_sqlite', 'storage.storage_binary'}
+
+
+def loaded_after(code, *args):
+    """Run code in a fresh interpreter and return the modules it loaded."""
+    script = code + "\nimport sys\nprint('\\n'.join(sys.modules))"
+    out = subprocess.run([sys.executable, "-c", script, *args], cwd=ROOT, check=True,
+                         capture_output=True, text=True).stdout
+    return set(out.split())
+
+
+@pytest.mark.parametrize("backend", ["json", "csv", "sqlite"])
+def test_listing_does_not_load_heavy_modules(backend, tmp_path):
+    """A list-only session imports its backend and nothing it does not need."""
+    code = (
+        "import sys, main\n"
+        "storage = main.load_backend(sys.argv[1])(sys.argv[2])\n"
+        "storage.list_movies()\n"
+        "from movie_app import MovieApp\n"
+        "MovieApp(storage)._command_list_movies()\n"
+    )
+    modules = loaded_after(code, backend, str(tmp_path / f"movies.{backend}"))
+    assert not HEAVY & modules
+    assert BACKEND_MODULES & modules == {f"storage.storage_{backend}"}
+
+
+def test_omdb_client_defers_requests():
+    modules = loaded_after("import omdb_client; omdb_client.parse_movie_data({'Year': '1999'})")
+    assert not {'requests', 'dotenv', 'sqlite3'} & modules
@@ -0,0 +1,92 @@
+# test_storage_binary.py
+
+import pytest
+
+from main import migrate
+from storage.storage_binary import BinarySnapshot, StorageBinary, write_snapshot
+from storage.storage_json import StorageJson
+
+MOVIES = {
+    "Zodiac": {'year': 2007, 'rating': 7.7, 'poster': 'z.jpg'},
+    "Amélie": {'year': 2001, 'rating': 8.3, 'poster': ''},
+    "Brazil": {'year': 1985, 'rating': 7.9, 'poster': 'b.jpg'},
+}
+
+
+def test_snapshot_roundtrip(tmp_path):
+    path = str(tmp_path / "movies.bin")
+    write_snapshot(path, MOVIES)
+    snapshot = BinarySnapshot(path)
+    assert len(snapshot) == 3
+    assert list(snapshot) == list(MOVIES)  # insertion order, not title order
+    assert dict(snapshot.items()) == MOVIES
+    assert snapshot["Amélie"] == MOVIES["Amélie"]
+    assert "Brazil" in snapshot
+    assert "brazil" not in snapshot
+    assert snapshot.get("Missing") is None
+
+
+def test_rejects_foreign_files(tmp_path):
+    path = tmp_path / "movies.bin"
+    path.write_bytes(b'{"not": "a snapshot"}' + b'\0' * 64)
+    with pytest.raises(ValueError, match="bad magic number"):
+        BinarySnapshot(str(path))
+
+    write_snapshot(str(path), MOVIES)
+    data = bytearray(path.read_bytes())
+    data[4:6] = (99).to_bytes(2, 'little')
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="unsupported snapshot version 99"):
+        BinarySnapshot(str(path))
+
+
+def test_empty_file_is_an_empty_library(tmp_path):
+    path = tmp_path / "movies.bin"
+    path.write_bytes(b"")
+    with pytest.raises(ValueError):
+        BinarySnapshot(str(path))
+
+    storage = StorageBinary(str(path))
+    assert storage.list_movies() == {}
+    storage.add_movie("Heat", 1995, 8.3, "")
+    assert list(StorageBinary(str(path)).list_movies()) == ["Heat"]
+
+
+def test_crud_and_reopen(tmp_path):
+    path = str(tmp_path / "movies.bin")
+    storage = StorageBinary(path)
+    assert storage.list_movies() == {}
+    storage.add_movies_bulk(MOVIES)
+    storage.add_movie("Alien", 1979, 8.5, "a.jpg")
+    storage.update_movie("Zodiac", 9.0)
+    storage.delete_movie("Brazil")
+    storage.delete_movie("Missing")
+
+    reopened = StorageBinary(path)
+    assert list(reopened.list_movies()) == ["Zodiac", "Amélie", "Alien"]
+    assert reopened.get_movie("Zodiac")["rating"] == 9.0
+    assert reopened.get_movie("Brazil") is None
+    assert reopened.rating_stats()["best"] == ["Zodiac"]
+
+
+def test_migrate_from_json(tmp_path):
+    source = StorageJson(str(tmp_path / "movies.json"))
+    source.add_movies_bulk(MOVIES)
+    target = StorageBinary(str(tmp_path / "movies.bin"))
+    migrate(str(tmp_path / "movies.json"), target)
+    assert dict(target.list_movies().items()) == MOVIES
+
+
+def test_reads_version_1_snapshots(tmp_path):
+    """Snapshots written before fetched_at was added are still readable."""
+    from storage.storage_binary import HEADER, INDEX, MAGIC, RECORDS
+
+    title, poster = "Brazil".encode(), b"b.jpg"
+    record = RECORDS[1].pack(0, len(title), len(title), len(poster), 1985, 7.9)
+    index_offset = HEADER.size + len(record)
+    heap_offset = index_offset + INDEX.size
+    path = tmp_path / "movies.bin"
+    path.write_bytes(HEADER.pack(MAGIC, 1, 0, 1, index_offset, heap_offset) + record
+                     + INDEX.pack(0) + title + poster)
+    assert dict(BinarySnapshot(str(path))) == {
+        "Brazil": {'year': 1985, 'rating': 7.9, 'poster': 'b.jpg'}}
@@ -0,0 +1,102 @@
+# test_storage_csv.py
+
+import os
+
+import pytest
+
+from storage.storage_csv import MovieRow, StorageCsv, StreamingStorageCsv
+
+MOVIES = {
+    "Heat": {'year': 1995, 'rating': 8.3, 'poster': 'heat.jpg'},
+    'Crouching Tiger, "Hidden" Dragon': {'year': 2000, 'rating': 7.9, 'poster': ''},
+    "Multi\nLine": {'year': 2010, 'rating': 6.0, 'poster': '', 'fetched_at': 1_700_000_000},
+    "Zodiac": {'year': 2007, 'rating': 7.7, 'poster': 'z.jpg'},
+}
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    # Temporary CSV file path for isolation
+    path = str(tmp_path / "movies.csv")
+    StorageCsv(path).add_movies_bulk(MOVIES)
+    return path
+
+
+def test_iter_movies_yields_tuples(csv_path):
+    rows = list(StreamingStorageCsv(csv_path).iter_movies())
+    assert rows[0] == MovieRow("Heat", 1995, 8.3, 'heat.jpg', None)
+    assert [row.title for row in rows] == list(MOVIES)
+    assert rows[2].fetched_at == 1_700_000_000
+    assert list(StorageCsv(csv_path).iter_movies()) == rows
+
+
+def test_reads_files_without_fetched_at(tmp_path):
+    path = tmp_path / "old.csv"
+    path.write_text("title,year,rating,poster\r\nHeat,1995,8.3,heat.jpg\r\n", encoding='utf-8')
+    storage = StreamingStorageCsv(str(path))
+    assert dict(storage.list_movies()) == {"Heat": MOVIES["Heat"]}
+
+    storage.update_movie("Heat", 9.0)
+    header = path.read_text(encoding='utf-8').splitlines()[0]
+    assert header == "title,year,rating,poster,fetched_at"
+    assert StorageCsv(str(path)).list_movies() == {"Heat": dict(MOVIES["Heat"], rating=9.0)}
+
+
+def test_same_length_update_is_written_in_place(csv_path):
+    inode = os.stat(csv_path).st_ino
+    before = open(csv_path, 'rb').read()
+    StreamingStorageCsv(csv_path).update_movie("Zodiac", 8.1)
+    after = open(csv_path, 'rb').read()
+    assert os.stat(csv_path).st_ino == inode
+    assert len(after) == len(before)
+    assert after.replace(b"Zodiac,2007,8.1", b"Zodiac,2007,7.7") == before
+    assert StorageCsv(csv_path).get_movie("Zodiac")['rating'] == 8.1
+
+
+def test_other_edits_stream_copy(csv_path):
+    storage = StreamingStorageCsv(csv_path)
+    inode = os.stat(csv_path).st_ino
+    storage.update_movie('Crouching Tiger, "Hidden" Dragon', 10.25)
+    assert os.stat(csv_path).st_ino != inode
+    storage.delete_movie("Heat")
+    storage.delete_movie("Missing")
+    storage.update_movie("Missing", 1.0)
+    storage.update_movies_bulk({"Multi\nLine": {'fetched_at': 1_800_000_000}})
+
+    expected = {title: dict(info) for title, info in MOVIES.items() if title != "Heat"}
+    expected['Crouching Tiger, "Hidden" Dragon']['rating'] = 10.25
+    expected["Multi\nLine"]['fetched_at'] = 1_800_000_000
+    assert StorageCsv(csv_path).list_movies() == expected
+    assert dict(storage.list_movies().items()) == expected
+
+
+def test_add_appends_or_replaces(csv_path):
+    storage = StreamingStorageCsv(csv_path)
+    storage.add_movie("Up", 2009, 8.3, "")
+    storage.add_movie("Heat", 1995, 8.4, "new.jpg", fetched_at=1_900_000_000)
+    storage.add_movies_bulk({"Brazil": {'year': 1985, 'rating': 7.9, 'poster': ''},
+                             "Zodiac": {'year': 2007, 'rating': 7.8, 'poster': 'z.jpg'}})
+
+    movies = StorageCsv(csv_path).list_movies()
+    assert list(movies) == list(MOVIES) + ["Up", "Brazil"]
+    assert movies["Heat"] == {'year': 1995, 'rating': 8.4, 'poster': 'new.jpg',
+                              'fetched_at': 1_900_000_000}
+    assert movies["Zodiac"]['rating'] == 7.8
+
+
+def test_queries_without_cache(csv_path, tmp_path):
+    storage = StreamingStorageCsv(csv_path)
+    assert len(storage.list_movies()) == 4
+    assert "Heat" in storage.list_movies()
+    assert storage.get_movie("Nope") is None
+    assert storage.list_page(1, 2) == (4, [(title, MOVIES[title]) for title in
+                                           list(MOVIES)[1:3]])
+    assert storage.list_page(1) == (4, [(title, MOVIES[title]) for title in list(MOVIES)[1:]])
+    assert [t for t, _ in storage.search_title("tiger")] == ['Crouching Tiger, "Hidden" Dragon']
+    assert storage.rating_stats()['best'] == ["Heat"]
+
+    empty = StreamingStorageCsv(str(tmp_path / "new" / "movies.csv"))
+    assert dict(empty.list_movies()) == {}
+    empty.add_movie("First", 2020, 7.0, "")
+    assert StorageCsv(str(tmp_path / "new" / "movies.csv")).list_movies() == {
+        "First": {'year': 2020, 'rating': 7.0, 'poster': ''}}
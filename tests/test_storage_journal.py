@@ -0,0 +1,72 @@
+# test_storage_journal.py
+
+import os
+
+import pytest
+
+from storage.storage_journal import StorageJournal
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    # Temporary journal file path for isolation
+    return str(tmp_path / "movies.journal")
+
+
+def test_replay_restores_state(log_path):
+    """A fresh instance rebuilds the library by replaying the log."""
+    s = StorageJournal(log_path)
+    s.add_movie("A", 2000, 5.0, "a.png")
+    s.add_movie("B", 2001, 6.0, "")
+    s.update_movie("A", 8.0)
+    s.delete_movie("B")
+
+    movies = StorageJournal(log_path).list_movies()
+    assert movies == {"A": {"year": 2000, "rating": 8.0, "poster": "a.png"}}
+
+
+def test_each_mutation_appends_one_line(log_path):
+    """Mutations append to the log instead of rewriting it."""
+    s = StorageJournal(log_path)
+    s.add_movie("A", 2000, 5.0, "")
+    s.add_movie("B", 2001, 6.0, "")
+    s.delete_movie("Missing")
+    with open(log_path, encoding='utf-8') as f:
+        assert len(f.readlines()) == 2
+
+
+def test_compaction_writes_snapshot(log_path):
+    """Passing the size ratio folds the log into a snapshot."""
+    s = StorageJournal(log_path, compact_ratio=1.0, min_compact_bytes=200)
+    for i in range(20):
+        s.add_movie(f"Movie {i}", 2000 + i, 5.0, "")
+
+    assert os.path.exists(log_path + ".snapshot")
+    assert os.path.getsize(log_path) < 200
+    assert len(StorageJournal(log_path).list_movies()) == 20
+
+
+def test_torn_tail_is_ignored(log_path):
+    """A partially written last record is dropped on replay."""
+    s = StorageJournal(log_path)
+    s.add_movie("A", 2000, 5.0, "")
+    with open(log_path, 'a', encoding='utf-8') as f:
+        f.write('{"op": "add", "title": "B"')
+
+    s = StorageJournal(log_path)
+    s.add_movie("C", 2002, 7.0, "")
+    assert set(StorageJournal(log_path).list_movies()) == {"A", "C"}
+
+
+def test_corrupt_middle_line_is_not_truncated(log_path):
+    """A bad record before the end raises instead of dropping later records."""
+    s = StorageJournal(log_path)
+    s.add_movie("A", 2000, 5.0, "")
+    with open(log_path, 'a', encoding='utf-8') as f:
+        f.write('{"op": "add", "tit\n')
+    s.add_movie("C", 2002, 7.0, "")
+    size = os.path.getsize(log_path)
+
+    with pytest.raises(ValueError, match="line 2"):
+        StorageJournal(log_path)
+    assert os.path.getsize(log_path) == size
@@ -1,7 +1,14 @@
 # test_storage_json.py
 
+import os
+import subprocess
+import sys
+import threading
+import time
+
 import pytest
 
+from storage.file_storage import FileStorage
 from storage.storage_json import StorageJson
 
 
@@ -48,3 +55,128 @@ def test_delete_movie(storage):
     storage.delete_movie("DeleteMe")
     movies = storage.list_movies()
     assert "DeleteMe" not in movies
+
+
+def test_incomplete_backend_cannot_be_instantiated(temp_storage_path):
+    """A FileStorage subclass without _save_movies fails at construction."""
+    class LoadOnly(FileStorage):
+        def _load_movies(self):
+            return {}
+
+    with pytest.raises(TypeError):
+        LoadOnly(temp_storage_path)
+
+
+def test_reads_served_from_cache(storage, monkeypatch):
+    """Repeated reads do not re-parse the file."""
+    storage.add_movie("Cached", 2025, 7.0, "")
+    storage.list_movies()
+
+    def fail_load():
+        raise AssertionError("file was re-parsed")
+
+    monkeypatch.setattr(storage, "_load_movies", fail_load)
+    assert "Cached" in storage.list_movies()
+
+
+def test_external_edit_invalidates_cache(storage, temp_storage_path):
+    """An edit made outside the storage instance is picked up on next read."""
+    storage.add_movie("Old", 2025, 5.0, "")
+    assert "Old" in storage.list_movies()
+
+    with open(temp_storage_path, 'w', encoding='utf-8') as f:
+        f.write('{"New Title": {"year": 2024, "rating": 9.5, "poster": ""}}')
+
+    movies = storage.list_movies()
+    assert "Old" not in movies
+    assert movies["New Title"]["rating"] == 9.5
+
+
+def test_failed_write_keeps_old_file(storage, temp_storage_path, monkeypatch):
+    """A failure before the new file is durable leaves the previous file intact."""
+    storage.add_movie("Safe", 2025, 7.0, "")
+
+    def broken_fsync(fd):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("storage.safe_io.os.fsync", broken_fsync)
+    with pytest.raises(OSError):
+        storage.add_movie("Lost", 2025, 1.0, "")
+    monkeypatch.undo()
+
+    assert list(StorageJson(temp_storage_path).list_movies()) == ["Safe"]
+    assert list(storage.list_movies()) == ["Safe"]
+
+
+def test_batch_writes_once(storage, temp_storage_path, monkeypatch):
+    """All mutations inside batch() are persisted with a single rewrite."""
+    saves = []
+    save = storage._save_movies
+    monkeypatch.setattr(storage, "_save_movies", lambda movies: saves.append(1) or save(movies))
+    with storage.batch():
+        storage.add_movie("A", 2001, 5.0, "")
+        storage.add_movie("B", 2002, 6.0, "")
+        storage.update_movie("A", 9.0)
+    assert len(saves) == 1
+    assert StorageJson(temp_storage_path).list_movies()["A"]["rating"] == 9.0
+
+
+def test_failed_batch_is_discarded(storage, temp_storage_path):
+    storage.add_movie("Keep", 2025, 7.0, "")
+    with pytest.raises(RuntimeError):
+        with storage.batch():
+            storage.delete_movie("Keep")
+            raise RuntimeError
+    assert "Keep" in storage.list_movies()
+
+
+def test_concurrent_threads_are_group_committed(storage, monkeypatch):
+    """Mutations queued while a write is in flight share the next rewrite."""
+    saves = []
+    first_save_started = threading.Event()
+    release = threading.Event()
+    save = storage._save_movies
+
+    def slow_save(movies):
+        saves.append(len(movies))
+        if len(saves) == 1:
+            first_save_started.set()
+            assert release.wait(5)
+        save(movies)
+
+    monkeypatch.setattr(storage, "_save_movies", slow_save)
+
+    def add(name):
+        storage.add_movie(name, 2000, 5.0, "")
+
+    threads = [threading.Thread(target=add, args=("Leader",))]
+    threads[0].start()
+    assert first_save_started.wait(5)
+    threads += [threading.Thread(target=add, args=(f"T{n}",)) for n in range(7)]
+    for t in threads[1:]:
+        t.start()
+    deadline = time.monotonic() + 5
+    while len(storage._queue) < 7 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(storage.list_movies()) == 8
+    assert saves == [1, 8]
+
+
+def test_concurrent_processes_do_not_lose_updates(temp_storage_path):
+    """Separate processes doing read-modify-write all keep their movies."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = (
+        "import sys\n"
+        f"sys.path.insert(0, {root!r})\n"
+        "from storage.storage_json import StorageJson\n"
+        f"s = StorageJson({temp_storage_path!r})\n"
+        "for i in range(20):\n"
+        "    s.add_movie(f'{sys.argv[1]}-{i}', 2000, 5.0, '')\n"
+    )
+    procs = [subprocess.Popen([sys.executable, "-c", script, f"P{n}"]) for n in range(4)]
+    assert all(p.wait() == 0 for p in procs)
+    assert len(StorageJson(temp_storage_path).list_movies()) == 80
@@ -0,0 +1,118 @@
+# test_storage_sharded.py
+
+import json
+import os
+
+import pytest
+
+from storage.storage_json import StorageJson
+from storage.storage_sharded import StorageSharded, shard_of
+
+MOVIES = {f"Movie {i}": {'year': 1990 + i, 'rating': 5.0 + i / 10, 'poster': ''}
+          for i in range(40)}
+
+
+@pytest.fixture
+def shard_dir(tmp_path):
+    # Temporary shard directory for isolation
+    return str(tmp_path / "movies.shards")
+
+
+@pytest.fixture
+def storage(shard_dir):
+    s = StorageSharded(shard_dir, shards=4)
+    s.add_movies_bulk(MOVIES)
+    yield s
+    s.close()
+
+
+def shard_files(shard_dir):
+    with open(os.path.join(shard_dir, "manifest.json"), encoding='utf-8') as f:
+        manifest = json.load(f)
+    directory = os.path.join(shard_dir, f"gen-{manifest['generation']}")
+    return manifest, sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                            if not name.endswith('.lock'))
+
+
+def test_movies_are_spread_over_shards(storage, shard_dir):
+    manifest, files = shard_files(shard_dir)
+    assert manifest == {'shards': 4, 'format': 'json', 'generation': 1}
+    assert len(files) == 4
+    for number, path in enumerate(files):
+        titles = set(StorageJson(path).list_movies())
+        assert titles and all(shard_of(title, 4) == number for title in titles)
+
+    movies = storage.list_movies()
+    assert len(movies) == 40
+    assert dict(movies.items()) == MOVIES
+    assert movies["Movie 7"] == MOVIES["Movie 7"]
+    assert "Movie 99" not in movies
+    assert storage.get_movie("Movie 3") == MOVIES["Movie 3"]
+    assert sorted(t for t, _ in storage.search_title("movie 3")) == (
+        ["Movie 3"] + [f"Movie 3{i}" for i in range(10)])
+
+
+def test_mutation_rewrites_only_its_shard(storage, shard_dir):
+    _, files = shard_files(shard_dir)
+    before = {path: os.stat(path).st_ino for path in files}
+    storage.update_movie("Movie 5", 9.9)
+    changed = [path for path in files if os.stat(path).st_ino != before[path]]
+    assert changed == [files[shard_of("Movie 5", 4)]]
+
+    storage.delete_movie("Movie 6")
+    storage.add_movie("New", 2024, 7.0, "", fetched_at=1_700_000_000)
+    storage.update_movies_bulk({"Movie 1": {'rating': 1.0}, "Missing": {'rating': 2.0}})
+    reopened = StorageSharded(shard_dir)
+    assert reopened.get_movie("Movie 5")['rating'] == 9.9
+    assert reopened.get_movie("Movie 6") is None
+    assert reopened.get_movie("New")['fetched_at'] == 1_700_000_000
+    assert reopened.get_movie("Movie 1")['rating'] == 1.0
+    assert len(reopened.list_movies()) == 40
+    reopened.close()
+
+
+def test_batch_writes_each_changed_shard_once(storage, monkeypatch):
+    writes = []
+    for shard in storage._shards:
+        def counting_save(movies, shard=shard, save=shard._save_movies):
+            writes.append(shard)
+            save(movies)
+        monkeypatch.setattr(shard, "_save_movies", counting_save)
+    with storage.batch():
+        for i in range(40):
+            storage.update_movie(f"Movie {i}", 8.0)
+    assert len(writes) == 4
+    assert {info['rating'] for info in storage.list_movies().values()} == {8.0}
+
+
+def test_reshard_keeps_every_movie(storage, shard_dir):
+    storage.reshard(7)
+    manifest, files = shard_files(shard_dir)
+    assert manifest == {'shards': 7, 'format': 'json', 'generation': 2}
+    assert len(files) == 7
+    assert sorted(os.listdir(shard_dir)) == ["gen-2", "manifest.json", "manifest.lock"]
+    assert dict(storage.list_movies().items()) == MOVIES
+
+    converted = StorageSharded(shard_dir, shards=2, shard_format='csv')
+    manifest, files = shard_files(shard_dir)
+    assert manifest == {'shards': 2, 'format': 'csv', 'generation': 3}
+    assert all(path.endswith('.csv') for path in files)
+    assert dict(converted.list_movies().items()) == MOVIES
+    converted.close()
+
+
+def test_other_instances_follow_a_reshard(storage, shard_dir):
+    other = StorageSharded(shard_dir)
+    other.reshard(3)
+    assert storage.shard_count == 3
+    storage.update_movie("Movie 2", 0.5)
+    assert other.get_movie("Movie 2")['rating'] == 0.5
+    assert len(other.list_movies()) == 40
+    other.close()
+
+
+def test_rejects_invalid_options(shard_dir):
+    with pytest.raises(ValueError):
+        StorageSharded(shard_dir, shards=0)
+    with pytest.raises(ValueError):
+        StorageSharded(shard_dir, shard_format='xml')
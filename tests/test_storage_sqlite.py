@@ -0,0 +1,91 @@
+# test_storage_sqlite.py
+
+import sqlite3
+import sys
+
+import pytest
+
+from storage.storage_json import StorageJson
+from storage.storage_sqlite import StorageSqlite
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    # Temporary database path for isolation
+    return str(tmp_path / "movies.db")
+
+
+@pytest.fixture
+def storage(db_path):
+    s = StorageSqlite(db_path)
+    yield s
+    s.close()
+
+
+def test_crud(storage):
+    """Add, update and delete work on single rows."""
+    storage.add_movie("A", 2000, 5.0, "a.png")
+    storage.add_movie("B", 2001, 6.0, "")
+    storage.update_movie("A", 8.5)
+    storage.delete_movie("B")
+    assert storage.list_movies() == {"A": {"year": 2000, "rating": 8.5, "poster": "a.png"}}
+
+
+def test_schema_has_indexes_and_wal(storage, db_path):
+    """The table uses WAL mode and indexes year and rating."""
+    conn = sqlite3.connect(db_path)
+    indexes = {row[1] for row in conn.execute("PRAGMA index_list(movies)")}
+    mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    conn.close()
+    assert {"idx_movies_year", "idx_movies_rating"} <= indexes
+    assert mode == "wal"
+
+
+def test_add_movies_bulk_from_json(storage, tmp_path):
+    """An existing JSON library can be bulk-loaded."""
+    source = StorageJson(str(tmp_path / "movies.json"))
+    source.add_movie("X", 1999, 7.0, "")
+    source.add_movie("Y", 2005, 8.0, "y.png")
+    storage.add_movies_bulk(source.list_movies())
+    assert storage.list_movies() == source.list_movies()
+
+
+def test_query_methods_match_defaults(storage, tmp_path):
+    """SQL query overrides agree with the list_movies()-based defaults."""
+    reference = StorageJson(str(tmp_path / "ref.json"))
+    for s in (storage, reference):
+        s.add_movie("The Matrix", 1999, 8.7, "")
+        s.add_movie("Matrix 100%", 2001, 5.5, "")
+        s.add_movie("Heat", 1995, 8.3, "")
+        s.add_movie("Up", 2009, 8.3, "")
+
+    for query in ("matrix", "100%", "_", "xyz"):
+        assert sorted(storage.search_title(query)) == sorted(reference.search_title(query))
+    assert storage.top_by_rating(2) == reference.top_by_rating(2)
+    assert storage.top_by_rating(1, descending=False) == reference.top_by_rating(1, descending=False)
+
+    stats, ref_stats = storage.rating_stats(), reference.rating_stats()
+    assert sorted(stats.pop('worst')) == sorted(ref_stats.pop('worst'))
+    assert stats == pytest.approx(ref_stats)
+
+    title, info = storage.random_movie()
+    assert reference.list_movies()[title] == info
+
+    for offset, limit in ((1, 2), (1, None), (1, sys.maxsize), (9, 1)):
+        assert storage.list_page(offset, limit) == reference.list_page(offset, limit)
+
+
+def test_old_database_gains_fetched_at_column(db_path):
+    """Databases created before fetched_at existed are migrated on open."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE movies (title TEXT PRIMARY KEY, year INTEGER NOT NULL, "
+                 "rating REAL NOT NULL, poster TEXT NOT NULL DEFAULT '')")
+    conn.execute("INSERT INTO movies VALUES ('Old', 1990, 6.0, '')")
+    conn.commit()
+    conn.close()
+
+    s = StorageSqlite(db_path)
+    assert s.list_movies() == {"Old": {"year": 1990, "rating": 6.0, "poster": ""}}
+    s.update_movies_bulk({"Old": {"fetched_at": 1_700_000_000}})
+    assert s.get_movie("Old")["fetched_at"] == 1_700_000_000
+    s.close()
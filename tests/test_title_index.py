@@ -0,0 +1,46 @@
+# test_title_index.py
+
+import random
+
+from storage.storage_json import StorageJson
+from storage.title_index import TitleIndex
+
+
+def test_substring_search_matches_scan():
+    """Index results equal a linear scan, in insertion order."""
+    rng = random.Random(7)
+    words = ["the", "matrix", "heat", "up", "star", "wars", "night", "day", "a"]
+    titles = list({" ".join(rng.choices(words, k=rng.randint(1, 4))).title()
+                   for _ in range(300)})
+    index = TitleIndex(titles)
+    for query in ("matrix", "Star W", "he", "a", "t n", "zzz", ""):
+        expected = [t for t in titles if query.lower() in t.lower()]
+        assert index.search(query) == expected
+
+
+def test_add_and_remove_update_postings():
+    """Incremental updates are reflected in later queries."""
+    index = TitleIndex(["Heat"])
+    index.add("Heat 2")
+    assert index.search("heat") == ["Heat", "Heat 2"]
+    index.remove("Heat")
+    assert index.search("heat") == ["Heat 2"]
+    assert len(index) == 1
+
+
+def test_fuzzy_ranks_by_similarity():
+    """Typos still find the intended title, best match first."""
+    index = TitleIndex(["The Godfather", "The Godfather Part II", "Godzilla"])
+    results = index.fuzzy("the godfater", limit=2)
+    assert [title for title, _ in results] == ["The Godfather", "The Godfather Part II"]
+    assert results[0][1] > results[1][1]
+
+
+def test_storage_keeps_index_in_sync(tmp_path):
+    """StorageJson updates its index on add/delete."""
+    storage = StorageJson(str(tmp_path / "movies.json"))
+    storage.add_movie("Heat", 1995, 8.3, "")
+    assert [t for t, _ in storage.search_title("HEA")] == ["Heat"]
+    storage.add_movie("Heat Wave", 2001, 6.0, "")
+    storage.delete_movie("Heat")
+    assert [t for t, _ in storage.search_title("heat")] == ["Heat Wave"]
@@ -0,0 +1,68 @@
+# test_website_generator.py
+
+import json
+import os
+
+import pytest
+
+import website_generator
+from storage.storage_json import StorageJson
+
+TEMPLATE = "<h1>__TEMPLATE_TITLE__</h1><ol>\n__TEMPLATE_MOVIE_GRID__\n</ol>__TEMPLATE_PAGE_NAV__"
+
+
+@pytest.fixture
+def template_path(tmp_path):
+    path = tmp_path / "index_template.html"
+    path.write_text(TEMPLATE, encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def storage(tmp_path):
+    s = StorageJson(str(tmp_path / "movies.json"))
+    s.add_movie("A", 2000, 5.0, "a.jpg")
+    s.add_movie("B", 2001, 6.0, "b.jpg")
+    return s
+
+
+def legacy_output(movies, title):
+    """The page as produced by the original join-and-replace implementation."""
+    grid = "\n".join(website_generator.render_movie_item(n, i) for n, i in movies.items())
+    html = TEMPLATE.replace("__TEMPLATE_TITLE__", title).replace("__TEMPLATE_PAGE_NAV__", "")
+    return html.replace("__TEMPLATE_MOVIE_GRID__", grid)
+
+
+def test_streaming_matches_full_render(storage, template_path, tmp_path):
+    """Streaming output is byte-identical to the full in-memory render."""
+    out = str(tmp_path / "site" / "index.html")
+    website_generator.generate_website(storage, template_path, out, "Lib")
+    with open(out, encoding="utf-8") as f:
+        assert f.read() == legacy_output(storage.list_movies(), "Lib")
+
+
+def test_paginated_site(storage, template_path, tmp_path):
+    """Pages link to each other, a search index is written and unchanged pages are kept."""
+    storage.add_movie("C", 2002, 7.0, "c.jpg")
+    out_dir = str(tmp_path / "site")
+
+    written = website_generator.generate_paginated_site(
+        storage, template_path, out_dir, "Lib", per_page=2)
+    assert written == ["index.html", "page-2.html"]
+
+    with open(os.path.join(out_dir, "index.html"), encoding="utf-8") as f:
+        first = f.read()
+    assert 'href="page-2.html"' in first and "<h2>C</h2>" not in first
+    assert 'loading="lazy"' in first
+
+    with open(os.path.join(out_dir, "search-index.json"), encoding="utf-8") as f:
+        assert json.load(f)["C"] == [2, 2002, 7.0]
+
+    storage.update_movie("C", 8.0)
+    written = website_generator.generate_paginated_site(
+        storage, template_path, out_dir, "Lib", per_page=2)
+    assert written == ["page-2.html"]
+
+    storage.delete_movie("C")
+    website_generator.generate_paginated_site(storage, template_path, out_dir, "Lib", per_page=2)
+    assert not os.path.exists(os.path.join(out_dir, "page-2.html"))
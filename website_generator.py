@@ -1,52 +1,227 @@
 ## File: website_generator.py
 
+import hashlib
+import json
 import os
 
-def generate_website(storage, template_path, output_path, title):
+from instrumentation import timed
+from storage.safe_io import atomic_write
+
+GRID_PLACEHOLDER = '__TEMPLATE_MOVIE_GRID__'
+TITLE_PLACEHOLDER = '__TEMPLATE_TITLE__'
+NAV_PLACEHOLDER = '__TEMPLATE_PAGE_NAV__'
+SEARCH_INDEX_NAME = 'search-index.json'
+
+
+def render_movie_item(name, info, poster_map=None):
+    """
+    Render the grid item for one movie.
+
+    :param name: Movie title
+    :param info: Movie info dict with 'year', 'rating', 'poster'
+    :param poster_map: Optional dict mapping poster URLs to local copies
+    :return: HTML <li> string
+    """
+    poster = info.get('poster', '')
+    if poster_map:
+        poster = poster_map.get(poster, poster)
+    year = info.get('year', '')
+    rating = info.get('rating', '')
+    return (
+        f"<li class=\"movie-item\">"
+        f"<div class=\"poster\"><img src=\"{poster}\" alt=\"{name} poster\" loading=\"lazy\"/></div>"
+        f"<div class=\"details\">"
+        f"<h2>{name}</h2>"
+        f"<p>Year: {year}</p>"
+        f"<p>Rating: {rating}</p>"
+        f"</div>"
+        f"</li>"
+    )
+
+
+@timed('website.generate_website')
+def generate_website(storage, template_path, output_path, title, poster_map=None):
     """
     Generate a static HTML page from a template and movie data.
 
+    The page is streamed to disk: the template head is written first, then
+    each movie item as it is rendered, then the template tail, so memory
+    use does not grow with library size.
+
     :param storage: IStorage instance to fetch movies
     :param template_path: Path to index_template.html
     :param output_path: Path where index.html will be written
     :param title: Title to insert in the template
+    :param poster_map: Optional dict mapping poster URLs to local copies
+                       (see poster_mirror.mirror_posters)
     """
     # Load template
     with open(template_path, 'r', encoding='utf-8') as f:
         template = f.read()
+    head, tail = _split_template(template, title)
 
     # Fetch movie data
     movies = storage.list_movies()
 
-    # Build movie grid items
-    grid_items = []
-    for name, info in movies.items():
-        poster = info.get('poster', '')
-        year = info.get('year', '')
-        rating = info.get('rating', '')
-        item_html = (
-            f"<li class=\"movie-item\">"
-            f"<div class=\"poster\"><img src=\"{poster}\" alt=\"{name} poster\"/></div>"
-            f"<div class=\"details\">"
-            f"<h2>{name}</h2>"
-            f"<p>Year: {year}</p>"
-            f"<p>Rating: {rating}</p>"
-            f"</div>"
-            f"</li>"
-        )
-        grid_items.append(item_html)
-
-    grid_html = "\n".join(grid_items)
-
-    # Replace placeholders
-    html_output = template.replace('__TEMPLATE_TITLE__', title)
-    html_output = html_output.replace('__TEMPLATE_MOVIE_GRID__', grid_html)
-
     # Ensure output directory exists
     out_dir = os.path.dirname(output_path)
     if out_dir and not os.path.exists(out_dir):
         os.makedirs(out_dir)
 
-    # Write final HTML
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html_output)
+    items = (render_movie_item(name, info, poster_map) for name, info in movies.items())
+    _write_page(output_path, head, items, tail)
+
+
+@timed('website.generate_paginated_site')
+def generate_paginated_site(storage, template_path, output_dir, title,
+                            per_page=100, poster_map=None):
+    """
+    Generate the library as several pages with prev/next navigation.
+
+    Page 1 is index.html, the following pages are page-2.html, page-3.html
+    and so on. A compact search index (search-index.json) maps every title
+    to [page, year, rating] for client-side lookup. Each page's inputs
+    (its movies, position and template) are hashed first, and only pages
+    whose input hash changed are rendered and rewritten.
+
+    :param storage: IStorage instance to fetch movies
+    :param template_path: Path to index_template.html
+    :param output_dir: Directory receiving the pages
+    :param title: Title to insert in the template
+    :param per_page: Number of movies per page
+    :param poster_map: Optional dict mapping poster URLs to local copies
+    :return: list of page file names that were (re)written
+    """
+    with open(template_path, 'r', encoding='utf-8') as f:
+        template = f.read()
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    movies = list(storage.list_movies().items())
+    chunks = [movies[i:i + per_page] for i in range(0, len(movies), per_page)] or [[]]
+    page_count = len(chunks)
+
+    manifest_path = os.path.join(output_dir, 'pages.manifest.json')
+    previous = _read_json(manifest_path)
+    layout = [hashlib.sha1(template.encode('utf-8')).hexdigest(), title, page_count]
+
+    digests = {}
+    written = []
+    for page_number, chunk in enumerate(chunks, start=1):
+        name = page_file_name(page_number)
+        digest = _chunk_hash(layout, page_number, chunk, poster_map)
+        digests[name] = digest
+        path = os.path.join(output_dir, name)
+        if previous.get(name) == digest and os.path.exists(path):
+            continue
+        html = _render_page(template, title, chunk, page_number, page_count, poster_map)
+        _write_text(path, html)
+        written.append(name)
+
+    # Remove pages left over from a larger library
+    for name in previous:
+        if name not in digests:
+            try:
+                os.remove(os.path.join(output_dir, name))
+            except FileNotFoundError:
+                pass
+
+    search_index = {
+        name: [page_number, info.get('year'), info.get('rating')]
+        for page_number, chunk in enumerate(chunks, start=1)
+        for name, info in chunk
+    }
+    _write_text(os.path.join(output_dir, SEARCH_INDEX_NAME),
+                json.dumps(search_index, separators=(',', ':')))
+    _write_json(manifest_path, digests)
+    return written
+
+
+def page_file_name(page_number):
+    """
+    File name of a page in the paginated site.
+
+    :param page_number: 1-based page number
+    :return: 'index.html' for the first page, else 'page-<n>.html'
+    """
+    return 'index.html' if page_number == 1 else f'page-{page_number}.html'
+
+
+def _render_page(template, title, chunk, page_number, page_count, poster_map):
+    """Render one full page of the paginated site."""
+    links = []
+    if page_number > 1:
+        links.append(f"<a class=\"prev\" href=\"{page_file_name(page_number - 1)}\">&laquo; Prev</a>")
+    links.append(f"<span>Page {page_number} of {page_count}</span>")
+    if page_number < page_count:
+        links.append(f"<a class=\"next\" href=\"{page_file_name(page_number + 1)}\">Next &raquo;</a>")
+    nav = f"<nav class=\"page-nav\">{''.join(links)}</nav>"
+
+    grid = '\n'.join(render_movie_item(name, info, poster_map) for name, info in chunk)
+    html = template.replace(TITLE_PLACEHOLDER, title).replace(NAV_PLACEHOLDER, nav)
+    return html.replace(GRID_PLACEHOLDER, grid)
+
+
+def _write_text(path, text):
+    """Write text atomically through safe_io.atomic_write."""
+    with atomic_write(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def _chunk_hash(layout, page_number, chunk, poster_map):
+    """
+    Hash everything a page is rendered from, without rendering it.
+
+    :param layout: [template hash, title, page_count], shared by all pages
+    :return: SHA-1 hex digest
+    """
+    entries = []
+    for name, info in chunk:
+        poster = info.get('poster', '')
+        if poster_map:
+            poster = poster_map.get(poster, poster)
+        # fetched_at is not rendered; a refresh that changed nothing keeps the page
+        entries.append([name, info.get('year'), info.get('rating'), poster])
+    payload = json.dumps([layout, page_number, entries], default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _split_template(template, title):
+    """
+    Split the template around the movie grid placeholder.
+
+    :return: (head, tail) with the title already filled in
+    """
+    html = template.replace(TITLE_PLACEHOLDER, title).replace(NAV_PLACEHOLDER, '')
+    head, _, tail = html.partition(GRID_PLACEHOLDER)
+    return head, tail
+
+
+def _write_page(output_path, head, items, tail):
+    """
+    Stream head, newline-separated items and tail to output_path.
+
+    The page is written through atomic_write, so a reader never sees a
+    half-written page.
+    """
+    with atomic_write(output_path, 'w', encoding='utf-8') as f:
+        f.write(head)
+        for i, item_html in enumerate(items):
+            if i:
+                f.write('\n')
+            f.write(item_html)
+        f.write(tail)
+
+
+def _read_json(path):
+    """Read a JSON manifest; a missing or unreadable file counts as empty."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _write_json(path, data):
+    """Write data as JSON via a temporary file renamed into place."""
+    _write_text(path, json.dumps(data))